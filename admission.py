@@ -0,0 +1,154 @@
+"""
+Admission Control
+Bounds concurrent worksheet generations and queues the rest fairly
+
+Every generation allocates two full-page RGB canvases plus PNG encode
+buffers, so unlimited concurrency under a spike ends in the OOM killer.
+The AdmissionController admits at most `max_active` generations (derived
+from available memory by default), lets a few more wait briefly, and turns
+everything else away with a Retry-After estimate so clients back off.
+
+Waiting requests are queued per client and slots are handed out round
+robin between clients, so one busy classroom cannot starve the others.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Optional
+
+
+# Two page canvases (~34 MB each in RGB, ~8 MB in the one-byte 'P' and 'L'
+# canvas modes) plus the PNG encoder's buffers and the content engine
+_CANVAS_MEMORY_MB = {'RGB': 150, 'P': 60, 'L': 60}
+MEMORY_PER_GENERATION_MB = int(
+    os.environ.get('MEMORY_PER_GENERATION_MB')
+    or _CANVAS_MEMORY_MB.get(os.environ.get('CANVAS_MODE', 'RGB').upper(), 150)
+)
+
+
+class AdmissionRejected(Exception):
+    """No capacity right now; retry after `retry_after` seconds"""
+
+    def __init__(self, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+def available_memory_bytes() -> Optional[int]:
+    """Memory the kernel could hand out without swapping, where known"""
+    try:
+        with open('/proc/meminfo') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_AVPHYS_PAGES')
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def memory_limited_concurrency(per_generation_mb: int = MEMORY_PER_GENERATION_MB,
+                               processes: int = 1) -> int:
+    """How many generations this process may run at once"""
+    cores = os.cpu_count() or 1
+    # Rendering is CPU-bound; beyond two per core they only queue on the GIL
+    limit = 2 * cores
+    memory = available_memory_bytes()
+    if memory:
+        limit = min(limit, memory // (per_generation_mb * 1024 ** 2 * processes))
+    return max(1, limit)
+
+
+class _Waiter:
+    __slots__ = ('client', 'event', 'granted')
+
+    def __init__(self, client: str):
+        self.client = client
+        self.event = threading.Event()
+        self.granted = False
+
+
+class AdmissionController:
+    """Concurrency limit with a short, per-client fair wait queue"""
+
+    def __init__(self, max_active: int, max_queued: int, max_queued_per_client: int = 2,
+                 max_wait: float = 10.0):
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.max_queued_per_client = max_queued_per_client
+        self.max_wait = max_wait
+        self.active = 0
+        self._queues: 'OrderedDict[str, deque]' = OrderedDict()
+        self._queued = 0
+        self._lock = threading.Lock()
+        # Smoothed generation time, used to estimate Retry-After
+        self._service_time = 1.0
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def _retry_after(self) -> int:
+        slots = max(1, self.max_active)
+        return max(1, round(self._service_time * (self._queued / slots + 1)))
+
+    def acquire(self, client: str):
+        """Take a generation slot, waiting up to max_wait; raises AdmissionRejected"""
+        with self._lock:
+            if self.active < self.max_active and not self._queued:
+                self.active += 1
+                return
+            waiting = self._queues.get(client)
+            if self._queued >= self.max_queued:
+                raise AdmissionRejected(self._retry_after(), "Server is busy")
+            if waiting is not None and len(waiting) >= self.max_queued_per_client:
+                raise AdmissionRejected(self._retry_after(), "Too many requests from this client")
+            waiter = _Waiter(client)
+            self._queues.setdefault(client, deque()).append(waiter)
+            self._queued += 1
+
+        waiter.event.wait(self.max_wait)
+
+        with self._lock:
+            if waiter.granted:
+                return
+            waiting = self._queues[client]
+            waiting.remove(waiter)
+            if not waiting:
+                del self._queues[client]
+            self._queued -= 1
+            raise AdmissionRejected(self._retry_after(), "Timed out waiting for capacity")
+
+    def release(self, elapsed: Optional[float] = None):
+        """Free a slot and hand it to the next client in round-robin order"""
+        with self._lock:
+            self.active -= 1
+            if elapsed is not None:
+                self._service_time = 0.8 * self._service_time + 0.2 * elapsed
+            while self.active < self.max_active and self._queues:
+                client, waiting = next(iter(self._queues.items()))
+                waiter = waiting.popleft()
+                if waiting:
+                    # This client goes to the back of the line
+                    self._queues.move_to_end(client)
+                else:
+                    del self._queues[client]
+                self._queued -= 1
+                waiter.granted = True
+                self.active += 1
+                waiter.event.set()
+
+    @contextmanager
+    def slot(self, client: str):
+        """Hold a generation slot for the duration of a with block"""
+        self.acquire(client)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
@@ -5,9 +5,13 @@ Uses Hugging Face API for intelligent content generation
 
 import requests
 import json
-import time
 from typing import List, Dict, Optional
 
+from .generation_context import GenerationCancelled, current_context
+
+# Requests need at least this long to be worth starting
+MIN_REQUEST_SECONDS = 3.0
+
 
 class AIContentGenerator:
     """Main AI content generation engine using Hugging Face"""
@@ -51,7 +55,16 @@ class AIContentGenerator:
             self.models['fallback']
         ]
 
+        context = current_context()
+
         for model_name in models_to_try:
+            # Give up on the API (callers fall back to template content) when
+            # the generation was abandoned or its deadline is too close
+            if not context.has_time_for(MIN_REQUEST_SECONDS):
+                context.check()
+                print("Deadline near, using fallback content")
+                return ""
+
             url = f"{self.base_url}{model_name}"
 
             payload = {
@@ -66,12 +79,14 @@ class AIContentGenerator:
             }
 
             try:
-                response = requests.post(url, headers=self.headers, json=payload, timeout=30)
+                response = requests.post(url, headers=self.headers, json=payload,
+                                         timeout=context.timeout(30))
 
                 # Handle rate limiting
-                if response.status_code == 503:
-                    time.sleep(5)
-                    response = requests.post(url, headers=self.headers, json=payload, timeout=30)
+                if response.status_code == 503 and context.has_time_for(5 + MIN_REQUEST_SECONDS):
+                    context.sleep(5)
+                    response = requests.post(url, headers=self.headers, json=payload,
+                                             timeout=context.timeout(30))
 
                 if response.status_code == 200:
                     result = response.json()
@@ -90,6 +105,8 @@ class AIContentGenerator:
                     print(f"API Error for {model_name}: {response.status_code}")
                     continue
 
+            except GenerationCancelled:
+                raise
             except Exception as e:
                 print(f"Error with {model_name}: {e}")
                 continue
@@ -254,7 +271,7 @@ Clue:"""
                 )
 
             # Small delay to avoid rate limiting
-            time.sleep(0.2)
+            current_context().sleep(0.2)
 
         return results
 
@@ -0,0 +1,131 @@
+"""
+Distractor Index
+Ranks wrong answers by how plausible they are
+
+A false statement or an unused matching definition is only worth having
+if it could fool someone who half knows the material. Every vocabulary
+entry's definitions are turned into a TF-IDF vector once, when the index
+is built, and each pair of entries is scored by cosine similarity. Each
+entry's other entries are ranked by that score into three tiers: 'hard'
+distractors are the closest third of the entries sharing any meaningful
+word with the right answer, 'medium' the rest of those, and 'easy' the
+entries sharing none. Looking up a tier is then a dict access, however
+often generators ask.
+
+Entries scoring above MAX_SIMILARITY say almost word for word the same
+thing, so a statement built from one would not be clearly false; they
+are never offered as distractors.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+GRADE_DIFFICULTY = {'K-2': 'easy', '3-5': 'medium', '6-8': 'hard'}
+# Pairs this similar are too close to count as wrong answers
+MAX_SIMILARITY = 0.9
+# Fields of a vocabulary entry compared; all of them describe the word
+TEXT_FIELDS = ('definition', 'kid_friendly')
+
+STOP_WORDS = frozenset("""
+    a an and are as at be by can for from has have in into is it its like of on or
+    that the their them they this to up what when where which with you your
+""".split())
+TOKEN = re.compile(r"[a-z]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase content words, with a plural 's' removed"""
+    tokens = []
+    for token in TOKEN.findall(text.lower()):
+        if token in STOP_WORDS or len(token) < 3:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def tfidf_vectors(documents: Dict[str, List[str]]) -> Dict[str, Dict[str, float]]:
+    """Unit-length TF-IDF vector of each tokenized document"""
+    document_frequency = Counter(token for tokens in documents.values() for token in set(tokens))
+    count = len(documents)
+    vectors = {}
+    for key, tokens in documents.items():
+        weights = {token: frequency * math.log(count / document_frequency[token])
+                   for token, frequency in Counter(tokens).items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        vectors[key] = {token: weight / norm for token, weight in weights.items() if weight} if norm else {}
+    return vectors
+
+
+def cosine(first: Dict[str, float], second: Dict[str, float]) -> float:
+    if len(second) < len(first):
+        first, second = second, first
+    return sum(weight * second.get(token, 0.0) for token, weight in first.items())
+
+
+class DistractorIndex:
+    """Precomputed similarity between vocabulary entries, ranked into difficulty tiers"""
+
+    def __init__(self, vocab_database: Dict[str, Dict[str, str]], fields: Iterable[str] = TEXT_FIELDS,
+                 max_similarity: float = MAX_SIMILARITY):
+        fields = tuple(fields)
+        documents = {word: tokenize(' '.join(entry.get(field, '') for field in fields))
+                     for word, entry in vocab_database.items()}
+        vectors = tfidf_vectors(documents)
+        words = sorted(vectors)
+
+        self._similarity: Dict[str, Dict[str, float]] = {word: {} for word in words}
+        for index, word in enumerate(words):
+            for other in words[index + 1:]:
+                score = cosine(vectors[word], vectors[other])
+                self._similarity[word][other] = self._similarity[other][word] = score
+
+        self._tiers: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        for word, scores in self._similarity.items():
+            # Most similar first; ties by word so the ranking never depends on dict order
+            ranked = [other for other in sorted(scores, key=lambda other: (-scores[other], other))
+                      if scores[other] <= max_similarity]
+            related = sum(1 for other in ranked if scores[other] > 0)
+            closest = math.ceil(related / 3)
+            self._tiers[word] = {
+                'hard': tuple(ranked[:closest]),
+                'medium': tuple(ranked[closest:related]),
+                'easy': tuple(ranked[related:]),
+            }
+
+    def __contains__(self, word: str) -> bool:
+        return word.lower() in self._tiers
+
+    def similarity(self, word: str, other: str) -> float:
+        """Cosine similarity of two entries' definitions, 0.0 if either is unknown"""
+        word, other = word.lower(), other.lower()
+        if word == other:
+            return 1.0 if word in self._similarity else 0.0
+        return self._similarity.get(word, {}).get(other, 0.0)
+
+    def distractors(self, word: str, difficulty: str = 'medium') -> Tuple[str, ...]:
+        """Entries to pass off as word's answer at a difficulty, most plausible first
+
+        A tier with nothing in it falls back to the next easier one, then
+        harder ones; a word the index does not know has no distractors.
+        """
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"difficulty must be one of {', '.join(DIFFICULTIES)}, not {difficulty!r}")
+        tiers = self._tiers.get(word.lower())
+        if not tiers:
+            return ()
+        start = DIFFICULTIES.index(difficulty)
+        for tier in DIFFICULTIES[start::-1] + DIFFICULTIES[start + 1:]:
+            if tiers[tier]:
+                return tiers[tier]
+        return ()
+
+
+def difficulty_for_grade(grade_level: str) -> str:
+    """Distractor difficulty for a grade band; unknown grades get 'medium'"""
+    return GRADE_DIFFICULTY.get(grade_level, 'medium')
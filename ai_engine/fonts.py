@@ -0,0 +1,21 @@
+"""
+Fonts
+The worksheet font, loaded once per size
+
+Text is measured while content is prepared (see readability.py) and drawn
+when pages are rendered, so font loading lives here, depending on Pillow
+alone, rather than in the renderers.
+"""
+
+from functools import lru_cache
+
+from PIL import ImageFont
+
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    """Load the worksheet font at a given size, falling back to Pillow's default at that size"""
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        return ImageFont.load_default(size)
@@ -0,0 +1,151 @@
+"""
+Generation Context
+Progress, cancellation and deadlines for the worksheet being generated
+
+Generators call report_progress() where they used to print progress lines.
+The message is still printed; when the caller installed a listener with
+generation_context(), it also receives (stage, message) so the web app can
+stream progress to the browser. The context lives in a ContextVar, so
+concurrent requests on different threads never see each other's state.
+
+Cancellation is cooperative. Every report_progress() call is a checkpoint
+that raises GenerationCancelled once the caller sets the cancel event, or
+DeadlineExceeded once the deadline passes. Slow steps such as AI requests
+ask the context how much time is left and fall back to template content
+instead of starting work they cannot finish.
+
+The context also accounts for the page canvases a generation holds, so
+its peak canvas memory can be reported alongside the result.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+
+# Stages in the order a typical generation passes through them
+STAGES = ('vocabulary', 'clues', 'placement', 'render', 'encode')
+
+ProgressListener = Callable[[str, str], None]
+
+
+class GenerationCancelled(Exception):
+    """The caller abandoned this generation"""
+
+
+class DeadlineExceeded(GenerationCancelled):
+    """The generation ran past its time budget"""
+
+
+class GenerationContext:
+    """Per-generation state shared by the generator and the content engine
+
+    cancel_event is anything with is_set() and wait(timeout), such as a
+    threading.Event or a multiprocessing manager Event for pool workers.
+    deadline is an absolute time.time() value, comparable across processes.
+    """
+
+    def __init__(self, listener: Optional[ProgressListener] = None,
+                 cancel_event=None, deadline: Optional[float] = None):
+        self.listener = listener
+        self.cancel_event = cancel_event
+        self.deadline = deadline
+        self.canvas_bytes = 0
+        self.peak_canvas_bytes = 0
+        # Canvases are released from encoder threads through weakref finalizers
+        self._canvas_lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline, or None without one"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.time()
+
+    def timeout(self, default: float) -> float:
+        """A blocking call's timeout, capped by the time left"""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return max(0.0, min(default, remaining))
+
+    def has_time_for(self, seconds: float) -> bool:
+        """False once cancelled or when less than `seconds` remain"""
+        if self.cancelled:
+            return False
+        remaining = self.remaining()
+        return remaining is None or remaining >= seconds
+
+    def check(self):
+        """Raise if the generation should stop"""
+        if self.cancelled:
+            raise GenerationCancelled("Generation was cancelled")
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded("Generation ran past its deadline")
+
+    def sleep(self, seconds: float):
+        """Sleep that wakes up early when the generation is cancelled"""
+        seconds = self.timeout(seconds)
+        if self.cancel_event is not None:
+            self.cancel_event.wait(seconds)
+        else:
+            time.sleep(seconds)
+        self.check()
+
+    def report(self, stage: str, message: str):
+        print(message)
+        if self.listener is not None:
+            self.listener(stage, message.strip())
+        self.check()
+
+    def track_canvas(self, nbytes: int):
+        """Count a newly allocated page canvas"""
+        with self._canvas_lock:
+            self.canvas_bytes += nbytes
+            self.peak_canvas_bytes = max(self.peak_canvas_bytes, self.canvas_bytes)
+
+    def release_canvas(self, nbytes: int):
+        with self._canvas_lock:
+            self.canvas_bytes -= nbytes
+
+    def stats(self) -> dict:
+        """Resource usage of this generation, small enough to send between processes"""
+        return {'peak_canvas_bytes': self.peak_canvas_bytes}
+
+
+_current_context = contextvars.ContextVar('generation_context', default=None)
+
+
+def current_context() -> GenerationContext:
+    """The context of the generation running on this thread
+
+    Outside generation_context() (command line, benchmarks) each call gets
+    a fresh context with no listener or deadline, so nothing a generation
+    counts there carries over into the next one.
+    """
+    context = _current_context.get()
+    return context if context is not None else GenerationContext()
+
+
+@contextmanager
+def generation_context(listener: Optional[ProgressListener] = None,
+                       cancel_event=None, deadline: Optional[float] = None):
+    """Install a fresh context for the duration of one generation"""
+    context = GenerationContext(listener, cancel_event, deadline)
+    token = _current_context.set(context)
+    try:
+        context.check()
+        yield context
+    finally:
+        _current_context.reset(token)
+
+
+def report_progress(stage: str, message: str):
+    """Print a progress line, forward it to the listener, then honour cancellation"""
+    current_context().report(stage, message)
@@ -4,15 +4,17 @@ Uses AI to generate age-appropriate questions
 """
 
 import random
-from typing import List, Dict
+from typing import List, Dict, Optional
 from .content_generator import get_ai_generator
 
 
 class QuestionGenerator:
     """Generate educational questions using AI"""
 
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
         self.ai = get_ai_generator()
+        # Private generator so a seeded caller gets the same choices every time
+        self.rng = rng or random.Random()
 
         # Question templates for different types
         self.question_types = [
@@ -133,7 +135,7 @@ Make it educational and clear."""
             "Compare and contrast"
         ]
 
-        for starter in random.sample(question_starters, min(count, len(question_starters))):
+        for starter in self.rng.sample(question_starters, min(count, len(question_starters))):
             prompt = f"""Create a short answer question about {topic} for grade {grade_level} starting with "{starter}".
 
 Format:
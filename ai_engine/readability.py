@@ -0,0 +1,126 @@
+"""
+Readability
+Reading level and rendered width of content text, worked out once
+
+Which version of a definition a worksheet shows should depend on how hard
+it is to read and whether it fits the box it goes in, not on a fixed list
+of grades. profile_entries() scores every text field of every vocabulary
+entry when the content engine loads: a Flesch-Kincaid grade level, and
+its width in pixels at each of the renderers' body text sizes. The
+profiles are cached on the entries under 'profiles', so choose_variant()
+can pick a fitting, grade-appropriate version with a few comparisons and
+renderers never measure text to find out whether it fits.
+
+Reading formulas are rough on one-line definitions, so they only ever
+move a reader to a simpler version than their grade would get anyway:
+the kid-friendly versions written for K-2 are never swapped for the
+standard ones on a score alone.
+"""
+
+import re
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence
+
+from .fonts import get_font
+
+
+# Body text sizes used by the worksheet renderers
+FONT_SIZES = (38, 42, 45, 50)
+# Fields scored; crossword clues and statements are built from these
+PROFILED_FIELDS = ('definition', 'kid_friendly', 'fun_fact', 'example')
+# Highest grade each band should be asked to read
+GRADE_CEILINGS = {'K': 0, 'K-2': 2, '3-5': 5, '6-8': 8}
+# Grades a preferred version may read above the band before an easier one wins
+READING_SLACK = 2
+
+WORD = re.compile(r"[A-Za-z]+(?:'[a-z]+)?")
+VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+
+class TextProfile(NamedTuple):
+    """A piece of text with its reading grade and rendered width at each font size"""
+    text: str
+    grade: float
+    widths: Dict[int, float]
+
+    def width(self, font_size: int) -> float:
+        """Rendered width at font_size; sizes outside FONT_SIZES are measured now"""
+        if font_size in self.widths:
+            return self.widths[font_size]
+        return get_font(font_size).getlength(self.text)
+
+    def fits(self, max_width: float, font_size: int) -> bool:
+        return self.width(font_size) <= max_width
+
+
+def count_syllables(word: str) -> int:
+    """Vowel groups, less a silent final e; never fewer than one"""
+    word = word.lower()
+    syllables = len(VOWEL_GROUPS.findall(word))
+    if word.endswith('e') and not word.endswith(('le', 'ee')) and syllables > 1:
+        syllables -= 1
+    return max(1, syllables)
+
+
+def reading_grade(text: str) -> float:
+    """Flesch-Kincaid grade level of text, 0.0 for text without words"""
+    words = WORD.findall(text)
+    if not words:
+        return 0.0
+    sentences = max(1, len(re.findall(r"[.!?]+(?:\s|$)", text)))
+    syllables = sum(count_syllables(word) for word in words)
+    grade = 0.39 * len(words) / sentences + 11.8 * syllables / len(words) - 15.59
+    return round(max(0.0, grade), 1)
+
+
+def grade_ceiling(grade_level: str) -> int:
+    """Highest reading grade for a grade band or single grade ('K', '4', '6-8')"""
+    if grade_level in GRADE_CEILINGS:
+        return GRADE_CEILINGS[grade_level]
+    numbers = re.findall(r"\d+", grade_level)
+    return int(numbers[-1]) if numbers else GRADE_CEILINGS['3-5']
+
+
+def profile_text(text: str, fonts: Dict[int, object]) -> TextProfile:
+    return TextProfile(text, reading_grade(text),
+                       {size: font.getlength(text) for size, font in fonts.items()})
+
+
+def profile_entries(vocab_database: Dict[str, Dict], fields: Iterable[str] = PROFILED_FIELDS,
+                    font_sizes: Iterable[int] = FONT_SIZES):
+    """Cache a TextProfile of each present field on every entry, as entry['profiles']"""
+    fonts = {size: get_font(size) for size in font_sizes}
+    fields = tuple(fields)
+    for entry in vocab_database.values():
+        entry['profiles'] = {field: profile_text(entry[field], fonts)
+                             for field in fields if entry.get(field)}
+
+
+def choose_variant(profiles: Dict[str, TextProfile], levels: Sequence[str], preferred: str, grade_level: str,
+                   max_width: Optional[float] = None, font_size: int = FONT_SIZES[0]) -> Optional[TextProfile]:
+    """Best of an entry's profiled versions for a reader and, optionally, a box
+
+    levels lists the fields simplest first; preferred is the one the grade
+    would normally get. Reading level only ever steps down from it: the
+    most advanced version up to preferred that fits and reads at most
+    READING_SLACK grades above the band wins, then the easiest of those
+    that fit. Only if none of them fit is any other version considered,
+    and failing all else the narrowest is returned.
+    """
+    allowed = levels[:levels.index(preferred) + 1] if preferred in levels else levels
+    candidates = [profiles[field] for field in reversed(allowed) if field in profiles]
+    fitting = [profile for profile in candidates
+               if max_width is None or profile.fits(max_width, font_size)]
+    ceiling = grade_ceiling(grade_level) + READING_SLACK
+    for profile in fitting:
+        if profile.grade <= ceiling:
+            return profile
+    if fitting:
+        return min(fitting, key=lambda profile: profile.grade)
+
+    variants = [profiles[field] for field in levels if field in profiles]
+    if not variants:
+        return None
+    fitting = [profile for profile in variants if max_width is None or profile.fits(max_width, font_size)]
+    if fitting:
+        return fitting[0]
+    return min(variants, key=lambda profile: profile.width(font_size))
@@ -4,15 +4,17 @@ Makes worksheets fun and relatable for students
 """
 
 import random
-from typing import List, Dict
+from typing import List, Dict, Optional
 from .content_generator import get_ai_generator
 
 
 class ScenarioGenerator:
     """Generate educational scenarios and stories using AI"""
 
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
         self.ai = get_ai_generator()
+        # Private generator so a seeded caller gets the same choices every time
+        self.rng = rng or random.Random()
 
         # Story themes
         self.themes = [
@@ -39,7 +41,7 @@ class ScenarioGenerator:
             Story scenario text
         """
         if theme is None:
-            theme = random.choice(self.themes)
+            theme = self.rng.choice(self.themes)
 
         theme_prompts = {
             "superhero": "a superhero who uses science",
@@ -0,0 +1,218 @@
+"""
+Sentence Bank
+Example sentences indexed by the vocabulary words they use, ready to blank
+
+A fill-in-the-blank item is only as good as its sentence: "The term ___
+means ..." tests whether a student can read a definition back, not whether
+they can use the word. Every vocabulary entry already carries an example
+and a fun fact written around a word, and often around other words too.
+The bank splits those into sentences once, when it is built, and finds
+every mention of every vocabulary word in them, plurals and inflections
+included ('cells', 'orbiting', 'nuclei', 'tectonic plate'). Each word's
+sentences are ranked once per grade band, so picking the best one is a
+dict access however many worksheets ask.
+
+A blank keeps a regular ending visible ('___________s') so the word bank
+term still fits the sentence; an irregular form is blanked whole.
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .readability import GRADE_CEILINGS, READING_SLACK, grade_ceiling, reading_grade
+
+
+BLANK = "___________"
+# Fields written as whole sentences; definitions are fragments
+SENTENCE_FIELDS = ('example', 'fun_fact')
+# Plurals no suffix rule produces
+IRREGULAR_FORMS = {
+    'mitochondria': ('mitochondrion',),
+    'nucleus': ('nuclei',),
+    'nebula': ('nebulae',),
+}
+# Sentence length, in words, that reads best as an item
+IDEAL_LENGTH = 12
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+WORD_COUNT = re.compile(r"[A-Za-z0-9]+")
+
+
+class Mention(NamedTuple):
+    """A vocabulary word used in a sentence; the blank covers text[start:end]"""
+    start: int
+    end: int
+    lemma: str
+    exact: bool
+
+
+class Sentence(NamedTuple):
+    """A sentence from a vocabulary entry and every vocabulary word it mentions"""
+    text: str
+    source: str
+    field: str
+    grade: float
+    mentions: Tuple[Mention, ...]
+
+    def lemmas(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(mention.lemma for mention in self.mentions))
+
+    def blanked(self, lemmas: Iterable[str]) -> Tuple[str, List[str]]:
+        """Text with every mention of lemmas blanked, and the lemmas blanked in order"""
+        lemmas = set(lemmas)
+        parts, answers, position = [], [], 0
+        for mention in self.mentions:
+            if mention.lemma in lemmas:
+                parts.append(self.text[position:mention.start])
+                parts.append(BLANK)
+                answers.append(mention.lemma)
+                position = mention.end
+        parts.append(self.text[position:])
+        return ''.join(parts), answers
+
+
+class Paragraph(NamedTuple):
+    """Sentences run together, with the answer to each blank in reading order"""
+    text: str
+    answers: List[str]
+
+
+def inflections(lemma: str) -> Tuple[str, ...]:
+    """Plural and verb forms of a word; for a phrase, of its last word"""
+    head, _, last = lemma.rpartition(' ')
+    prefix = f"{head} " if head else ''
+    forms = {last}
+    if last.endswith('s') and not last.endswith(('ss', 'us', 'is')):
+        # Given in the plural ('tectonic plates'); also used in the singular
+        forms.add(last[:-1])
+    else:
+        if last.endswith(('s', 'x', 'z', 'ch', 'sh', 'o')):
+            forms.add(last + 'es')
+        if last.endswith('y') and last[-2:-1] not in 'aeiou':
+            forms.add(last[:-1] + 'ies')
+        elif not last.endswith(('s', 'x', 'z', 'ch', 'sh')):
+            forms.add(last + 's')
+        if last.endswith('e'):
+            forms.update((last + 'd', last[:-1] + 'ing'))
+        elif not last.endswith(('a', 'i', 'o', 'u', 'y')):
+            forms.update((last + 'ed', last + 'ing'))
+    forms.update(IRREGULAR_FORMS.get(lemma, ()))
+    return tuple(prefix + form for form in sorted(forms))
+
+
+def blank_span(lemma: str, form: str, start: int) -> Tuple[int, int]:
+    """Span of a form to blank: the lemma part of a regular form, else all of it"""
+    if form.startswith(lemma):
+        return start, start + len(lemma)
+    if lemma.endswith('e') and form.startswith(lemma[:-1]) and form.endswith('ing'):
+        return start, start + len(form) - len('ing')
+    return start, start + len(form)
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in SENTENCE_END.split(text) if sentence.strip()]
+
+
+class SentenceBank:
+    """Sentences from a vocabulary database, indexed by the words they mention"""
+
+    def __init__(self, vocab_database: Dict[str, Dict[str, str]], fields: Iterable[str] = SENTENCE_FIELDS):
+        self._fields = tuple(fields)
+        forms = {}
+        for lemma in vocab_database:
+            for form in inflections(lemma.lower()):
+                # A word's own spelling outranks another word's inflection
+                if forms.get(form) != form:
+                    forms[form] = lemma.lower()
+        alternatives = '|'.join(re.escape(form) for form in sorted(forms, key=len, reverse=True))
+        pattern = re.compile(rf"\b(?:{alternatives})\b", re.IGNORECASE)
+
+        self._sentences: List[Sentence] = []
+        self._by_lemma: Dict[str, List[Sentence]] = {lemma.lower(): [] for lemma in vocab_database}
+        for source, entry in vocab_database.items():
+            for field in self._fields:
+                for text in split_sentences(entry.get(field, '')):
+                    mentions = []
+                    for match in pattern.finditer(text):
+                        form = match.group().lower()
+                        lemma = forms[form]
+                        start, end = blank_span(lemma, form, match.start())
+                        mentions.append(Mention(start, end, lemma, form == lemma))
+                    sentence = Sentence(text, source.lower(), field, reading_grade(text), tuple(mentions))
+                    self._sentences.append(sentence)
+                    for lemma in sentence.lemmas():
+                        self._by_lemma[lemma].append(sentence)
+
+        self._best: Dict[Tuple[str, int], Tuple[Sentence, ...]] = {}
+        for ceiling in set(GRADE_CEILINGS.values()):
+            for lemma in self._by_lemma:
+                self._ranked(lemma, ceiling)
+
+    def __contains__(self, word: str) -> bool:
+        return bool(self._by_lemma.get(word.lower()))
+
+    def _ranked(self, lemma: str, ceiling: int) -> Tuple[Sentence, ...]:
+        """A word's sentences, best first for readers up to a reading grade"""
+        key = (lemma, ceiling)
+        if key not in self._best:
+            fields = self._fields
+
+            def rank(sentence):
+                uses = [mention for mention in sentence.mentions if mention.lemma == lemma]
+                return (
+                    sentence.source != lemma,
+                    sentence.grade > ceiling + READING_SLACK,
+                    not all(mention.exact for mention in uses),
+                    len(uses) > 1,
+                    fields.index(sentence.field) if sentence.field in fields else len(fields),
+                    abs(len(WORD_COUNT.findall(sentence.text)) - IDEAL_LENGTH),
+                    sentence.text,
+                )
+            self._best[key] = tuple(sorted(self._by_lemma.get(lemma, ()), key=rank))
+        return self._best[key]
+
+    def sentences(self, word: str, grade_level: str = '3-5') -> Tuple[Sentence, ...]:
+        """Every sentence mentioning word, best first for the grade"""
+        return self._ranked(word.lower(), grade_ceiling(grade_level))
+
+    def best(self, word: str, grade_level: str = '3-5', exclude: Sequence[Sentence] = ()) -> Optional[Sentence]:
+        """The sentence that makes the best item for word, None if no sentence uses it"""
+        for sentence in self.sentences(word, grade_level):
+            if sentence not in exclude:
+                return sentence
+        return None
+
+    def blank(self, word: str, grade_level: str = '3-5') -> Optional[str]:
+        """The best sentence for word with every use of it blanked"""
+        sentence = self.best(word, grade_level)
+        if sentence is None:
+            return None
+        return sentence.blanked((word.lower(),))[0]
+
+    def paragraph(self, words: Iterable[str], grade_level: str = '3-5',
+                  also_blank: Iterable[str] = ()) -> Paragraph:
+        """One sentence per word, each with every listed word it uses blanked
+
+        A word already blanked by an earlier sentence gets no sentence of
+        its own; words no sentence uses are left out. Words in also_blank
+        are blanked wherever the chosen sentences use them but get no
+        sentence of their own.
+        """
+        words = [word.lower() for word in words]
+        wanted = set(words) | {word.lower() for word in also_blank}
+        chosen, covered = [], set()
+        for word in words:
+            if word in covered:
+                continue
+            sentence = self.best(word, grade_level, exclude=chosen)
+            if sentence is None:
+                continue
+            chosen.append(sentence)
+            covered.update(lemma for lemma in sentence.lemmas() if lemma in wanted)
+
+        texts, answers = [], []
+        for sentence in chosen:
+            text, blanked = sentence.blanked(wanted)
+            texts.append(text)
+            answers.extend(blanked)
+        return Paragraph(' '.join(texts), answers)
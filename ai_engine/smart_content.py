@@ -5,13 +5,25 @@ Creates unique, engaging content every time
 """
 
 import random
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
+
+from .distractors import DistractorIndex, difficulty_for_grade
+from .readability import FONT_SIZES, choose_variant, profile_entries
+from .sentence_bank import Paragraph, SentenceBank
+
+
+def make_rng(seed: Union[None, int, str, random.Random] = None) -> random.Random:
+    """Return a private random generator for a seed, or the generator itself if one is given"""
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
 
 
 class SmartContentEngine:
     """Generate engaging educational content using intelligent templates"""
 
-    def __init__(self):
+    def __init__(self, seed: Union[None, int, str, random.Random] = None):
+        self.rng = make_rng(seed)
         self.init_content_databases()
 
     def init_content_databases(self):
@@ -422,6 +434,15 @@ class SmartContentEngine:
             },
         }
 
+        # Reading level and rendered widths of every text, measured once
+        profile_entries(self.vocab_database)
+
+        # Definition similarity, ranked once so distractor lookups are dict accesses
+        self.distractor_index = DistractorIndex(self.vocab_database)
+
+        # Example sentences indexed by the words they use, for fill-in-the-blank items
+        self.sentence_bank = SentenceBank(self.vocab_database)
+
         # Question templates by difficulty
         self.question_templates = {
             "easy": [
@@ -467,8 +488,14 @@ class SmartContentEngine:
             ]
         }
 
-    def get_definition(self, word: str, grade_level: str = "3-5", style: str = "standard") -> str:
-        """Get appropriate definition based on grade level"""
+    def get_definition(self, word: str, grade_level: str = "3-5", style: str = "standard",
+                       max_width: Optional[float] = None, font_size: int = FONT_SIZES[0]) -> str:
+        """Get the definition best suited to the grade level and, if given, a max_width box
+
+        Young grades get the kid-friendly version, others the standard one
+        unless it reads well above the grade band; either gives way to a
+        version that fits max_width at font_size. See ai_engine/readability.py.
+        """
         word_lower = word.lower()
 
         if word_lower not in self.vocab_database:
@@ -476,11 +503,37 @@ class SmartContentEngine:
 
         data = self.vocab_database[word_lower]
 
-        # Choose definition based on grade level
+        # Choose definition based on grade level, then readability and fit
         if grade_level in ["K", "K-2", "1", "2"]:
-            return data.get("kid_friendly", data["definition"])
+            preferred = "kid_friendly"
         else:
-            return data["definition"]
+            preferred = "definition"
+        profile = choose_variant(data["profiles"], ("kid_friendly", "definition"), preferred,
+                                 grade_level, max_width, font_size)
+        return profile.text if profile else data["definition"]
+
+    def get_distractors(self, word: str, grade_level: str = "3-5", difficulty: Optional[str] = None) -> Tuple[str, ...]:
+        """Other vocabulary words whose definitions make plausible wrong answers for word
+
+        Harder grades get closer definitions unless a difficulty is given;
+        see ai_engine/distractors.py.
+        """
+        return self.distractor_index.distractors(word, difficulty or difficulty_for_grade(grade_level))
+
+    def get_blank_sentence(self, word: str, grade_level: str = "3-5") -> Optional[str]:
+        """The best example sentence using word, with the word blanked
+
+        None when no sentence uses it; see ai_engine/sentence_bank.py.
+        """
+        return self.sentence_bank.blank(word, grade_level)
+
+    def get_blank_paragraph(self, words: List[str], grade_level: str = "3-5",
+                            also_blank: Tuple[str, ...] = ()) -> Paragraph:
+        """Example sentences for words run together, each use of them (or of also_blank) blanked
+
+        Words no sentence uses are left out; see ai_engine/sentence_bank.py.
+        """
+        return self.sentence_bank.paragraph(words, grade_level, also_blank)
 
     def get_fun_fact(self, word: str) -> str:
         """Get fun fact for a word"""
@@ -524,8 +577,10 @@ class SmartContentEngine:
         count: int = 15,
         vocabulary_pool: Optional[List[str]] = None,
         topics: Optional[List[str]] = None,
+        rng: Optional[random.Random] = None,
     ) -> List[str]:
         """Generate relevant vocabulary words for a topic or NGSS standard context."""
+        rng = rng or self.rng
         topic_keywords = {
             "cell": ["cell", "nucleus", "mitochondria", "chloroplast", "membrane", "cytoplasm", "ribosome", "vacuole", "dna", "protein"],
             "energy": ["energy", "atp", "photosynthesis", "respiration", "glucose", "oxygen", "mitochondria", "chloroplast"],
@@ -568,16 +623,19 @@ class SmartContentEngine:
         if not candidate_words:
             _add_words(list(self.vocab_database.keys()))
 
-        words_list = list(candidate_words)
-        random.shuffle(words_list)
+        # Sort before shuffling: set order varies between processes
+        words_list = sorted(candidate_words)
+        rng.shuffle(words_list)
         return words_list[:count]
 
-    def generate_scenario(self, topic: str, grade_level: str, theme: str = None) -> str:
+    def generate_scenario(self, topic: str, grade_level: str, theme: str = None,
+                          rng: Optional[random.Random] = None) -> str:
         """Generate an engaging scenario"""
+        rng = rng or self.rng
         if theme is None:
-            theme = random.choice(list(self.scenario_themes.keys()))
+            theme = rng.choice(list(self.scenario_themes.keys()))
 
-        template = random.choice(self.scenario_themes[theme])
+        template = rng.choice(self.scenario_themes[theme])
 
         # Fill in template
         names = ["Alex", "Maya", "Sam", "Jordan", "Riley", "Casey", "Taylor", "Morgan"]
@@ -587,10 +645,10 @@ class SmartContentEngine:
 
         scenario = template.format(
             word=topic,
-            hero=random.choice(heroes),
-            villain=random.choice(villains),
-            name=random.choice(names),
-            location=random.choice(locations),
+            hero=rng.choice(heroes),
+            villain=rng.choice(villains),
+            name=rng.choice(names),
+            location=rng.choice(locations),
             power_description=f"the power of {topic}",
         )
 
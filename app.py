@@ -4,75 +4,65 @@ Modern modal-based worksheet generator with NGSS standards
 """
 
 from flask import Flask, render_template, send_file, request, jsonify
+import io
+import json
 import os
+import queue
+import secrets
 import sys
+import tempfile
+import threading
+import time
 from datetime import datetime
+from werkzeug.utils import secure_filename
 
 # Add generators to path
 sys.path.insert(0, os.path.dirname(__file__))
 
 from ngss_standards import NGSS_STANDARDS
 from worksheet_formats import WORKSHEET_FORMATS
+from admission import AdmissionController, AdmissionRejected, memory_limited_concurrency
+from bundle import stream_zip
+from storage import ArtifactSweeper, create_store
 
-# Try to import smart generators first, fallback to regular ones
-try:
-    from generators.crossword_smart import generate_crossword_tpt_style as generate_crossword
-    print("Using smart crossword generator")
-except ImportError as e:
-    from generators.crossword_generator import generate_crossword_tpt_style as generate_crossword
-    print(f"Using standard crossword generator: {e}")
-
-try:
-    from generators.word_search_smart import generate_word_search
-    print("Using smart word search generator")
-except ImportError as e:
-    from generators.word_search_generator import generate_word_search
-    print(f"Using standard word search generator: {e}")
-
-try:
-    from generators.matching_smart import generate_matching
-    print("Using smart matching generator")
-except ImportError as e:
-    from generators.matching_generator import generate_matching
-    print(f"Using standard matching generator: {e}")
-
-try:
-    from generators.fill_in_blank import generate_fill_in_blank
-    print("Using fill-in-blank generator")
-except ImportError as e:
-    print(f"Fill-in-blank generator not available: {e}")
-    generate_fill_in_blank = None
-
-try:
-    from generators.short_answer import generate_short_answer
-    print("Using short answer generator")
-except ImportError as e:
-    print(f"Short answer generator not available: {e}")
-    generate_short_answer = None
-
-try:
-    from generators.true_false import generate_true_false
-    print("Using true/false generator")
-except ImportError as e:
-    print(f"True/false generator not available: {e}")
-    generate_true_false = None
-
-FORMAT_GENERATORS = {
-    'crossword': generate_crossword,
-    'word-search': generate_word_search,
-    'matching': generate_matching,
-    'fill-blank': generate_fill_in_blank,
-    'short-answer': generate_short_answer,
-    'true-false': generate_true_false,
-}
-
-AVAILABLE_FORMAT_IDS = {fmt_id for fmt_id, func in FORMAT_GENERATORS.items() if callable(func)}
+from generators.page_naming import page_filename
+from generators.registry import GenerationScheduler, GeneratorRegistry
+
+# Generator modules declare their format id, grades, cost and backends in
+# GENERATOR_INFO. They are imported on first use; when two modules serve the
+# same format the higher priority one (the smart generator) wins.
+FORMAT_GENERATORS = GeneratorRegistry.discover('generators')
+SCHEDULER = GenerationScheduler(FORMAT_GENERATORS)
+
+AVAILABLE_FORMAT_IDS = FORMAT_GENERATORS.available_ids()
 
 app = Flask(__name__)
 app.config['OUTPUT_FOLDER'] = os.path.join(os.path.dirname(__file__), 'output')
-
-# Create output directory
-os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
+# Generated artifacts expire after a day and the store is capped at 2 GiB
+app.config['STORAGE_TTL_SECONDS'] = float(os.environ.get('STORAGE_TTL_SECONDS', 24 * 3600))
+app.config['STORAGE_MAX_BYTES'] = int(os.environ.get('STORAGE_MAX_BYTES', 2 * 1024 ** 3))
+# Generations stop (AI content falls back to templates first) after this budget
+app.config['GENERATION_TIMEOUT_SECONDS'] = float(os.environ.get('GENERATION_TIMEOUT_SECONDS', 60))
+# Concurrent generations are capped by available memory; a few more may wait
+# briefly and the rest get 429 Too Many Requests
+app.config['MAX_CONCURRENT_GENERATIONS'] = (
+    int(os.environ.get('MAX_CONCURRENT_GENERATIONS', 0)) or memory_limited_concurrency()
+)
+app.config['GENERATION_QUEUE_SIZE'] = int(
+    os.environ.get('GENERATION_QUEUE_SIZE', 2 * app.config['MAX_CONCURRENT_GENERATIONS'])
+)
+app.config['GENERATION_QUEUE_WAIT_SECONDS'] = float(os.environ.get('GENERATION_QUEUE_WAIT_SECONDS', 10))
+
+# STORAGE_BACKEND selects local (OUTPUT_FOLDER), tmpfs or s3; see storage.py
+STORE = create_store(os.environ, app.config['OUTPUT_FOLDER'])
+ADMISSION = AdmissionController(
+    app.config['MAX_CONCURRENT_GENERATIONS'],
+    app.config['GENERATION_QUEUE_SIZE'],
+    max_wait=app.config['GENERATION_QUEUE_WAIT_SECONDS'],
+)
+SWEEPER = ArtifactSweeper(
+    STORE, app.config['STORAGE_TTL_SECONDS'], app.config['STORAGE_MAX_BYTES']
+).start()
 
 
 def verify_runtime_environment():
@@ -103,6 +93,10 @@ def verify_runtime_environment():
     print("         which is lower quality. Install a TrueType font and restart.", file=sys.stderr)
 
 
+# Import generators and probe fonts off the request path so startup stays fast
+SCHEDULER.warmup(verify_runtime_environment)
+
+
 @app.route('/')
 def index():
     """Main page"""
@@ -110,6 +104,11 @@ def index():
     for fmt in WORKSHEET_FORMATS:
         fmt_copy = fmt.copy()
         fmt_copy['available'] = fmt['id'] in AVAILABLE_FORMAT_IDS
+        info = FORMAT_GENERATORS.info(fmt['id'])
+        if info:
+            fmt_copy['supported_grades'] = info['grades']
+            fmt_copy['estimated_seconds'] = info['cost']
+            fmt_copy['backends'] = info['backends']
         formats.append(fmt_copy)
 
     return render_template(
@@ -119,81 +118,366 @@ def index():
     )
 
 
-@app.route('/generate', methods=['POST'])
-def generate():
-    """Generate worksheet"""
+def find_standard(standard_code):
+    """Look up a standard by code in any grade band"""
+    for grade in NGSS_STANDARDS:
+        for std in NGSS_STANDARDS[grade]:
+            if std['code'] == standard_code:
+                return std
+    return None
+
+
+def invalid_seed(seed):
+    """True unless seed is absent or an int; JSON true/false are not seeds"""
+    return seed is not None and (isinstance(seed, bool) or not isinstance(seed, int))
+
+
+def query_data():
+    """Request query parameters as /generate fields, with an integer seed converted from text"""
+    data = request.args.to_dict()
+    if data.get('seed') is not None:
+        try:
+            data['seed'] = int(data['seed'])
+        except ValueError:
+            pass  # left as text for generate_worksheet to reject
+    return data
+
+
+def generate_worksheet(data, progress=None, cancel_event=None):
+    """Generate and store a worksheet; returns (response payload, HTTP status)
+
+    progress, if given, receives (stage, message) as generation proceeds.
+    Setting cancel_event stops the generation at its next checkpoint.
+    """
+    from ai_engine.generation_context import DeadlineExceeded, GenerationCancelled
+
+    deadline = time.time() + app.config['GENERATION_TIMEOUT_SECONDS']
     try:
-        data = request.get_json()
         grade_level = data.get('grade_level')
         standard_code = data.get('standard_code')
         worksheet_format = data.get('worksheet_format')
-
-        # Find the standard data
-        standard_data = None
-        for grade in NGSS_STANDARDS:
-            for std in NGSS_STANDARDS[grade]:
-                if std['code'] == standard_code:
-                    standard_data = std
-                    break
-            if standard_data:
-                break
-
+        # Every worksheet is reproducible: reuse the client's seed or hand out a new one
+        seed = data.get('seed')
+        if invalid_seed(seed):
+            return {'success': False, 'error': 'Seed must be an integer'}, 400
+        if seed is None:
+            seed = secrets.randbits(32)
+
+        standard_data = find_standard(standard_code)
         if not standard_data:
-            return jsonify({'success': False, 'error': 'Standard not found'}), 404
-
-        # Generate unique filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_filename = os.path.join(
-            app.config['OUTPUT_FOLDER'],
-            f'{worksheet_format}_{standard_code}_{timestamp}.png'
-        )
+            return {'success': False, 'error': 'Standard not found'}, 404
 
-        generator = FORMAT_GENERATORS.get(worksheet_format)
-        if not callable(generator):
-            return jsonify({
+        if worksheet_format not in AVAILABLE_FORMAT_IDS:
+            return {
                 'success': False,
                 'error': f"Worksheet format '{worksheet_format}' is not available yet."
-            }), 400
-
-        generator(standard_data, grade_level, output_filename)
+            }, 400
 
-        answer_key_filename = output_filename.replace('.png', '_ANSWER_KEY.png')
+        if grade_level not in FORMAT_GENERATORS.info(worksheet_format)['grades']:
+            return {
+                'success': False,
+                'error': f"Worksheet format '{worksheet_format}' is not available for grade {grade_level}."
+            }, 400
 
-        return jsonify({
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        download_name = f'{worksheet_format}_{standard_code}.png'
+
+        # Render into a private scratch directory, then store both pages under
+        # their content hashes so concurrent requests can never collide
+        with tempfile.TemporaryDirectory(prefix='sciencesheetforge-') as work_dir:
+            output_filename = os.path.join(work_dir, download_name)
+            started = time.monotonic()
+            stats = SCHEDULER.run(worksheet_format, standard_data, grade_level, output_filename,
+                                  seed=seed, progress=progress, cancel_event=cancel_event,
+                                  deadline=deadline)
+            render_seconds = time.monotonic() - started
+            worksheet_name = STORE.put_file(output_filename)
+            answer_key_filename = output_filename.replace('.png', '_ANSWER_KEY.png')
+            answer_key_name = STORE.put_file(answer_key_filename)
+            # Pages too long for one sheet continue in <name>_page2.png, ...
+            continuation_pages = {}
+            for first_page in (output_filename, answer_key_filename):
+                pages = continuation_pages[first_page] = []
+                page_path = page_filename(first_page, 2)
+                while os.path.exists(page_path):
+                    pages.append({'artifact': STORE.put_file(page_path), 'name': os.path.basename(page_path)})
+                    page_path = page_filename(first_page, len(pages) + 2)
+
+        answer_key_download_name = download_name.replace('.png', '_ANSWER_KEY.png')
+        print(f"Generated {worksheet_format} in {render_seconds:.2f}s, "
+              f"peak canvas memory {stats['peak_canvas_bytes'] / 1024 ** 2:.1f} MB")
+
+        return {
             'success': True,
-            'worksheet': f'/view/{os.path.basename(output_filename)}',
-            'answer_key': f'/view/{os.path.basename(answer_key_filename)}',
+            'worksheet': f'/view/{worksheet_name}?name={download_name}',
+            'answer_key': f'/view/{answer_key_name}?name={answer_key_download_name}',
             'timestamp': timestamp,
             'worksheet_format': worksheet_format,
-            'standard': standard_code
-        })
+            'standard': standard_code,
+            'seed': seed,
+            'files': [
+                {'artifact': worksheet_name, 'name': download_name},
+                *continuation_pages[output_filename],
+                {'artifact': answer_key_name, 'name': answer_key_download_name},
+                *continuation_pages[answer_key_filename],
+            ],
+            'render': {
+                'seconds': round(render_seconds, 3),
+                'peak_canvas_bytes': stats['peak_canvas_bytes'],
+            },
+        }, 200
+
+    except DeadlineExceeded as e:
+        print(f"Worksheet generation timed out: {e}")
+        return {'success': False, 'error': 'Generation took too long, please try again'}, 504
+
+    except GenerationCancelled as e:
+        # 499: the client went away, so nobody reads this response
+        print(f"Worksheet generation cancelled: {e}")
+        return {'success': False, 'error': 'Generation was cancelled'}, 499
 
     except Exception as e:
         print(f"Error generating worksheet: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({
+        return {
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500
+
+
+def client_id():
+    """Key for fair queuing; run behind werkzeug's ProxyFix so this is the real client"""
+    return request.remote_addr or 'unknown'
+
+
+def busy_response(rejection):
+    """429 telling the client when capacity is likely to be free again"""
+    return jsonify({
+        'success': False,
+        'error': f"{rejection}. Please try again in {rejection.retry_after} seconds.",
+        'retry_after': rejection.retry_after,
+    }), 429, {'Retry-After': str(rejection.retry_after)}
+
+
+@app.route('/generate', methods=['POST'])
+def generate():
+    """Generate worksheet"""
+    try:
+        with ADMISSION.slot(client_id()):
+            payload, status = generate_worksheet(request.get_json())
+    except AdmissionRejected as rejection:
+        return busy_response(rejection)
+    return jsonify(payload), status
+
+
+def server_sent_event(event, payload):
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@app.route('/generate/stream')
+def generate_stream():
+    """Generate worksheet, streaming progress as server-sent events
+
+    Takes the same fields as /generate as query parameters (EventSource can
+    only GET). Emits 'progress' events with a stage and message, then one
+    'complete' event carrying the /generate response or a 'failed' event.
+    """
+    data = query_data()
+
+    # Admit before streaming so a busy server can still answer 429
+    try:
+        ADMISSION.acquire(client_id())
+    except AdmissionRejected as rejection:
+        return busy_response(rejection)
+
+    events = queue.Queue()
+    cancel_event = threading.Event()
+
+    def progress(stage, message):
+        events.put(('progress', {'stage': stage, 'message': message}))
+
+    def work():
+        started = time.monotonic()
+        try:
+            payload, status = generate_worksheet(data, progress, cancel_event)
+        finally:
+            ADMISSION.release(time.monotonic() - started)
+        events.put(('complete' if payload['success'] else 'failed', dict(payload, status=status)))
+
+    threading.Thread(target=work, name='generate-stream', daemon=True).start()
+
+    def stream():
+        try:
+            while True:
+                try:
+                    event, payload = events.get(timeout=5)
+                except queue.Empty:
+                    # Comment line keeps proxies from closing an idle connection,
+                    # and writing it is how a disconnected client gets noticed
+                    yield ": keepalive\n\n"
+                    continue
+                yield server_sent_event(event, payload)
+                if event != 'progress':
+                    return
+        finally:
+            # Nobody reads the result once the stream closes (client cancelled
+            # or disconnected), so stop any work still running
+            cancel_event.set()
+
+    return app.response_class(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
+
+MAX_BUNDLE_FILES = 50
+
+
+def bundle_response(entries, download_name, on_close=None):
+    """Stream a ZIP of (name, file) entries as an attachment"""
+    response = app.response_class(stream_zip(entries), mimetype='application/zip')
+    response.headers['Content-Disposition'] = f'attachment; filename="{download_name}"'
+    response.headers['X-Accel-Buffering'] = 'no'
+    if on_close is not None:
+        # Runs even if the client disconnects before the body starts
+        response.call_on_close(on_close)
+    return response
+
+
+@app.route('/bundle')
+def bundle():
+    """Download several worksheets as one streamed ZIP
+
+    Either bundles stored artifacts, given as repeated file=<artifact>
+    parameters with optional matching name=<download name> parameters, or
+    generates worksheets and answer keys for one standard in several
+    formats (standard_code, grade_level, formats=all or a comma-separated
+    list, optional seed). Generated files are added to the archive as each
+    format finishes; formats that fail are listed in ERRORS.txt.
+    """
+    files = request.args.getlist('file')
+    if files:
+        if len(files) > MAX_BUNDLE_FILES:
+            return jsonify({'success': False, 'error': f'At most {MAX_BUNDLE_FILES} files per bundle'}), 400
+        names = request.args.getlist('name')
+        members = []
+        for index, artifact in enumerate(files):
+            try:
+                found = STORE.stat(artifact)
+            except FileNotFoundError:
+                found = None
+            if found is None:
+                return jsonify({'success': False, 'error': f'File not found: {artifact}'}), 404
+            name = secure_filename(names[index]) if index < len(names) else ''
+            members.append((artifact, name or artifact))
+
+        def stored_entries():
+            for artifact, name in members:
+                yield name, STORE.open(artifact)
+
+        return bundle_response(stored_entries(), 'worksheets.zip')
+
+    data = query_data()
+    standard_code = data.get('standard_code')
+    grade_level = data.get('grade_level')
+    # Checked up front so a bad seed is a 400, not a failure per format
+    if invalid_seed(data.get('seed')):
+        return jsonify({'success': False, 'error': 'Seed must be an integer'}), 400
+    if not find_standard(standard_code):
+        return jsonify({'success': False, 'error': 'Standard not found'}), 404
+
+    requested = data.pop('formats', 'all')
+    if requested == 'all':
+        formats = [
+            format_id for format_id in AVAILABLE_FORMAT_IDS
+            if grade_level in FORMAT_GENERATORS.info(format_id)['grades']
+        ]
+    else:
+        formats = list(dict.fromkeys(fmt.strip() for fmt in requested.split(',') if fmt.strip()))
+        unavailable = [fmt for fmt in formats if fmt not in AVAILABLE_FORMAT_IDS]
+        if unavailable:
+            return jsonify({
+                'success': False,
+                'error': f"Worksheet formats not available: {', '.join(unavailable)}"
+            }), 400
+        unsuited = [fmt for fmt in formats if grade_level not in FORMAT_GENERATORS.info(fmt)['grades']]
+        if unsuited:
+            return jsonify({
+                'success': False,
+                'error': f"Worksheet formats not available for grade {grade_level}: {', '.join(unsuited)}"
+            }), 400
+    if not formats:
+        return jsonify({'success': False, 'error': 'No worksheet formats requested'}), 400
+
+    # One admission slot covers the whole bundle; formats are generated one
+    # at a time while the archive streams
+    try:
+        ADMISSION.acquire(client_id())
+    except AdmissionRejected as rejection:
+        return busy_response(rejection)
+    started = time.monotonic()
+
+    def generated_entries():
+        errors = []
+        for worksheet_format in formats:
+            payload, status = generate_worksheet(dict(data, worksheet_format=worksheet_format))
+            if not payload['success']:
+                errors.append(f"{worksheet_format}: {payload['error']}")
+                continue
+            for item in payload['files']:
+                yield item['name'], STORE.open(item['artifact'])
+        if errors:
+            yield 'ERRORS.txt', io.BytesIO('\n'.join(errors).encode() + b'\n')
+
+    def release():
+        ADMISSION.release(time.monotonic() - started)
+
+    return bundle_response(generated_entries(), f'{secure_filename(standard_code)}_worksheets.zip',
+                           on_close=release)
+
+
+# Artifact names are content hashes, so a URL's bytes never change
+ARTIFACT_MAX_AGE = 365 * 24 * 3600
+
+
+def send_artifact(filename, **kwargs):
+    """Send a stored artifact with a strong ETag, immutable caching and range support"""
+    etag = filename.split('.', 1)[0]
+
+    # The ETag is the content hash, so a matching client copy is current
+    # without touching storage at all
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        try:
+            artifact = STORE.local_path(filename) or STORE.open(filename)
+        except FileNotFoundError:
+            return "File not found", 404
+        # conditional=True answers Range requests with 206 partial content
+        response = send_file(artifact, mimetype='image/png', etag=etag,
+                             max_age=ARTIFACT_MAX_AGE, conditional=True, **kwargs)
+
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = ARTIFACT_MAX_AGE
+    response.cache_control.immutable = True
+    response.cache_control.no_cache = None
+    return response
 
 
 @app.route('/view/<filename>')
 def view_file(filename):
     """View generated worksheet"""
-    file_path = os.path.join(app.config['OUTPUT_FOLDER'], filename)
-    if os.path.exists(file_path):
-        return send_file(file_path, mimetype='image/png')
-    return "File not found", 404
+    return send_artifact(filename)
 
 
 @app.route('/download/<filename>')
 def download_file(filename):
     """Download generated worksheet"""
-    file_path = os.path.join(app.config['OUTPUT_FOLDER'], filename)
-    if os.path.exists(file_path):
-        return send_file(file_path, as_attachment=True, download_name=filename)
-    return "File not found", 404
+    download_name = secure_filename(request.args.get('name', '')) or filename
+    return send_artifact(filename, as_attachment=True, download_name=download_name)
 
 
 if __name__ == '__main__':
@@ -205,6 +489,4 @@ if __name__ == '__main__':
     print("\nPress Ctrl+C to stop the server")
     print("=" * 70)
 
-    verify_runtime_environment()
-
     app.run(debug=True, host='127.0.0.1', port=3000)
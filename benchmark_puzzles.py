@@ -0,0 +1,128 @@
+"""
+Puzzle Benchmark
+Builds and verifies thousands of word searches and crosswords
+
+Each puzzle is built from a real standard with its own seed, then checked
+by generators/puzzle_solver.py: every listed word found exactly once at
+its placement and no banned filler for word searches; consistent entries,
+numbering and letter runs for crosswords. Nothing is rendered, so this
+measures the layout engines and doubles as a regression run; the exit
+status is 1 if any puzzle fails verification.
+
+Usage:
+    python benchmark_puzzles.py --count 1000
+    python benchmark_puzzles.py --count 200 --formats word-search-large --json report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generators.crossword_smart import build_crossword
+from generators.puzzle_solver import verify_crossword, verify_word_search
+from generators.word_search_large import build_large_word_search
+from generators.word_search_smart import build_word_search
+from ngss_standards import NGSS_STANDARDS
+from stats import percentile
+
+
+PUZZLES = {
+    'word-search': (build_word_search, verify_word_search),
+    'word-search-large': (build_large_word_search, verify_word_search),
+    'crossword': (build_crossword, verify_crossword),
+}
+PERCENTILES = (50, 95, 99)
+# Failures listed in the report per format
+MAX_FAILURES_SHOWN = 10
+
+
+def benchmark(format_id: str, count: int, first_seed: int = 0) -> Dict:
+    """Build and verify `count` puzzles of one format, cycling through the standards"""
+    build, verify = PUZZLES[format_id]
+    standards = [(grade, standard) for grade, standards in NGSS_STANDARDS.items() for standard in standards]
+    build_times: List[float] = []
+    verify_times: List[float] = []
+    failures = []
+    for seed in range(first_seed, first_seed + count):
+        grade, standard = standards[seed % len(standards)]
+        started = time.perf_counter()
+        puzzle = build(standard, grade, seed=seed)
+        built = time.perf_counter()
+        problems = verify(puzzle)
+        verify_times.append(time.perf_counter() - built)
+        build_times.append(built - started)
+        if problems:
+            failures.append({'seed': seed, 'standard': standard['code'], 'problems': problems})
+
+    def summary(times):
+        times = sorted(times)
+        return dict({f'p{pct}': round(percentile(times, pct) * 1000, 2) for pct in PERCENTILES},
+                    mean=round(sum(times) / len(times) * 1000, 2))
+
+    return {
+        'puzzles': count,
+        'failed': len(failures),
+        'puzzles_per_second': round(count / (sum(build_times) + sum(verify_times)), 1),
+        'build_ms': summary(build_times),
+        'verify_ms': summary(verify_times),
+        'failures': failures[:MAX_FAILURES_SHOWN],
+    }
+
+
+def print_report(report: Dict):
+    print("=" * 88)
+    print(f"PUZZLE BENCHMARK: {report['count']} puzzles per format")
+    print("=" * 88)
+    header = f"{'format':<20}{'failed':>8}{'per s':>8}" + \
+        ''.join(f"{'build p' + str(pct):>12}" for pct in PERCENTILES) + f"{'verify p95':>12}"
+    print(header)
+    print("-" * len(header))
+    for format_id, stats in report['formats'].items():
+        print(f"{format_id:<20}{stats['failed']:>8}{stats['puzzles_per_second']:>8}"
+              + ''.join(f"{stats['build_ms']['p' + str(pct)]:>12}" for pct in PERCENTILES)
+              + f"{stats['verify_ms']['p95']:>12}")
+    print("\nTimes in milliseconds.")
+    for format_id, stats in report['formats'].items():
+        for failure in stats['failures']:
+            print(f"  {format_id} seed {failure['seed']} ({failure['standard']}): "
+                  + '; '.join(failure['problems']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=200, help='Puzzles per format')
+    parser.add_argument('--formats', default=','.join(PUZZLES),
+                        help=f"Comma-separated formats out of {', '.join(PUZZLES)}")
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the first puzzle')
+    parser.add_argument('--json', metavar='PATH', help='Also write the report as JSON')
+    parser.add_argument('--verbose', action='store_true', help='Show generator output')
+    args = parser.parse_args(argv)
+
+    formats = [fmt.strip() for fmt in args.formats.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in PUZZLES]
+    if unknown:
+        parser.error(f"unknown formats: {', '.join(unknown)}")
+
+    report = {'count': args.count, 'formats': {}}
+    with open(os.devnull, 'w') as devnull:
+        # Builders print progress; keep it out of the report unless asked
+        with redirect_stdout(sys.stdout if args.verbose else devnull):
+            for format_id in formats:
+                report['formats'][format_id] = benchmark(format_id, args.count, args.seed)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    report = main()
+    sys.exit(1 if any(stats['failed'] for stats in report['formats'].values()) else 0)
@@ -0,0 +1,68 @@
+"""
+Bundle Export
+Streams ZIP archives of worksheets without buffering them
+
+zipfile can write to an unseekable stream: each member's CRC and sizes
+then follow its data in a data descriptor instead of being patched into
+the header afterwards. ZipStream collects what zipfile writes and
+stream_zip() hands it out chunk by chunk, so a response holds at most one
+chunk of the archive however large the bundle is, and nothing touches disk.
+
+Worksheets are PNGs, which are already compressed, so members are stored
+rather than deflated.
+"""
+
+import io
+import time
+import zipfile
+from typing import BinaryIO, Iterable, Iterator, List, Tuple
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ZipStream(io.RawIOBase):
+    """Write-only, unseekable sink that zipfile writes into"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """Everything written since the last drain"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[Tuple[str, BinaryIO]], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a ZIP archive of (name, file) entries as it is written
+
+    entries may be a lazy iterator; each file is read in chunk_size pieces
+    and closed once it has been copied into the archive.
+    """
+    sink = ZipStream()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as archive:
+        for name, source in entries:
+            info = zipfile.ZipInfo(name, time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_STORED
+            with source, archive.open(info, 'w') as member:
+                while True:
+                    chunk = source.read(chunk_size)
+                    if not chunk:
+                        break
+                    member.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            # The member's data descriptor
+            yield sink.drain()
+    # The central directory, written when the archive closes
+    yield sink.drain()
@@ -6,6 +6,16 @@ Beautiful, sellable worksheets with decorative elements
 import random
 from PIL import Image, ImageDraw, ImageFont
 
+# Registry metadata; read by generators/registry.py without importing this module
+GENERATOR_INFO = {
+    'id': 'crossword',
+    'entry_point': 'generate_crossword_tpt_style',
+    'grades': ['K-2', '3-5', '6-8'],
+    'cost': 1.5,
+    'backends': ['png'],
+    'priority': 0,
+}
+
 
 # COMPREHENSIVE CLUE DATABASE
 SCIENCE_CLUES = {
@@ -97,8 +107,9 @@ def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
     return name_y + 80
 
 
-def generate_crossword_tpt_style(standard_data, grade_level, output_filename="crossword_tpt.png"):
+def generate_crossword_tpt_style(standard_data, grade_level, output_filename="crossword_tpt.png", seed=None):
     """Generate BEAUTIFUL TPT-style crossword puzzle"""
+    rng = seed if isinstance(seed, random.Random) else random.Random(seed)
 
     vocabulary = standard_data['vocabulary'][:15]
     available_words = [w for w in vocabulary if w.lower() in SCIENCE_CLUES]
@@ -106,7 +117,7 @@ def generate_crossword_tpt_style(standard_data, grade_level, output_filename="cr
     if len(available_words) < 8:
         available_words = list(SCIENCE_CLUES.keys())[:12]
 
-    selected_words = random.sample(available_words, min(10, len(available_words)))
+    selected_words = rng.sample(available_words, min(10, len(available_words)))
     selected_words.sort(key=len, reverse=True)
 
     # Simple placement algorithm
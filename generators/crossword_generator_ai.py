@@ -4,7 +4,6 @@ Uses Hugging Face API for intelligent content generation
 TPT-Ready Professional Quality
 """
 
-import random
 import sys
 import os
 from PIL import Image, ImageDraw, ImageFont
@@ -13,6 +12,7 @@ from PIL import Image, ImageDraw, ImageFont
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from ai_engine import get_ai_generator
+from ai_engine.generation_context import report_progress
 
 
 def draw_decorative_border(draw, width, height):
@@ -88,7 +88,7 @@ def generate_crossword_tpt_style(standard_data, grade_level, output_filename="cr
     ai = get_ai_generator()
 
     # Generate vocabulary using AI
-    print("   📚 Generating vocabulary...")
+    report_progress('vocabulary', "   📚 Generating vocabulary...")
     vocabulary = ai.generate_vocabulary_list(
         standard_data['title'],
         standard_data['code'],
@@ -100,9 +100,11 @@ def generate_crossword_tpt_style(standard_data, grade_level, output_filename="cr
         vocabulary = standard_data.get('vocabulary', [])[:15]
 
     # Generate AI-powered clues
-    print("   🧩 Generating crossword clues...")
+    report_progress('clues', "   🧩 Generating crossword clues...")
     clues_dict = {}
-    for word in vocabulary[:10]:
+    for index, word in enumerate(vocabulary[:10], 1):
+        # AI clues can take seconds each, so report every one
+        report_progress('clues', f"   🧩 Clue {index}/{len(vocabulary[:10])}: {word}")
         clue = ai.generate_clue(word, grade_level, difficulty="medium")
         clues_dict[word] = clue
 
@@ -110,7 +112,7 @@ def generate_crossword_tpt_style(standard_data, grade_level, output_filename="cr
     selected_words = list(clues_dict.keys())[:10]
     selected_words.sort(key=len, reverse=True)
 
-    print(f"   ✓ Generated {len(selected_words)} words with AI clues")
+    report_progress('clues', f"   ✓ Generated {len(selected_words)} words with AI clues")
 
     # Simple placement algorithm
     grid_size = 15
@@ -197,9 +199,10 @@ def generate_crossword_tpt_style(standard_data, grade_level, output_filename="cr
                 if placed:
                     break
 
-    print(f"   📍 Placed {len(placements)} words in grid")
+    report_progress('placement', f"   📍 Placed {len(placements)} words in grid")
 
     # CREATE BEAUTIFUL WORKSHEET
+    report_progress('render', "   Rendering worksheet...")
     width, height = 2550, 3300  # 8.5x11 at 300 DPI
     worksheet = Image.new('RGB', (width, height), 'white')
     draw = ImageDraw.Draw(worksheet)
@@ -307,6 +310,7 @@ def generate_crossword_tpt_style(standard_data, grade_level, output_filename="cr
     draw.text(((width - footer_width) // 2, footer_y + 5),
              footer_text, fill='#7f8c8d', font=small_font)
 
+    report_progress('encode', "   Encoding worksheet...")
     worksheet.save(output_filename, quality=100, dpi=(300, 300))
     print(f"✅ AI-powered crossword saved: {output_filename}")
 
@@ -0,0 +1,362 @@
+"""
+Crossword Layout
+Compact crossword placement with a seeded search over word orders
+
+Words are placed on an unbounded sparse grid, so nothing fails for lack
+of room until the layout would outgrow what a page can show. Each word
+goes at the crossing that intersects most and grows the bounding box
+least; a letter index finds every possible crossing directly instead of
+trying each placed word letter by letter. A word may only touch the grid
+where it crosses, so no unintended words form beside or after it. Several
+word orders are tried and the densest layout is cropped to its bounding box.
+
+CrosswordGrid numbers the cropped grid in standard reading order and
+checks that every run of letters is a placed word, both in one pass.
+
+search_candidates() widens the search: it runs several independently
+seeded searches in worker processes and keeps the best layout that is
+ready when its wall-clock budget runs out. The pool gets this process's
+share of the cores (see share_cores); with no spare core, or inside a
+worker process already, the candidates are searched here one by one.
+"""
+
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context, parent_process, util
+
+from ai_engine.generation_context import current_context
+
+
+# Largest grid side that still gets legible cells on a page (see fit_cell_size)
+MAX_GRID_SIZE = 21
+# Word orders tried per search; bounded by count, not time, so a seed always
+# gives the same layout however loaded the machine is
+SEARCH_ATTEMPTS = 24
+
+MIN_CELL_SIZE, MAX_CELL_SIZE = 50, 120
+
+# Parallel candidate searches per crossword; 1 searches in-process
+CANDIDATES = int(os.environ.get('CROSSWORD_CANDIDATES', 1))
+CANDIDATE_SECONDS = float(os.environ.get('CROSSWORD_CANDIDATE_SECONDS', 1.5))
+
+_pool = None
+_pool_lock = threading.Lock()
+# Processes running crosswords side by side, e.g. gunicorn workers; see share_cores
+_core_sharers = 1
+
+STEPS = {'across': (0, 1), 'down': (1, 0)}
+
+
+class Layout:
+    """Words placed on a sparse grid; cells maps (row, col) to a letter"""
+
+    def __init__(self, max_size=MAX_GRID_SIZE):
+        self.max_size = max_size
+        self.cells = {}
+        self.placements = []  # (word, row, col, direction)
+        self.intersections = 0
+        self.bounds = None  # (top, left, bottom, right), inclusive
+        # Direction of the word through each cell; crossed cells are full
+        self._directions = {}
+        self._crossed = set()
+        # letter -> [(row, col)] of the cells holding it
+        self._letter_index = defaultdict(list)
+
+    def _grown_bounds(self, row, col, direction, length):
+        d_row, d_col = STEPS[direction]
+        end_row, end_col = row + d_row * (length - 1), col + d_col * (length - 1)
+        if self.bounds is None:
+            return row, col, end_row, end_col
+        top, left, bottom, right = self.bounds
+        return min(top, row), min(left, col), max(bottom, end_row), max(right, end_col)
+
+    def crossings(self, word, row, col, direction):
+        """Number of letters shared with placed words, or None if the word does not fit"""
+        top, left, bottom, right = self._grown_bounds(row, col, direction, len(word))
+        if bottom - top >= self.max_size or right - left >= self.max_size:
+            return None
+        d_row, d_col = STEPS[direction]
+        cells = self.cells
+        # Nothing may extend the word at either end
+        if (row - d_row, col - d_col) in cells or (row + d_row * len(word), col + d_col * len(word)) in cells:
+            return None
+        shared = 0
+        for offset, letter in enumerate(word):
+            cell = (row + d_row * offset, col + d_col * offset)
+            existing = cells.get(cell)
+            if existing is None:
+                # A new letter with a neighbour across the word's direction
+                # would spell a word nobody placed
+                if (cell[0] + d_col, cell[1] + d_row) in cells or (cell[0] - d_col, cell[1] - d_row) in cells:
+                    return None
+                continue
+            # A shared letter must cross a word running the other way
+            if existing != letter or cell in self._crossed or self._directions[cell] == direction:
+                return None
+            shared += 1
+        return shared
+
+    def candidates(self, word):
+        """Yield (crossings, area, row, col, direction) for every valid crossing"""
+        for offset, letter in enumerate(word):
+            for cell_row, cell_col in self._letter_index.get(letter, ()):
+                if (cell_row, cell_col) in self._crossed:
+                    continue
+                direction = 'down' if self._directions[cell_row, cell_col] == 'across' else 'across'
+                d_row, d_col = STEPS[direction]
+                row, col = cell_row - d_row * offset, cell_col - d_col * offset
+                shared = self.crossings(word, row, col, direction)
+                if not shared:
+                    continue
+                top, left, bottom, right = self._grown_bounds(row, col, direction, len(word))
+                yield shared, (bottom - top + 1) * (right - left + 1), row, col, direction
+
+    def add(self, word, row, col, direction):
+        d_row, d_col = STEPS[direction]
+        for offset, letter in enumerate(word):
+            cell = (row + d_row * offset, col + d_col * offset)
+            if cell in self.cells:
+                self.intersections += 1
+                self._crossed.add(cell)
+            else:
+                self.cells[cell] = letter
+                self._directions[cell] = direction
+                self._letter_index[letter].append(cell)
+        self.bounds = self._grown_bounds(row, col, direction, len(word))
+        self.placements.append((word, row, col, direction))
+
+    def place(self, word):
+        """Place a word at its best crossing; the first word anchors the grid"""
+        if not self.placements:
+            if len(word) > self.max_size:
+                return False
+            self.add(word, 0, 0, 'across')
+            return True
+        best = None
+        for shared, area, row, col, direction in self.candidates(word):
+            # Most crossings first, then the smallest bounding box
+            key = (shared, -area)
+            if best is None or key > best[0]:
+                best = (key, row, col, direction)
+        if best is None:
+            return False
+        self.add(word, *best[1:])
+        return True
+
+    @property
+    def area(self):
+        if self.bounds is None:
+            return 0
+        top, left, bottom, right = self.bounds
+        return (bottom - top + 1) * (right - left + 1)
+
+    @property
+    def density(self):
+        return len(self.cells) / self.area if self.cells else 0.0
+
+    def score(self):
+        """Higher is better: words placed, then fill density, then crossings"""
+        return len(self.placements), round(self.density, 6), self.intersections
+
+    def to_grid(self):
+        """Crop to the bounding box; returns (rows of letters, shifted placements)"""
+        top, left, bottom, right = self.bounds
+        grid = [[' '] * (right - left + 1) for _ in range(bottom - top + 1)]
+        for (row, col), letter in self.cells.items():
+            grid[row - top][col - left] = letter
+        placements = [(word, row - top, col - left, direction)
+                      for word, row, col, direction in self.placements]
+        return [''.join(row) for row in grid], placements
+
+
+class CrosswordGrid:
+    """A solved crossword grid (rows of letters, ' ' for blanks) with standard numbering
+
+    slots lists (number, row, col, direction, length) for every run of two
+    or more letters. Numbers go in reading order, and a cell that starts
+    both an across and a down run has one number for both.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.slots = self._number()
+
+    def _run_length(self, row, col, direction):
+        d_row, d_col = STEPS[direction]
+        length = 0
+        while (row < len(self.rows) and col < len(self.rows[row])
+               and self.rows[row][col] != ' '):
+            length += 1
+            row, col = row + d_row, col + d_col
+        return length
+
+    def _number(self):
+        rows = self.rows
+        slots = []
+        number = 0
+        for row, line in enumerate(rows):
+            for col, letter in enumerate(line):
+                if letter == ' ':
+                    continue
+                starts = []
+                if (col == 0 or line[col - 1] == ' ') and col + 1 < len(line) and line[col + 1] != ' ':
+                    starts.append('across')
+                if ((row == 0 or rows[row - 1][col] == ' ')
+                        and row + 1 < len(rows) and rows[row + 1][col] != ' '):
+                    starts.append('down')
+                if starts:
+                    number += 1
+                    for direction in starts:
+                        slots.append((number, row, col, direction, self._run_length(row, col, direction)))
+        return slots
+
+    def unintended_words(self, placements):
+        """Runs of letters in the grid that are not exactly one placed word"""
+        placed = {(row, col, direction): word for word, row, col, direction in placements}
+        problems = []
+        for number, row, col, direction, length in self.slots:
+            word = placed.get((row, col, direction))
+            if word is None or len(word) != length:
+                d_row, d_col = STEPS[direction]
+                problems.append(''.join(self.rows[row + d_row * i][col + d_col * i] for i in range(length)))
+        return problems
+
+    def numbered(self, placements):
+        """(number, word, row, col, direction) for each placement, in clue order"""
+        placed = {(row, col, direction): word for word, row, col, direction in placements}
+        return [(number, placed[row, col, direction], row, col, direction)
+                for number, row, col, direction, _ in self.slots
+                if (row, col, direction) in placed]
+
+
+def lay_out(words, max_size=MAX_GRID_SIZE):
+    """Place words in the given order; words that do not fit are skipped"""
+    layout = Layout(max_size)
+    for word in words:
+        layout.place(word)
+    return layout
+
+
+def search_layout(words, rng, attempts=SEARCH_ATTEMPTS, max_size=MAX_GRID_SIZE):
+    """Try several word orders and keep the best-scoring layout
+
+    The first attempt places the longest words first, which usually gives
+    every later word something to cross; the rest are rng shuffles.
+    """
+    order = sorted(words, key=len, reverse=True)
+    best = None
+    for attempt in range(attempts):
+        if attempt:
+            order = list(words)
+            rng.shuffle(order)
+        layout = lay_out(order, max_size)
+        if best is None or layout.score() > best.score():
+            best = layout
+    return best
+
+
+def _search_candidate(words, seed, attempts, max_size):
+    """Worker entry point: one seeded search, returned as (score, grid, placements)"""
+    layout = search_layout(words, random.Random(seed), attempts, max_size)
+    return (layout.score(),) + layout.to_grid()
+
+
+def share_cores(processes):
+    """Declare how many processes share the cores, so candidate pools do not oversubscribe them"""
+    global _core_sharers
+    _core_sharers = max(1, processes)
+
+
+def pool_size(candidates):
+    """Worker processes for candidates, 0 to search them in-process
+
+    A pool worker (the generation scheduler's, say) never starts a pool of
+    its own, and neither does a process whose share of the cores is one.
+    """
+    if parent_process() is not None:
+        return 0
+    size = min(candidates, (os.cpu_count() or 1) // _core_sharers)
+    return size if size > 1 else 0
+
+
+def _get_pool(size):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, like the generation scheduler: the caller may have live threads
+            _pool = ProcessPoolExecutor(size, mp_context=get_context('spawn'))
+            # Inside a generation worker, multiprocessing joins child processes
+            # at exit before atexit hooks run, so idle pool workers would never
+            # exit. Shut them down first, ahead of the pool queues' own
+            # finalizers (priority 10), which would drop the stop sentinels
+            util.Finalize(_pool, _shutdown_pool, exitpriority=100)
+        return _pool
+
+
+def _shutdown_pool(wait=True):
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait, cancel_futures=True)
+        _pool = None
+
+
+def search_candidates(words, rng, candidates=None, budget_seconds=None,
+                      attempts=SEARCH_ATTEMPTS, max_size=MAX_GRID_SIZE):
+    """Best of several independently seeded searches; returns (grid, placements)
+
+    Candidates run in worker processes (see pool_size) and are ranked by
+    Layout.score(), ties going to the lower candidate index, so the result
+    depends only on rng unless the budget (also capped by the generation's
+    deadline) cuts some candidates off. If none finish in time the first
+    is searched here. Without a pool they are searched here in turn until
+    the budget runs out, with the same ranking.
+    """
+    candidates = CANDIDATES if candidates is None else candidates
+    if candidates <= 1:
+        layout = search_layout(words, rng, attempts, max_size)
+        return layout.to_grid()
+
+    seeds = [rng.getrandbits(32) for _ in range(candidates)]
+    budget = current_context().timeout(CANDIDATE_SECONDS if budget_seconds is None else budget_seconds)
+    size = pool_size(candidates)
+    results = []
+    if not size:
+        deadline = time.monotonic() + budget
+        for index, seed in enumerate(seeds):
+            if index and time.monotonic() > deadline:
+                break
+            results.append((_search_candidate(list(words), seed, attempts, max_size), -index))
+    else:
+        results = _search_pooled(words, seeds, size, budget, attempts, max_size)
+
+    if not results:
+        results = [(_search_candidate(list(words), seeds[0], attempts, max_size), 0)]
+    (score, grid, placements), _ = max(results, key=lambda item: (item[0][0], item[1]))
+    return grid, placements
+
+
+def _search_pooled(words, seeds, size, budget, attempts, max_size):
+    """[(result, -index)] of the candidates a pool of size finished within budget"""
+    results = []
+    try:
+        futures = [_get_pool(size).submit(_search_candidate, list(words), seed, attempts, max_size)
+                   for seed in seeds]
+        done, pending = wait(futures, timeout=budget)
+        for future in pending:
+            future.cancel()
+        results = [(future.result(), -index) for index, future in enumerate(futures) if future in done]
+    except (BrokenProcessPool, OSError) as e:
+        print(f"   Crossword candidate pool failed ({e}); searching in-process")
+        _shutdown_pool(wait=False)
+    return results
+
+
+def fit_cell_size(rows, cols, width, height, min_size=MIN_CELL_SIZE, max_size=MAX_CELL_SIZE):
+    """Largest cell size that fits a rows x cols grid in width x height"""
+    return max(min_size, min(max_size, width // max(cols, 1), height // max(rows, 1)))
@@ -3,31 +3,43 @@ Smart Crossword Generator
 Uses intelligent content engine for TPT-quality worksheets
 """
 
-import random
 import sys
 import os
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from ai_engine.smart_content import get_smart_content
-
-
-def draw_decorative_border(draw, width, height):
-    """Add decorative border - TPT style"""
-    border_color = '#2c3e50'
-    margin = 50
-
-    draw.rectangle([margin, margin, width-margin, height-margin],
-                   outline=border_color, width=8)
-    draw.rectangle([margin+15, margin+15, width-margin-15, height-margin-15],
-                   outline=border_color, width=3)
-
-    corner_size = 25
-    for x, y in [(margin, margin), (width-margin-corner_size, margin),
-                 (margin, height-margin-corner_size), (width-margin-corner_size, height-margin-corner_size)]:
-        draw.rectangle([x, y, x+corner_size, y+corner_size], fill=border_color)
+from ai_engine.generation_context import report_progress
+from ai_engine.smart_content import get_smart_content, make_rng
+from generators.page_naming import page_filename
+from generators.page_renderer import draw_continued_header, get_font, new_page, save_pages, wrap_text
+from generators.crossword_layout import CrosswordGrid, fit_cell_size, search_candidates
+from generators.grid_renderer import blit_letters, draw_cell_runs
+from generators.puzzle_model import CrosswordEntry, CrosswordPuzzle, Standard
+
+# Registry metadata; read by generators/registry.py without importing this module
+GENERATOR_INFO = {
+    'id': 'crossword',
+    'entry_point': 'generate_crossword_tpt_style',
+    'grades': ['K-2', '3-5', '6-8'],
+    'cost': 2.0,
+    'backends': ['png'],
+    'priority': 10,
+}
+
+# Page space around the grid: side margins and the footer band
+GRID_MARGIN = 150
+FOOTER_SPACE = 160
+# Clue list geometry at the largest clue size: first line, each wrapped line,
+# and the clue text width
+CLUE_HEIGHT, CLUE_LINE_HEIGHT = 65, 50
+CLUE_TEXT_WIDTH = 960
+# Clue sizes tried, largest first, before the clues move to a page of their own
+CLUE_FONT_SIZES = (42, 38, 36)
+# Top of the clue section on a continuation page, under its slim header
+CONTINUED_CLUES_Y = 380
+WORKSHEET_COLORS = ('#3498db', '#2980b9', '#21618c')
 
 
 def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
@@ -35,9 +47,8 @@ def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
     title_font, header_font, subtitle_font = fonts
 
     header_height = 280
-    colors = ['#3498db', '#2980b9', '#21618c']
 
-    for i, color in enumerate(colors):
+    for i, color in enumerate(WORKSHEET_COLORS):
         y_start = 80 + i * 30
         draw.rectangle([80, y_start, width-80, y_start + 30], fill=color)
 
@@ -66,25 +77,78 @@ def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
     return name_y + 80
 
 
-def generate_crossword_tpt_style(standard_data, grade_level, output_filename="crossword.png"):
-    """Generate smart TPT-style crossword"""
+def clue_line_heights(font_size):
+    """Heights of a clue's first line and of each wrapped line at font_size"""
+    return (CLUE_HEIGHT * font_size // CLUE_FONT_SIZES[0],
+            CLUE_LINE_HEIGHT * font_size // CLUE_FONT_SIZES[0])
+
+
+def wrap_clues(draw, entries, font_size):
+    """Across and down columns of (entry, wrapped lines), and the height of the clue section"""
+    font = get_font(font_size)
+    clue_height, line_height = clue_line_heights(font_size)
+    columns = [[(entry, wrap_text(draw, entry.clue, font, CLUE_TEXT_WIDTH))
+                for entry in entries if entry.direction == direction]
+               for direction in ('across', 'down')]
+    clues_height = 100 + 90 + max(
+        sum(clue_height + line_height * (len(lines) - 1) for _, lines in clues)
+        for clues in columns
+    )
+    return columns, clues_height
+
+
+def draw_clues(draw, clues, x, y, color, font_size):
+    """Draw numbered (entry, wrapped lines) clues in a column starting at y"""
+    font = get_font(font_size)
+    clue_height, line_height = clue_line_heights(font_size)
+    for entry, lines in clues:
+        draw.ellipse([x, y, x + 35, y + 35], fill='#ecf0f1', outline=color, width=2)
+        draw.text((x + 10, y + 5), str(entry.number), fill='#2c3e50', font=font)
+        for line in lines:
+            draw.text((x + 50, y + 5), line, fill='#2c3e50', font=font)
+            y += line_height
+        y += clue_height - line_height
+    return y
+
+
+def draw_clue_section(draw, width, columns, clues_y, header_font, font_size):
+    """Draw the ACROSS and DOWN clue columns under their title bars"""
+    draw.rectangle([120, clues_y - 30, width-120, clues_y - 25], fill='#f39c12')
+
+    across_x = 150
+    draw.rectangle([across_x - 20, clues_y, across_x + 500, clues_y + 60],
+                   fill='#3498db', outline='#2980b9', width=3)
+    draw.text((across_x + 150, clues_y + 10), "ACROSS", fill='white', font=header_font)
+    draw_clues(draw, columns[0], across_x, clues_y + 90, '#3498db', font_size)
+
+    down_x = width // 2 + 100
+    draw.rectangle([down_x - 20, clues_y, down_x + 450, clues_y + 60],
+                   fill='#27ae60', outline='#229954', width=3)
+    draw.text((down_x + 140, clues_y + 10), "DOWN", fill='white', font=header_font)
+    draw_clues(draw, columns[1], down_x, clues_y + 90, '#27ae60', font_size)
+
+
+def build_crossword(standard_data, grade_level, seed=None, candidates=None):
+    """Generate the crossword puzzle without rendering it"""
 
     print(f"Generating smart crossword for {standard_data['code']}...")
 
-    # Get smart content engine
+    # Get smart content engine and this puzzle's private random generator
     content = get_smart_content()
+    rng = make_rng(seed)
 
     # Generate vocabulary
-    print("   Generating vocabulary...")
+    report_progress('vocabulary', "   Generating vocabulary...")
     vocabulary = content.generate_vocabulary_words(
         standard_data['title'],
         count=15,
         vocabulary_pool=standard_data.get('vocabulary'),
         topics=standard_data.get('topics'),
+        rng=rng,
     )
 
     # Generate clues
-    print("   Generating smart clues...")
+    report_progress('clues', "   Generating smart clues...")
     clues_dict = {}
     for word in vocabulary[:10]:
         clue = content.generate_crossword_clue(word, grade_level, difficulty="medium")
@@ -93,216 +157,146 @@ def generate_crossword_tpt_style(standard_data, grade_level, output_filename="cr
     selected_words = list(clues_dict.keys())[:10]
     selected_words.sort(key=len, reverse=True)
 
-    print(f"   Generated {len(selected_words)} words with smart clues")
-
-    # Simple placement algorithm
-    grid_size = 15
-    grid = [[' ' for _ in range(grid_size)] for _ in range(grid_size)]
-    placements = []
-
-    first_word = selected_words[0].upper()
-    start_row = grid_size // 2
-    start_col = (grid_size - len(first_word)) // 2
+    report_progress('clues', f"   Generated {len(selected_words)} words with smart clues")
+
+    # Try several word orders on an unbounded grid and keep the densest layout,
+    # across CROSSWORD_CANDIDATES worker processes when configured
+    by_upper = {word.upper(): word for word in selected_words}
+    grid, placements = search_candidates(list(by_upper), rng, candidates)
+
+    placed = {word for word, _, _, _ in placements}
+    for word in by_upper:
+        if word not in placed:
+            print(f"   Warning: could not place '{by_upper[word]}' in crossword grid")
+
+    report_progress('placement', f"   Placed {len(placements)} words in grid")
+
+    # Number in reading order and make sure no stray letter runs slipped in
+    crossword = CrosswordGrid(grid)
+    unintended = crossword.unintended_words(placements)
+    if unintended:
+        raise ValueError(f"Crossword layout spells unplaced words: {', '.join(unintended)}")
+
+    entries = [
+        CrosswordEntry(by_upper[word], row, col, direction, number,
+                       clues_dict.get(by_upper[word], "Science term"))
+        for number, word, row, col, direction in crossword.numbered(placements)
+    ]
+    return CrosswordPuzzle(
+        Standard.from_standard_data(standard_data),
+        grade_level,
+        grid,
+        entries,
+    )
 
-    for i, letter in enumerate(first_word):
-        grid[start_row][start_col + i] = letter
 
-    placements.append({
-        'word': selected_words[0],
-        'row': start_row,
-        'col': start_col,
-        'direction': 'across',
-        'number': 1
-    })
+def render_crossword(puzzle, output_filename="crossword.png"):
+    """Render a crossword puzzle and its answer key
 
-    # Place more words
-    word_num = 2
-    for word in selected_words[1:8]:
-        word_upper = word.upper()
-        placed = False
-
-        for existing in placements[:]:
-            if placed:
-                break
-            for i, letter in enumerate(word_upper):
-                existing_word = existing['word'].upper()
-                for j, ex_letter in enumerate(existing_word):
-                    if letter == ex_letter:
-                        if existing['direction'] == 'across':
-                            new_row = existing['row'] - i
-                            new_col = existing['col'] + j
-
-                            if new_row >= 0 and new_row + len(word_upper) <= grid_size:
-                                can_place = all(
-                                    grid[new_row + k][new_col] in [' ', word_upper[k]]
-                                    for k in range(len(word_upper))
-                                )
-
-                                if can_place:
-                                    for k, l in enumerate(word_upper):
-                                        grid[new_row + k][new_col] = l
-
-                                    placements.append({
-                                        'word': word,
-                                        'row': new_row,
-                                        'col': new_col,
-                                        'direction': 'down',
-                                        'number': word_num
-                                    })
-                                    word_num += 1
-                                    placed = True
-                                    break
-                        else:
-                            new_row = existing['row'] + j
-                            new_col = existing['col'] - i
-
-                            if new_col >= 0 and new_col + len(word_upper) <= grid_size:
-                                can_place = all(
-                                    grid[new_row][new_col + k] in [' ', word_upper[k]]
-                                    for k in range(len(word_upper))
-                                )
-
-                                if can_place:
-                                    for k, l in enumerate(word_upper):
-                                        grid[new_row][new_col + k] = l
-
-                                    placements.append({
-                                        'word': word,
-                                        'row': new_row,
-                                        'col': new_col,
-                                        'direction': 'across',
-                                        'number': word_num
-                                    })
-                                    word_num += 1
-                                    placed = True
-                                    break
-                if placed:
-                    break
-
-        if not placed:
-            print(f"   Warning: could not place '{word}' in crossword grid")
-
-    print(f"   Placed {len(placements)} words in grid")
+    The clues shrink to fit under the grid; if they still do not fit they
+    continue on a second page, saved as <name>_page2.png.
+    """
+    report_progress('render', "   Rendering worksheet and answer key...")
+    standard_data = puzzle.standard.as_standard_data()
+    grade_level = puzzle.grade_level
+    grid = puzzle.grid
+    rows, cols = len(grid), len(grid[0])
 
     # CREATE WORKSHEET
-    width, height = 2550, 3300
-    worksheet = Image.new('RGB', (width, height), 'white')
+    worksheet = new_page()
+    width, height = worksheet.size
     draw = ImageDraw.Draw(worksheet)
 
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 100)
-        header_font = ImageFont.truetype("arial.ttf", 65)
-        subtitle_font = ImageFont.truetype("arial.ttf", 50)
-        text_font = ImageFont.truetype("arial.ttf", 42)
-        small_font = ImageFont.truetype("arial.ttf", 38)
-        num_font = ImageFont.truetype("arial.ttf", 28)
-    except:
-        title_font = header_font = subtitle_font = text_font = small_font = num_font = ImageFont.load_default()
-
-    draw_decorative_border(draw, width, height)
+    title_font = get_font(100)
+    header_font = get_font(65)
+    subtitle_font = get_font(50)
+
     grid_start_y = draw_tpt_header(draw, width, standard_data, grade_level,
                                    (title_font, header_font, subtitle_font))
 
+    # Every clue is shown, wrapped to its column. Cells are as large as the
+    # space above the clues allows, down to the smallest legible cell; past
+    # that the clues shrink, and then move to a page of their own
+    bottom = height - FOOTER_SPACE
+    for font_size in CLUE_FONT_SIZES:
+        columns, clues_height = wrap_clues(draw, puzzle.entries, font_size)
+        cell_size = fit_cell_size(rows, cols, width - 2 * GRID_MARGIN,
+                                  bottom - clues_height - grid_start_y)
+        if grid_start_y + rows * cell_size + clues_height <= bottom:
+            clues_page = None
+            break
+    else:
+        clues_page = new_page()
+        for font_size in CLUE_FONT_SIZES:
+            columns, clues_height = wrap_clues(draw, puzzle.entries, font_size)
+            if CONTINUED_CLUES_Y - 100 + clues_height <= bottom:
+                break
+        cell_size = fit_cell_size(rows, cols, width - 2 * GRID_MARGIN, bottom - grid_start_y)
+
     # GRID
-    cell_size = 65
-    grid_width = grid_size * cell_size
+    grid_width = cols * cell_size
+    grid_height = rows * cell_size
     grid_start_x = (width - grid_width) // 2
 
     shadow_offset = 6
     draw.rectangle([grid_start_x + shadow_offset, grid_start_y + shadow_offset,
-                   grid_start_x + grid_width + shadow_offset, grid_start_y + (grid_size * cell_size) + shadow_offset],
+                   grid_start_x + grid_width + shadow_offset, grid_start_y + grid_height + shadow_offset],
                   fill='#bdc3c7')
 
-    for row in range(grid_size):
-        for col in range(grid_size):
-            if grid[row][col] != ' ':
-                x = grid_start_x + col * cell_size
-                y = grid_start_y + row * cell_size
-                draw.rectangle([x, y, x + cell_size, y + cell_size],
-                             fill='white', outline='#2c3e50', width=3)
+    draw_cell_runs(draw, grid, (grid_start_x, grid_start_y), cell_size,
+                   fill='white', outline='#2c3e50', width=3)
 
-    for placement in placements:
-        x = grid_start_x + placement['col'] * cell_size
-        y = grid_start_y + placement['row'] * cell_size
-        draw.ellipse([x+2, y+2, x+22, y+22], fill='#3498db')
-        draw.text((x + 7, y + 2), str(placement['number']), fill='white', font=num_font)
+    # Number badges scale with the cell; 20px badges suit 65px cells
+    badge = cell_size * 20 // 65
+    num_font = get_font(cell_size * 28 // 65)
+    numbered_cells = {(entry.row, entry.col): entry.number for entry in puzzle.entries}
+    for (row, col), number in numbered_cells.items():
+        x = grid_start_x + col * cell_size
+        y = grid_start_y + row * cell_size
+        draw.ellipse([x+2, y+2, x+2+badge, y+2+badge], fill='#3498db')
+        draw.text((x + 2 + badge // 4, y + 2), str(number), fill='white', font=num_font)
 
     # CLUES
-    clues_y = grid_start_y + (grid_size * cell_size) + 100
-    draw.rectangle([120, clues_y - 30, width-120, clues_y - 25], fill='#f39c12')
-
-    across_x = 150
-    draw.rectangle([across_x - 20, clues_y, across_x + 500, clues_y + 60],
-                   fill='#3498db', outline='#2980b9', width=3)
-    draw.text((across_x + 150, clues_y + 10), "ACROSS", fill='white', font=header_font)
-
-    clues_y += 90
-    across_clues = [p for p in placements if p['direction'] == 'across']
-    for placement in across_clues[:5]:
-        clue = clues_dict.get(placement['word'], "Science term")
-        if len(clue) > 55:
-            clue = clue[:55] + "..."
-
-        draw.ellipse([across_x, clues_y, across_x + 35, clues_y + 35], fill='#ecf0f1', outline='#3498db', width=2)
-        draw.text((across_x + 10, clues_y + 5), str(placement['number']), fill='#2c3e50', font=text_font)
-        draw.text((across_x + 50, clues_y + 5), clue, fill='#2c3e50', font=text_font)
-        clues_y += 65
-
-    down_x = width // 2 + 100
-    clues_y = grid_start_y + (grid_size * cell_size) + 100
-
-    draw.rectangle([down_x - 20, clues_y, down_x + 450, clues_y + 60],
-                   fill='#27ae60', outline='#229954', width=3)
-    draw.text((down_x + 140, clues_y + 10), "DOWN", fill='white', font=header_font)
-
-    clues_y += 90
-    down_clues = [p for p in placements if p['direction'] == 'down']
-    for placement in down_clues[:5]:
-        clue = clues_dict.get(placement['word'], "Science term")
-        if len(clue) > 50:
-            clue = clue[:50] + "..."
-
-        draw.ellipse([down_x, clues_y, down_x + 35, clues_y + 35], fill='#ecf0f1', outline='#27ae60', width=2)
-        draw.text((down_x + 10, clues_y + 5), str(placement['number']), fill='#2c3e50', font=text_font)
-        draw.text((down_x + 50, clues_y + 5), clue, fill='#2c3e50', font=text_font)
-        clues_y += 65
-
-    # FOOTER
-    footer_y = height - 100
-    draw.rectangle([120, footer_y - 10, width-120, footer_y + 60],
-                   fill='#ecf0f1', outline='#bdc3c7', width=2)
-    footer_text = "ScienceSheetForge - Smart Science Worksheets"
-    bbox = draw.textbbox((0, 0), footer_text, font=small_font)
-    footer_width = bbox[2] - bbox[0]
-    draw.text(((width - footer_width) // 2, footer_y + 5),
-             footer_text, fill='#7f8c8d', font=small_font)
-
-    worksheet.save(output_filename, quality=100, dpi=(300, 300))
-    print(f"Smart crossword saved: {output_filename}")
-
-    # Generate answer key
-    generate_answer_key(grid, grid_size, standard_data, placements, grade_level,
-                       output_filename.replace('.png', '_ANSWER_KEY.png'))
-
-    return worksheet
-
-
-def generate_answer_key(grid, grid_size, standard_data, placements, grade_level, output_filename):
-    """Generate answer key"""
-    width, height = 2550, 3300
-    answer_key = Image.new('RGB', (width, height), 'white')
+    pages = [worksheet]
+    if clues_page is None:
+        clues_y = grid_start_y + grid_height + 100
+    else:
+        draw = ImageDraw.Draw(clues_page)
+        draw_continued_header(draw, width, "CROSSWORD PUZZLE (continued)", WORKSHEET_COLORS)
+        clues_y = CONTINUED_CLUES_Y
+        pages.append(clues_page)
+    draw_clue_section(draw, width, columns, clues_y, header_font, font_size)
+
+    # Answer key reuses the puzzle computed above; all pages are saved together
+    answer_key = render_answer_key(puzzle)
+    answer_key_filename = output_filename.replace('.png', '_ANSWER_KEY.png')
+    save_pages([(page, page_filename(output_filename, number)) for number, page in enumerate(pages, 1)]
+               + [(answer_key, answer_key_filename)])
+    print(f"Smart crossword saved: {output_filename}"
+          + (" (+1 continuation page)" if clues_page is not None else ""))
+    print(f"Answer key saved: {answer_key_filename}")
+
+    return output_filename
+
+
+def generate_crossword_tpt_style(standard_data, grade_level, output_filename="crossword.png", seed=None):
+    """Generate smart TPT-style crossword"""
+    puzzle = build_crossword(standard_data, grade_level, seed)
+    return render_crossword(puzzle, output_filename)
+
+
+def render_answer_key(puzzle):
+    """Render the answer key page"""
+    standard_data = puzzle.standard.as_standard_data()
+    grade_level = puzzle.grade_level
+    grid = puzzle.grid
+    rows, cols = len(grid), len(grid[0])
+    answer_key = new_page()
+    width, height = answer_key.size
     draw = ImageDraw.Draw(answer_key)
 
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 100)
-        header_font = ImageFont.truetype("arial.ttf", 65)
-        subtitle_font = ImageFont.truetype("arial.ttf", 50)
-        grid_font = ImageFont.truetype("arial.ttf", 38)
-        small_font = ImageFont.truetype("arial.ttf", 38)
-    except:
-        title_font = header_font = subtitle_font = grid_font = small_font = ImageFont.load_default()
-
-    draw_decorative_border(draw, width, height)
+    title_font = get_font(100)
+    subtitle_font = get_font(50)
 
     header_height = 280
     colors = ['#27ae60', '#229954', '#1e8449']
@@ -324,37 +318,17 @@ def generate_answer_key(grid, grid_size, standard_data, placements, grade_level,
 
     grid_start_y = info_y + 100
 
-    cell_size = 65
-    grid_width = grid_size * cell_size
+    cell_size = fit_cell_size(rows, cols, width - 2 * GRID_MARGIN,
+                              height - FOOTER_SPACE - grid_start_y)
+    grid_width = cols * cell_size
     grid_start_x = (width - grid_width) // 2
+    grid_font = get_font(cell_size * 38 // 65)
+
+    draw_cell_runs(draw, grid, (grid_start_x, grid_start_y), cell_size,
+                   fill='#d4edda', outline='#27ae60', width=3)
+    blit_letters(answer_key, grid, (grid_start_x, grid_start_y), cell_size, grid_font, '#27ae60')
 
-    for row in range(grid_size):
-        for col in range(grid_size):
-            if grid[row][col] != ' ':
-                x = grid_start_x + col * cell_size
-                y = grid_start_y + row * cell_size
-
-                draw.rectangle([x, y, x + cell_size, y + cell_size],
-                             fill='#d4edda', outline='#27ae60', width=3)
-
-                letter = grid[row][col]
-                bbox = draw.textbbox((0, 0), letter, font=grid_font)
-                letter_width = bbox[2] - bbox[0]
-                letter_height = bbox[3] - bbox[1]
-                draw.text((x + (cell_size - letter_width) // 2, y + (cell_size - letter_height) // 2 - 5),
-                         letter, fill='#27ae60', font=grid_font)
-
-    footer_y = height - 100
-    draw.rectangle([120, footer_y - 10, width-120, footer_y + 60],
-                   fill='#ecf0f1', outline='#bdc3c7', width=2)
-    footer_text = "ScienceSheetForge - Smart Science Worksheets"
-    bbox = draw.textbbox((0, 0), footer_text, font=small_font)
-    footer_width = bbox[2] - bbox[0]
-    draw.text(((width - footer_width) // 2, footer_y + 5),
-             footer_text, fill='#7f8c8d', font=small_font)
-
-    answer_key.save(output_filename, quality=100, dpi=(300, 300))
-    print(f"Answer key saved: {output_filename}")
+    return answer_key
 
 
 if __name__ == "__main__":
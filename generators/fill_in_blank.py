@@ -5,28 +5,32 @@ Uses intelligent content engine for TPT-quality worksheets
 
 import sys
 import os
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from ai_engine.smart_content import get_smart_content
-
-
-def draw_decorative_border(draw, width, height):
-    """Add decorative border - TPT style"""
-    border_color = '#2c3e50'
-    margin = 50
-
-    draw.rectangle([margin, margin, width-margin, height-margin],
-                   outline=border_color, width=8)
-    draw.rectangle([margin+15, margin+15, width-margin-15, height-margin-15],
-                   outline=border_color, width=3)
-
-    corner_size = 25
-    for x, y in [(margin, margin), (width-margin-corner_size, margin),
-                 (margin, height-margin-corner_size), (width-margin-corner_size, height-margin-corner_size)]:
-        draw.rectangle([x, y, x+corner_size, y+corner_size], fill=border_color)
+from ai_engine.generation_context import report_progress
+from ai_engine.smart_content import get_smart_content, make_rng
+from generators.page_renderer import get_font, new_page, save_pages, wrap_text
+from generators.puzzle_model import FillInBlankQuiz, Standard
+
+# Registry metadata; read by generators/registry.py without importing this module
+GENERATOR_INFO = {
+    'id': 'fill-blank',
+    'entry_point': 'generate_fill_in_blank',
+    'grades': ['K-2', '3-5', '6-8'],
+    'cost': 0.7,
+    'backends': ['png'],
+    'priority': 10,
+}
+
+# Numbered items, then a passage with blanks for the next few words
+ITEM_COUNT = 8
+PASSAGE_WORDS = 4
+# Fewer blanks than this make an ordinary item, not a passage
+MIN_PASSAGE_BLANKS = 2
+PASSAGE_LINE_HEIGHT = 55
 
 
 def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
@@ -65,35 +69,48 @@ def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
     return name_y + 80
 
 
-def generate_fill_in_blank(standard_data, grade_level, output_filename="fill_in_blank.png"):
-    """Generate smart TPT-style fill-in-the-blank worksheet"""
+def build_fill_in_blank(standard_data, grade_level, seed=None):
+    """Generate the fill-in-the-blank items without rendering them"""
 
     print(f"Generating fill-in-blank worksheet for {standard_data['code']}...")
 
-    # Get smart content engine
+    # Get smart content engine and this puzzle's private random generator
     content = get_smart_content()
+    rng = make_rng(seed)
 
     # Generate vocabulary
-    print("   Generating vocabulary...")
+    report_progress('vocabulary', "   Generating vocabulary...")
     vocabulary = content.generate_vocabulary_words(
         standard_data['title'],
-        count=12,
+        count=ITEM_COUNT + PASSAGE_WORDS,
         vocabulary_pool=standard_data.get('vocabulary'),
         topics=standard_data.get('topics'),
+        rng=rng,
     )
 
-    # Create sentences with blanks
+    # A passage of real sentences asks for a few words in context: the last
+    # ones any sentence uses. It blanks every vocabulary word it uses, so it
+    # never gives an item away
+    with_sentences = [word for word in vocabulary if word in content.sentence_bank]
+    passage_words = with_sentences[-PASSAGE_WORDS:] if len(vocabulary) > ITEM_COUNT else []
+    passage = content.get_blank_paragraph(passage_words, grade_level, also_blank=tuple(vocabulary))
+    by_lower = {word.lower(): word for word in vocabulary}
+    passage_answers = [by_lower.get(answer, answer) for answer in passage.answers]
+    passage_text = passage.text
+    if len(passage_answers) < MIN_PASSAGE_BLANKS:
+        passage_text, passage_answers = '', []
+
+    # Create sentences with blanks for every other word
     sentences = []
-    answers = []
-
-    for word in vocabulary[:10]:
-        definition = content.get_definition(word, grade_level)
+    item_words = [word for word in vocabulary if word not in passage_answers]
 
-        # Create fill-in-blank sentence from definition
-        sentence = definition.replace(word, "___________")
+    for word in item_words:
+        # A real sentence using the word, in any of its forms
+        sentence = content.get_blank_sentence(word, grade_level)
 
-        # If word isn't in definition, create a sentence
-        if sentence == definition:
+        # If no sentence uses it, ask for the word from its definition
+        if sentence is None:
+            definition = content.get_definition(word, grade_level)
             if grade_level == "K-2":
                 sentence = f"A ___________ is {definition.lower()}"
             elif grade_level == "3-5":
@@ -102,25 +119,33 @@ def generate_fill_in_blank(standard_data, grade_level, output_filename="fill_in_
                 sentence = f"A ___________ can be defined as {definition.lower()}"
 
         sentences.append((sentence, word))
-        answers.append(word)
 
-    print(f"   Generated {len(sentences)} fill-in-blank questions")
+    report_progress('clues', f"   Generated {len(sentences)} fill-in-blank questions"
+                    f" and a passage with {len(passage_answers)} blanks")
+
+    return FillInBlankQuiz(Standard.from_standard_data(standard_data), grade_level, sentences,
+                           passage_text, passage_answers)
+
+
+def render_fill_in_blank(puzzle, output_filename="fill_in_blank.png"):
+    """Render a fill-in-the-blank worksheet and its answer key"""
+    report_progress('render', "   Rendering worksheet and answer key...")
+    standard_data = puzzle.standard.as_standard_data()
+    grade_level = puzzle.grade_level
+    sentences = puzzle.items
+    answers = puzzle.answers
 
     # CREATE WORKSHEET
-    width, height = 2550, 3300
-    worksheet = Image.new('RGB', (width, height), 'white')
+    worksheet = new_page()
+    width, height = worksheet.size
     draw = ImageDraw.Draw(worksheet)
 
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 100)
-        header_font = ImageFont.truetype("arial.ttf", 65)
-        subtitle_font = ImageFont.truetype("arial.ttf", 50)
-        text_font = ImageFont.truetype("arial.ttf", 42)
-        small_font = ImageFont.truetype("arial.ttf", 38)
-    except:
-        title_font = header_font = subtitle_font = text_font = small_font = ImageFont.load_default()
+    title_font = get_font(100)
+    header_font = get_font(65)
+    subtitle_font = get_font(50)
+    text_font = get_font(42)
+    small_font = get_font(38)
 
-    draw_decorative_border(draw, width, height)
     content_start_y = draw_tpt_header(draw, width, standard_data, grade_level,
                                       (title_font, header_font, subtitle_font))
 
@@ -192,42 +217,49 @@ def generate_fill_in_blank(standard_data, grade_level, output_filename="fill_in_
         for j, line in enumerate(lines[:2]):  # Max 2 lines
             draw.text((240, sentence_y + j * 45), line, fill='#2c3e50', font=small_font)
 
-    # FOOTER
-    footer_y = height - 100
-    draw.rectangle([120, footer_y - 10, width-120, footer_y + 60],
-                   fill='#ecf0f1', outline='#bdc3c7', width=2)
-    footer_text = "ScienceSheetForge - Smart Science Worksheets"
-    bbox = draw.textbbox((0, 0), footer_text, font=small_font)
-    footer_width = bbox[2] - bbox[0]
-    draw.text(((width - footer_width) // 2, footer_y + 5),
-             footer_text, fill='#7f8c8d', font=small_font)
-
-    worksheet.save(output_filename, quality=100, dpi=(300, 300))
+    # Passage with several blanks, under the numbered sentences
+    if puzzle.passage:
+        passage_y = sentences_y + len(sentences) * 120 + 60
+        draw.rectangle([120, passage_y - 30, width-120, passage_y - 25], fill='#3498db')
+        draw.text((140, passage_y), "Read the passage and fill in each blank:", fill='#2c3e50', font=text_font)
+
+        lines = wrap_text(draw, puzzle.passage, small_font, width - 440)
+        box_y = passage_y + 70
+        draw.rectangle([150, box_y, width-150, box_y + 40 + len(lines) * PASSAGE_LINE_HEIGHT],
+                       fill='#fff9e6', outline='#f39c12', width=2)
+        for j, line in enumerate(lines):
+            draw.text((190, box_y + 20 + j * PASSAGE_LINE_HEIGHT), line, fill='#2c3e50', font=small_font)
+
+    # Answer key reuses the puzzle computed above; both pages are saved together
+    answer_key = render_answer_key(puzzle)
+    answer_key_filename = output_filename.replace('.png', '_ANSWER_KEY.png')
+    save_pages([(worksheet, output_filename), (answer_key, answer_key_filename)])
     print(f"Fill-in-blank worksheet saved: {output_filename}")
+    print(f"Answer key saved: {answer_key_filename}")
 
-    # Generate answer key
-    generate_answer_key(sentences, standard_data, grade_level,
-                       output_filename.replace('.png', '_ANSWER_KEY.png'))
+    return output_filename
 
-    return worksheet
 
+def generate_fill_in_blank(standard_data, grade_level, output_filename="fill_in_blank.png", seed=None):
+    """Generate smart TPT-style fill-in-the-blank worksheet"""
+    puzzle = build_fill_in_blank(standard_data, grade_level, seed)
+    return render_fill_in_blank(puzzle, output_filename)
 
-def generate_answer_key(sentences, standard_data, grade_level, output_filename):
-    """Generate answer key"""
-    width, height = 2550, 3300
-    answer_key = Image.new('RGB', (width, height), 'white')
-    draw = ImageDraw.Draw(answer_key)
 
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 100)
-        header_font = ImageFont.truetype("arial.ttf", 65)
-        subtitle_font = ImageFont.truetype("arial.ttf", 50)
-        text_font = ImageFont.truetype("arial.ttf", 42)
-        small_font = ImageFont.truetype("arial.ttf", 38)
-    except:
-        title_font = header_font = subtitle_font = text_font = small_font = ImageFont.load_default()
+def render_answer_key(puzzle):
+    """Render the answer key page"""
+    standard_data = puzzle.standard.as_standard_data()
+    grade_level = puzzle.grade_level
+    sentences = puzzle.items
 
-    draw_decorative_border(draw, width, height)
+    answer_key = new_page()
+    width, height = answer_key.size
+    draw = ImageDraw.Draw(answer_key)
+
+    title_font = get_font(100)
+    header_font = get_font(65)
+    subtitle_font = get_font(50)
+    text_font = get_font(42)
 
     # Header
     header_height = 280
@@ -281,18 +313,15 @@ def generate_answer_key(sentences, standard_data, grade_level, output_filename):
                     fill='#27ae60', outline='#229954', width=2)
         draw.text((width - 288, answer_y + 7), "V", fill='white', font=text_font)
 
-    # FOOTER
-    footer_y = height - 100
-    draw.rectangle([120, footer_y - 10, width-120, footer_y + 60],
-                   fill='#ecf0f1', outline='#bdc3c7', width=2)
-    footer_text = "ScienceSheetForge - Smart Science Worksheets"
-    bbox = draw.textbbox((0, 0), footer_text, font=small_font)
-    footer_width = bbox[2] - bbox[0]
-    draw.text(((width - footer_width) // 2, footer_y + 5),
-             footer_text, fill='#7f8c8d', font=small_font)
-
-    answer_key.save(output_filename, quality=100, dpi=(300, 300))
-    print(f"Answer key saved: {output_filename}")
+    # Passage answers in the order of its blanks
+    if puzzle.passage_answers:
+        passage_y = list_y + len(sentences) * 80 + 60
+        draw.text((200, passage_y), "Passage, in order:", fill='#2c3e50', font=text_font)
+        answers = ', '.join(answer.upper() for answer in puzzle.passage_answers)
+        for j, line in enumerate(wrap_text(draw, answers, text_font, width - 400)):
+            draw.text((200, passage_y + 70 + j * PASSAGE_LINE_HEIGHT), line, fill='#27ae60', font=text_font)
+
+    return answer_key
 
 
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+"""
+Grid Renderer
+Fast letter-grid drawing for word search and crossword puzzles
+
+Letters are rasterized once per font/cell size into a glyph atlas and
+blitted with Image.paste, and grid lines are drawn as a handful of bulk
+rectangles instead of one outlined rectangle per cell.
+
+Answer keys highlight words with translucent capsules drawn over a copy of
+the worksheet's finished grid, so the letters are not drawn twice.
+"""
+
+import string
+import threading
+from PIL import Image, ImageChops, ImageColor, ImageDraw
+
+
+ATLAS_LETTERS = string.ascii_uppercase
+
+_atlas_cache = {}
+_atlas_lock = threading.Lock()
+
+
+def _font_key(font):
+    """Build a hashable identity for a Pillow font object"""
+    path = getattr(font, 'path', None)
+    if not isinstance(path, str):
+        # load_default() returns a fresh object each call, so key by type
+        path = type(font).__name__
+    return path, getattr(font, 'size', None)
+
+
+class GlyphAtlas:
+    """Pre-rasterized uppercase glyph masks for one font and cell size"""
+
+    def __init__(self, font, cell_size, y_offset=-5):
+        self.cell_size = cell_size
+        self.image = Image.new('L', (cell_size * len(ATLAS_LETTERS), cell_size), 0)
+        draw = ImageDraw.Draw(self.image)
+        self.masks = {}
+
+        for index, letter in enumerate(ATLAS_LETTERS):
+            x = index * cell_size
+            bbox = draw.textbbox((0, 0), letter, font=font)
+            letter_width = bbox[2] - bbox[0]
+            letter_height = bbox[3] - bbox[1]
+            draw.text((x + (cell_size - letter_width) // 2, (cell_size - letter_height) // 2 + y_offset),
+                     letter, fill=255, font=font)
+
+        for index, letter in enumerate(ATLAS_LETTERS):
+            x = index * cell_size
+            self.masks[letter] = self.image.crop((x, 0, x + cell_size, cell_size))
+        self._bilevel_masks = None
+
+    def mask(self, letter, bilevel=False):
+        """Return the glyph mask for a letter, or None if it is not in the atlas
+
+        Bilevel masks have no antialiased edges; palette pages need them
+        because pasting through a partial mask would blend palette indices.
+        """
+        if not bilevel:
+            return self.masks.get(letter)
+        if self._bilevel_masks is None:
+            self._bilevel_masks = {
+                key: mask.point(lambda value: 255 if value >= 128 else 0, '1')
+                for key, mask in self.masks.items()
+            }
+        return self._bilevel_masks.get(letter)
+
+
+def get_glyph_atlas(font, cell_size):
+    """Get or create the cached glyph atlas for a font and cell size"""
+    key = _font_key(font) + (cell_size,)
+    atlas = _atlas_cache.get(key)
+    if atlas is None:
+        with _atlas_lock:
+            atlas = _atlas_cache.get(key)
+            if atlas is None:
+                atlas = GlyphAtlas(font, cell_size)
+                _atlas_cache[key] = atlas
+    return atlas
+
+
+def draw_grid_lines(draw, origin, rows, cols, cell_size, color, width=2):
+    """Draw a full rows x cols grid with one rectangle per grid line"""
+    start_x, start_y = origin
+    end_x = start_x + cols * cell_size
+    end_y = start_y + rows * cell_size
+    half = width // 2
+
+    for row in range(rows + 1):
+        y = start_y + row * cell_size
+        draw.rectangle([start_x - half, y - half, end_x + half, y + half], fill=color)
+    for col in range(cols + 1):
+        x = start_x + col * cell_size
+        draw.rectangle([x - half, start_y - half, x + half, end_y + half], fill=color)
+
+
+def _runs(cells):
+    """Yield (start, length) runs of consecutive truthy values"""
+    start = None
+    for index, filled in enumerate(cells):
+        if filled and start is None:
+            start = index
+        elif not filled and start is not None:
+            yield start, index - start
+            start = None
+    if start is not None:
+        yield start, len(cells) - start
+
+
+def draw_cell_runs(draw, grid, origin, cell_size, fill, outline, width=3):
+    """Draw the non-blank cells of a sparse grid, one block per horizontal run"""
+    start_x, start_y = origin
+    half = width // 2
+
+    # Each horizontal run of cells is filled and framed as a single block;
+    # only the separators inside a run need extra rectangles
+    for row_idx, row in enumerate(grid):
+        y = start_y + row_idx * cell_size
+        for col, length in _runs([cell != ' ' for cell in row]):
+            x = start_x + col * cell_size
+            draw.rectangle([x, y, x + length * cell_size, y + cell_size],
+                          fill=fill, outline=outline, width=width)
+            for offset in range(1, length):
+                sep_x = x + offset * cell_size
+                draw.rectangle([sep_x - half, y, sep_x + half, y + cell_size], fill=outline)
+
+
+def blit_letters(image, grid, origin, cell_size, font, color):
+    """Paste every letter of the grid from the glyph atlas"""
+    atlas = get_glyph_atlas(font, cell_size)
+    start_x, start_y = origin
+    draw = None
+    ink = color
+    bilevel = image.mode == 'P'
+    if bilevel:
+        # Palette pages paste a palette index, allocated like ImageDraw does
+        ink = image.palette.getcolor(ImageColor.getrgb(color), image)
+
+    for row_idx, row in enumerate(grid):
+        y = start_y + row_idx * cell_size
+        for col_idx, letter in enumerate(row):
+            if letter == ' ':
+                continue
+            x = start_x + col_idx * cell_size
+            mask = atlas.mask(letter, bilevel)
+            if mask is not None:
+                image.paste(ink, (x, y), mask)
+                continue
+
+            # Characters outside A-Z are rare; draw them directly
+            if draw is None:
+                draw = ImageDraw.Draw(image)
+            bbox = draw.textbbox((0, 0), letter, font=font)
+            draw.text((x + (cell_size - (bbox[2] - bbox[0])) // 2,
+                      y + (cell_size - (bbox[3] - bbox[1])) // 2 - 5),
+                     letter, fill=color, font=font)
+
+
+def draw_capsules(image, segments, origin, cell_size, colors, opacity=0.35):
+    """Highlight ((row, col), (end_row, end_col)) cell segments with translucent capsules
+
+    Each segment gets the next colour in turn. RGB and grayscale images
+    are blended through the capsule mask; palette images cannot blend
+    indices, so only their white background is tinted, which looks the
+    same because letters and lines stay on top. Masks cover only the
+    cells the segments span, one colour at a time.
+    """
+    if not segments:
+        return
+    start_x, start_y = origin
+    radius = cell_size * 2 // 5
+    cells = [cell for segment in segments for cell in segment]
+    left = max(0, start_x + min(col for _, col in cells) * cell_size)
+    top = max(0, start_y + min(row for row, _ in cells) * cell_size)
+    right = min(image.width, start_x + (max(col for _, col in cells) + 1) * cell_size)
+    bottom = min(image.height, start_y + (max(row for row, _ in cells) + 1) * cell_size)
+    if right <= left or bottom <= top:
+        return
+    size = (right - left, bottom - top)
+
+    by_color = {}
+    for index, segment in enumerate(segments):
+        by_color.setdefault(colors[index % len(colors)], []).append(segment)
+
+    if image.mode == 'P':
+        # Background cells are pure white; tint only those
+        background = image.crop((left, top, right, bottom)).convert('L').point(
+            lambda value: 255 if value == 255 else 0)
+    for color, color_segments in by_color.items():
+        mask = Image.new('L', size, 0)
+        draw = ImageDraw.Draw(mask)
+        for (row, col), (end_row, end_col) in color_segments:
+            centers = [(start_x - left + c * cell_size + cell_size // 2,
+                        start_y - top + r * cell_size + cell_size // 2)
+                       for r, c in ((row, col), (end_row, end_col))]
+            draw.line(centers, fill=255, width=radius * 2)
+            for x, y in centers:
+                draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=255)
+
+        if image.mode == 'P':
+            tint = tuple(round(255 + (channel - 255) * opacity) for channel in ImageColor.getrgb(color))
+            ink = image.palette.getcolor(tint, image)
+            image.paste(ink, (left, top, right, bottom), ImageChops.multiply(mask, background).point(
+                lambda value: 255 if value >= 128 else 0, '1'))
+        else:
+            ink = ImageColor.getcolor(color, image.mode)
+            image.paste(ink, (left, top, right, bottom), mask.point(lambda value: round(value * opacity)))
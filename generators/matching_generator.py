@@ -6,6 +6,16 @@ Beautiful, sellable worksheets with decorative elements
 import random
 from PIL import Image, ImageDraw, ImageFont
 
+# Registry metadata; read by generators/registry.py without importing this module
+GENERATOR_INFO = {
+    'id': 'matching',
+    'entry_point': 'generate_matching',
+    'grades': ['K-2', '3-5', '6-8'],
+    'cost': 0.7,
+    'backends': ['png'],
+    'priority': 0,
+}
+
 
 def draw_decorative_border(draw, width, height):
     """Add decorative border - TPT style"""
@@ -71,8 +81,9 @@ def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
     return name_y + 80
 
 
-def generate_matching(standard_data, grade_level, output_filename="matching_tpt.png"):
+def generate_matching(standard_data, grade_level, output_filename="matching_tpt.png", seed=None):
     """Generate BEAUTIFUL TPT-style matching activity"""
+    rng = seed if isinstance(seed, random.Random) else random.Random(seed)
 
     vocabulary = standard_data['vocabulary'][:10]
 
@@ -105,11 +116,11 @@ def generate_matching(standard_data, grade_level, output_filename="matching_tpt.
     if len(available_words) < 8:
         available_words = list(definitions.keys())[:10]
 
-    selected = random.sample(available_words, min(10, len(available_words)))
+    selected = rng.sample(available_words, min(10, len(available_words)))
 
     # Shuffle definitions
     shuffled_defs = [(w, definitions[w.lower()]) for w in selected]
-    random.shuffle(shuffled_defs)
+    rng.shuffle(shuffled_defs)
 
     # CREATE BEAUTIFUL WORKSHEET
     width, height = 2550, 3300  # 8.5x11 at 300 DPI
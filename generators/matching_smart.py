@@ -3,31 +3,33 @@ Smart Matching Activity Generator
 Uses intelligent content engine for TPT-quality worksheets
 """
 
-import random
 import sys
 import os
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from ai_engine.smart_content import get_smart_content
+from ai_engine.generation_context import report_progress
+from ai_engine.smart_content import get_smart_content, make_rng
+from generators.page_renderer import get_font, new_page, save_pages, wrap_text
+from generators.puzzle_model import MatchingPuzzle, Standard
 
+# Registry metadata; read by generators/registry.py without importing this module
+GENERATOR_INFO = {
+    'id': 'matching',
+    'entry_point': 'generate_matching',
+    'grades': ['K-2', '3-5', '6-8'],
+    'cost': 0.7,
+    'backends': ['png'],
+    'priority': 10,
+}
 
-def draw_decorative_border(draw, width, height):
-    """Add decorative border - TPT style"""
-    border_color = '#2c3e50'
-    margin = 50
-
-    draw.rectangle([margin, margin, width-margin, height-margin],
-                   outline=border_color, width=8)
-    draw.rectangle([margin+15, margin+15, width-margin-15, height-margin-15],
-                   outline=border_color, width=3)
-
-    corner_size = 25
-    for x, y in [(margin, margin), (width-margin-corner_size, margin),
-                 (margin, height-margin-corner_size), (width-margin-corner_size, height-margin-corner_size)]:
-        draw.rectangle([x, y, x+corner_size, y+corner_size], fill=border_color)
+# Extra definitions that match no term, so the last match is not a giveaway
+DECOY_COUNT = 2
+# Definition text size and the room a definition box leaves for it
+DEFINITION_FONT_SIZE = 38
+DEFINITION_WIDTH = 895
 
 
 def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
@@ -67,53 +69,75 @@ def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
     return name_y + 80
 
 
-def generate_matching(standard_data, grade_level, output_filename="matching.png"):
-    """Generate smart TPT-style matching activity"""
+def build_matching(standard_data, grade_level, seed=None):
+    """Generate the matching activity without rendering it"""
 
     print(f"Generating smart matching activity for {standard_data['code']}...")
 
-    # Get smart content engine
+    # Get smart content engine and this puzzle's private random generator
     content = get_smart_content()
+    rng = make_rng(seed)
 
     # Generate vocabulary
-    print("   Generating vocabulary...")
+    report_progress('vocabulary', "   Generating vocabulary...")
     vocabulary = content.generate_vocabulary_words(
         standard_data['title'],
         count=12,
         vocabulary_pool=standard_data.get('vocabulary'),
         topics=standard_data.get('topics'),
+        rng=rng,
     )
 
     # Select 10 words for matching
     selected = vocabulary[:10]
 
-    print(f"   Generated {len(selected)} matching pairs")
+    report_progress('clues', f"   Generated {len(selected)} matching pairs")
 
     # Generate definitions using smart content
     term_def_pairs = []
     for word in selected:
-        definition = content.get_definition(word, grade_level)
+        definition = content.get_definition(word, grade_level, max_width=DEFINITION_WIDTH,
+                                            font_size=DEFINITION_FONT_SIZE)
         term_def_pairs.append((word, definition))
 
+    # Decoys: definitions of other words that could pass for one of the terms
+    decoy_words = []
+    for word in selected:
+        for other in content.get_distractors(word, grade_level):
+            if other not in selected and other not in decoy_words:
+                decoy_words.append(other)
+    decoy_words = rng.sample(decoy_words, min(DECOY_COUNT, len(decoy_words)))
+    decoys = [(word, content.get_definition(word, grade_level, max_width=DEFINITION_WIDTH,
+                                            font_size=DEFINITION_FONT_SIZE))
+              for word in decoy_words]
+
     # Shuffle definitions for the matching activity
-    shuffled_defs = term_def_pairs.copy()
-    random.shuffle(shuffled_defs)
+    order = list(range(len(term_def_pairs) + len(decoys)))
+    rng.shuffle(order)
+
+    return MatchingPuzzle(Standard.from_standard_data(standard_data), grade_level,
+                          term_def_pairs, decoys, order)
+
+
+def render_matching(puzzle, output_filename="matching.png"):
+    """Render a matching activity and its answer key"""
+    report_progress('render', "   Rendering worksheet and answer key...")
+    standard_data = puzzle.standard.as_standard_data()
+    grade_level = puzzle.grade_level
+    term_def_pairs = puzzle.pairs
+    shuffled_defs = puzzle.shuffled_pairs
 
     # CREATE BEAUTIFUL WORKSHEET
-    width, height = 2550, 3300  # 8.5x11 at 300 DPI
-    worksheet = Image.new('RGB', (width, height), 'white')
+    worksheet = new_page()
+    width, height = worksheet.size
     draw = ImageDraw.Draw(worksheet)
 
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 100)
-        header_font = ImageFont.truetype("arial.ttf", 65)
-        subtitle_font = ImageFont.truetype("arial.ttf", 50)
-        text_font = ImageFont.truetype("arial.ttf", 42)
-        small_font = ImageFont.truetype("arial.ttf", 38)
-    except:
-        title_font = header_font = subtitle_font = text_font = small_font = ImageFont.load_default()
+    title_font = get_font(100)
+    header_font = get_font(65)
+    subtitle_font = get_font(50)
+    text_font = get_font(42)
+    small_font = get_font(DEFINITION_FONT_SIZE)
 
-    draw_decorative_border(draw, width, height)
     content_start_y = draw_tpt_header(draw, width, standard_data, grade_level,
                                       (title_font, header_font, subtitle_font))
 
@@ -121,9 +145,13 @@ def generate_matching(standard_data, grade_level, output_filename="matching.png"
     instructions_y = content_start_y
     draw.rectangle([120, instructions_y, width-120, instructions_y + 80],
                    fill='#fff3cd', outline='#ffc107', width=3)
-    draw.text((140, instructions_y + 15),
-             "Directions: Draw a line from each term to its matching definition.",
-             fill='#2c3e50', font=text_font)
+    directions = "Directions: Draw a line from each term to its matching definition."
+    if puzzle.decoys:
+        # Shorter wording so the note fits in the box
+        unused = len(puzzle.decoys)
+        directions = (f"Directions: Match each term to its definition. "
+                      f"{unused} definition{' is' if unused == 1 else 's are'} not used.")
+    draw.text((140, instructions_y + 15), directions, fill='#2c3e50', font=text_font)
 
     y_start = instructions_y + 120
     draw.rectangle([120, y_start - 30, width-120, y_start - 25], fill='#f39c12')
@@ -165,8 +193,8 @@ def generate_matching(standard_data, grade_level, output_filename="matching.png"
                       fill='white', outline='#e74c3c', width=2)
         draw.text((780, term_y + 7), "____", fill='#bdc3c7', font=text_font)
 
-        # Definition (shuffled)
-        def_word, definition = shuffled_defs[i]
+    # Definitions (shuffled, decoys included)
+    for i, (def_word, definition) in enumerate(shuffled_defs):
         def_y = y_pos + i * 95
 
         # Definition box
@@ -178,48 +206,43 @@ def generate_matching(standard_data, grade_level, output_filename="matching.png"
         draw.ellipse([width//2 + 135, def_y, width//2 + 175, def_y + 40], fill='#3498db')
         draw.text((width//2 + 147, def_y + 5), letter, fill='white', font=text_font)
 
-        # Definition text (wrap if too long)
-        if len(definition) > 50:
-            definition = definition[:50] + "..."
+        # Definitions were chosen to fit; shorten by whole words only if none did
+        if draw.textlength(definition, font=small_font) > DEFINITION_WIDTH:
+            ellipsis_width = draw.textlength("...", font=small_font)
+            definition = wrap_text(draw, definition, small_font, DEFINITION_WIDTH - ellipsis_width)[0] + "..."
         draw.text((width//2 + 195, def_y + 5), definition, fill='#2c3e50', font=small_font)
 
-    # FOOTER
-    footer_y = height - 100
-    draw.rectangle([120, footer_y - 10, width-120, footer_y + 60],
-                   fill='#ecf0f1', outline='#bdc3c7', width=2)
-    footer_text = "ScienceSheetForge - Smart Science Worksheets"
-    bbox = draw.textbbox((0, 0), footer_text, font=small_font)
-    footer_width = bbox[2] - bbox[0]
-    draw.text(((width - footer_width) // 2, footer_y + 5),
-             footer_text, fill='#7f8c8d', font=small_font)
-
-    worksheet.save(output_filename, quality=100, dpi=(300, 300))
+    # Answer key reuses the puzzle computed above; both pages are saved together
+    answer_key = render_matching_answer_key(puzzle)
+    answer_key_filename = output_filename.replace('.png', '_ANSWER_KEY.png')
+    save_pages([(worksheet, output_filename), (answer_key, answer_key_filename)])
     print(f"Smart matching activity saved: {output_filename}")
+    print(f"Answer key saved: {answer_key_filename}")
 
-    # Generate answer key
-    generate_matching_answer_key(term_def_pairs, shuffled_defs, standard_data, grade_level,
-                                 output_filename.replace('.png', '_ANSWER_KEY.png'))
+    return output_filename
 
-    return worksheet
 
+def generate_matching(standard_data, grade_level, output_filename="matching.png", seed=None):
+    """Generate smart TPT-style matching activity"""
+    puzzle = build_matching(standard_data, grade_level, seed)
+    return render_matching(puzzle, output_filename)
 
-def generate_matching_answer_key(term_def_pairs, shuffled_defs, standard_data, grade_level, output_filename):
-    """Generate beautiful TPT-style answer key for matching"""
 
-    width, height = 2550, 3300
-    answer_key = Image.new('RGB', (width, height), 'white')
-    draw = ImageDraw.Draw(answer_key)
+def render_matching_answer_key(puzzle):
+    """Render beautiful TPT-style answer key page for matching"""
+    standard_data = puzzle.standard.as_standard_data()
+    grade_level = puzzle.grade_level
+    term_def_pairs = puzzle.pairs
+    shuffled_defs = puzzle.shuffled_pairs
 
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 100)
-        header_font = ImageFont.truetype("arial.ttf", 65)
-        subtitle_font = ImageFont.truetype("arial.ttf", 50)
-        text_font = ImageFont.truetype("arial.ttf", 45)
-        small_font = ImageFont.truetype("arial.ttf", 38)
-    except:
-        title_font = header_font = subtitle_font = text_font = small_font = ImageFont.load_default()
+    answer_key = new_page()
+    width, height = answer_key.size
+    draw = ImageDraw.Draw(answer_key)
 
-    draw_decorative_border(draw, width, height)
+    title_font = get_font(100)
+    header_font = get_font(65)
+    subtitle_font = get_font(50)
+    text_font = get_font(45)
 
     # Header
     header_height = 280
@@ -285,18 +308,7 @@ def generate_matching_answer_key(term_def_pairs, shuffled_defs, standard_data, g
 
                 break
 
-    # FOOTER
-    footer_y = height - 100
-    draw.rectangle([120, footer_y - 10, width-120, footer_y + 60],
-                   fill='#ecf0f1', outline='#bdc3c7', width=2)
-    footer_text = "ScienceSheetForge - Smart Science Worksheets"
-    bbox = draw.textbbox((0, 0), footer_text, font=small_font)
-    footer_width = bbox[2] - bbox[0]
-    draw.text(((width - footer_width) // 2, footer_y + 5),
-             footer_text, fill='#7f8c8d', font=small_font)
-
-    answer_key.save(output_filename, quality=100, dpi=(300, 300))
-    print(f"Answer key saved: {output_filename}")
+    return answer_key
 
 
 if __name__ == "__main__":
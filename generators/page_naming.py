@@ -0,0 +1,14 @@
+"""
+Page Naming
+File names for the pages of a multi-page worksheet
+
+Kept apart from page_renderer so the web app can find a worksheet's pages
+without importing Pillow.
+"""
+
+
+def page_filename(output_filename, number):
+    """File for page `number` of a multi-page worksheet; page 1 keeps the name"""
+    if number == 1:
+        return output_filename
+    return output_filename.replace('.png', f'_page{number}.png')
@@ -0,0 +1,223 @@
+"""
+Page Renderer
+Shared page chrome, font cache and page saving for all worksheet formats
+
+Every worksheet and answer key page starts from the same base layer
+(decorative border and footer). The base is drawn once per process and
+copied for each page, fonts are loaded once per size, and a worksheet and
+its answer key are PNG-encoded concurrently. The encoder pool is shared by
+every request in the process; when all its threads are busy, the calling
+thread encodes its own pages rather than queueing behind other requests.
+
+Pages are drawn on an RGB canvas by default. Pillow pads RGB to four bytes
+per pixel, so one page is ~34 MB; CANVAS_MODE=P draws on a palette canvas
+and CANVAS_MODE=L on a grayscale one, both one byte per pixel. The
+worksheets use a few dozen flat colours, which fit a palette; only text
+antialiasing is lost in 'P', and at 300 DPI that does not show in print.
+Each canvas is freed as soon as it is encoded and counted in the
+generation context, which reports the peak.
+"""
+
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageDraw
+
+from ai_engine.fonts import get_font
+from ai_engine.generation_context import current_context, report_progress
+
+
+PAGE_WIDTH, PAGE_HEIGHT = 2550, 3300  # 8.5x11 at 300 DPI
+CANVAS_MODES = ('RGB', 'P', 'L')
+CANVAS_MODE = os.environ.get('CANVAS_MODE', 'RGB').upper()
+# Bytes Pillow allocates per pixel; RGB is stored padded to 32 bits
+PIXEL_BYTES = {'1': 1, 'L': 1, 'P': 1, 'RGB': 4, 'RGBA': 4}
+FOOTER_TEXT = "ScienceSheetForge - Smart Science Worksheets"
+# Font sizes the worksheet generators draw with
+PRELOAD_FONT_SIZES = (28, 36, 38, 40, 42, 45, 50, 65, 100)
+
+_base_pages = {}
+_base_lock = threading.Lock()
+# PAGE_SAVE_THREADS overrides the encoder pool size, one thread per core by default
+SAVE_THREADS = int(os.environ.get('PAGE_SAVE_THREADS', 0)) or (os.cpu_count() or 1)
+_save_executor = ThreadPoolExecutor(max_workers=SAVE_THREADS, thread_name_prefix='page-save')
+_save_slots = threading.BoundedSemaphore(SAVE_THREADS)
+
+
+def draw_decorative_border(draw, width, height):
+    """Add decorative border - TPT style"""
+    border_color = '#2c3e50'
+    margin = 50
+
+    draw.rectangle([margin, margin, width-margin, height-margin],
+                   outline=border_color, width=8)
+    draw.rectangle([margin+15, margin+15, width-margin-15, height-margin-15],
+                   outline=border_color, width=3)
+
+    corner_size = 25
+    for x, y in [(margin, margin), (width-margin-corner_size, margin),
+                 (margin, height-margin-corner_size), (width-margin-corner_size, height-margin-corner_size)]:
+        draw.rectangle([x, y, x+corner_size, y+corner_size], fill=border_color)
+
+
+def draw_footer(draw, width, height):
+    """Draw the ScienceSheetForge footer bar"""
+    small_font = get_font(38)
+
+    footer_y = height - 100
+    draw.rectangle([120, footer_y - 10, width-120, footer_y + 60],
+                   fill='#ecf0f1', outline='#bdc3c7', width=2)
+    bbox = draw.textbbox((0, 0), FOOTER_TEXT, font=small_font)
+    footer_width = bbox[2] - bbox[0]
+    draw.text(((width - footer_width) // 2, footer_y + 5),
+             FOOTER_TEXT, fill='#7f8c8d', font=small_font)
+
+
+def draw_continued_header(draw, width, title, colors):
+    """Slim header for continuation pages; returns the y where content starts"""
+    for i, color in enumerate(colors):
+        y_start = 80 + i * 30
+        draw.rectangle([80, y_start, width-80, y_start + 30], fill=color)
+    title_font = get_font(65)
+    bbox = draw.textbbox((0, 0), title, font=title_font)
+    draw.text(((width - (bbox[2] - bbox[0])) // 2, 110), title, fill='white', font=title_font)
+    return 280
+
+
+def wrap_text(draw, text, font, max_width):
+    """Split text into lines no wider than max_width; a single long word stays whole"""
+    lines = []
+    current = ''
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if current and draw.textlength(candidate, font=font) > max_width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+    return lines or ['']
+
+
+def canvas_mode(mode=None):
+    """Validate a canvas mode, defaulting to CANVAS_MODE"""
+    mode = (mode or CANVAS_MODE).upper()
+    if mode not in CANVAS_MODES:
+        raise ValueError(f"Unknown canvas mode {mode!r}; expected one of {', '.join(CANVAS_MODES)}")
+    return mode
+
+
+def canvas_bytes(image):
+    """Pixel memory held by an image"""
+    return image.width * image.height * PIXEL_BYTES.get(image.mode, 4)
+
+
+def _page_base(width, height, mode='RGB'):
+    """Get the cached border + footer layer for a page size and canvas mode"""
+    key = (width, height, mode)
+    base = _base_pages.get(key)
+    if base is None:
+        with _base_lock:
+            base = _base_pages.get(key)
+            if base is None:
+                base = Image.new(mode, (width, height), 'white')
+                draw = ImageDraw.Draw(base)
+                draw_decorative_border(draw, width, height)
+                draw_footer(draw, width, height)
+                _base_pages[key] = base
+    return base
+
+
+def preload(font_sizes=PRELOAD_FONT_SIZES):
+    """Load fonts and draw the page base now, e.g. in a server before it forks workers"""
+    for size in font_sizes:
+        get_font(size)
+    _page_base(PAGE_WIDTH, PAGE_HEIGHT, canvas_mode())
+
+
+def new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT, mode=None):
+    """Create a page pre-filled with the shared border and footer
+
+    The canvas counts toward the current generation's memory until
+    release_page() is called or the image is garbage collected.
+    """
+    return _tracked(_page_base(width, height, canvas_mode(mode)).copy())
+
+
+def _tracked(image):
+    context = current_context()
+    nbytes = canvas_bytes(image)
+    context.track_canvas(nbytes)
+    image._canvas_release = weakref.finalize(image, context.release_canvas, nbytes)
+    return image
+
+
+def copy_layer(page, box):
+    """Copy a drawn region of a page so another page can reuse it without redrawing
+
+    The copy counts toward canvas memory like a page; release it with
+    release_page() once it has been pasted.
+    """
+    return _tracked(page.crop(box))
+
+
+def paste_layer(page, layer, origin):
+    """Paste a layer copied from another page
+
+    Palette pages each allocate colours in the order they are drawn, so a
+    layer's palette indices are first mapped to this page's indices.
+    """
+    if layer.mode == 'P':
+        lookup = list(range(256))
+        for rgb, index in layer.palette.colors.items():
+            lookup[index] = page.palette.getcolor(rgb[:3], page)
+        layer = layer.point(lookup)
+    page.paste(layer, origin)
+
+
+def release_page(image):
+    """Free a page's pixel memory now instead of whenever its last reference goes"""
+    release = getattr(image, '_canvas_release', None)
+    if release is not None:
+        release()
+    image.close()
+
+
+def _save_and_release(image, filename):
+    try:
+        image.save(filename, quality=100, dpi=(300, 300))
+    finally:
+        release_page(image)
+
+
+def _save_in_slot(image, filename):
+    try:
+        _save_and_release(image, filename)
+    finally:
+        _save_slots.release()
+
+
+def save_pages(pages):
+    """Save (image, filename) pairs concurrently and wait for all of them
+
+    The first page is encoded on the calling thread, which would otherwise
+    only wait; the rest go to free encoder threads, and any left over when
+    none are free are encoded here too. Each page is released as soon as
+    it is written, so the images cannot be used afterwards.
+    """
+    report_progress('encode', f"   Encoding {len(pages)} pages...")
+    futures = []
+    inline = list(pages[:1])
+    for image, filename in pages[1:]:
+        if _save_slots.acquire(blocking=False):
+            futures.append(_save_executor.submit(_save_in_slot, image, filename))
+        else:
+            inline.append((image, filename))
+    try:
+        for image, filename in inline:
+            _save_and_release(image, filename)
+    finally:
+        for future in futures:
+            future.result()
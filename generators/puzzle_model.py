@@ -0,0 +1,206 @@
+"""
+Puzzle Model
+Typed, compact puzzle objects shared by generation and rendering
+
+Each format has a pure build step that produces one of these objects and
+a renderer that draws it. Puzzles serialize to JSON so they can be cached,
+re-rendered or generated in bulk without paying rendering costs.
+"""
+
+import json
+from dataclasses import dataclass, fields
+from typing import Dict, List, Tuple
+
+
+def _encode(value):
+    """Convert model values to JSON-compatible structures"""
+    if isinstance(value, PuzzleModel):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    return value
+
+
+class PuzzleModel:
+    """JSON (de)serialization shared by all puzzle models"""
+
+    __slots__ = ()
+
+    kind = None
+    nested = {}
+
+    def to_dict(self) -> Dict:
+        data = {}
+        for field in fields(self):
+            data[field.name] = _encode(getattr(self, field.name))
+        if self.kind:
+            data['kind'] = self.kind
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict):
+        values = {}
+        for field in fields(cls):
+            value = data[field.name]
+            model = cls.nested.get(field.name)
+            if model is not None:
+                if isinstance(value, list):
+                    value = [model.from_dict(item) for item in value]
+                else:
+                    value = model.from_dict(value)
+            elif isinstance(value, list):
+                value = [tuple(item) if isinstance(item, list) else item for item in value]
+            values[field.name] = value
+        return cls(**values)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text: str):
+        return cls.from_dict(json.loads(text))
+
+
+@dataclass
+class Standard(PuzzleModel):
+    """The NGSS standard fields a worksheet header needs"""
+    __slots__ = ('code', 'title')
+    code: str
+    title: str
+
+    @classmethod
+    def from_standard_data(cls, standard_data: Dict) -> 'Standard':
+        return cls(standard_data['code'], standard_data['title'])
+
+    def as_standard_data(self) -> Dict[str, str]:
+        return {'code': self.code, 'title': self.title}
+
+
+@dataclass
+class WordPlacement(PuzzleModel):
+    """A word at a grid position; direction is H/V/D for word search, across/down for crosswords"""
+    __slots__ = ('word', 'row', 'col', 'direction')
+    word: str
+    row: int
+    col: int
+    direction: str
+
+
+@dataclass
+class CrosswordEntry(PuzzleModel):
+    """A numbered crossword answer with its clue"""
+    __slots__ = ('word', 'row', 'col', 'direction', 'number', 'clue')
+    word: str
+    row: int
+    col: int
+    direction: str
+    number: int
+    clue: str
+
+
+@dataclass
+class WordSearchPuzzle(PuzzleModel):
+    """A filled letter grid with the placed words and fun facts"""
+    __slots__ = ('standard', 'grade_level', 'grid', 'placements', 'fun_facts')
+    kind = 'word-search'
+    nested = {'standard': Standard, 'placements': WordPlacement}
+    standard: Standard
+    grade_level: str
+    grid: List[str]
+    placements: List[WordPlacement]
+    fun_facts: List[Tuple[str, str]]
+
+    @property
+    def words(self) -> List[str]:
+        return [placement.word for placement in self.placements]
+
+
+@dataclass
+class CrosswordPuzzle(PuzzleModel):
+    """A crossword solution grid with its numbered entries"""
+    __slots__ = ('standard', 'grade_level', 'grid', 'entries')
+    kind = 'crossword'
+    nested = {'standard': Standard, 'entries': CrosswordEntry}
+    standard: Standard
+    grade_level: str
+    grid: List[str]
+    entries: List[CrosswordEntry]
+
+
+@dataclass
+class MatchingPuzzle(PuzzleModel):
+    """Terms with definitions plus decoy definitions that match no term
+
+    order[i] indexes pairs + decoys: the entry shown as definition letter i.
+    """
+    __slots__ = ('standard', 'grade_level', 'pairs', 'decoys', 'order')
+    kind = 'matching'
+    nested = {'standard': Standard}
+    standard: Standard
+    grade_level: str
+    pairs: List[Tuple[str, str]]
+    decoys: List[Tuple[str, str]]
+    order: List[int]
+
+    @property
+    def shuffled_pairs(self) -> List[Tuple[str, str]]:
+        options = self.pairs + self.decoys
+        return [options[index] for index in self.order]
+
+
+@dataclass
+class TrueFalseQuiz(PuzzleModel):
+    """Statements paired with whether they are true"""
+    __slots__ = ('standard', 'grade_level', 'statements')
+    kind = 'true-false'
+    nested = {'standard': Standard}
+    standard: Standard
+    grade_level: str
+    statements: List[Tuple[str, bool]]
+
+
+@dataclass
+class FillInBlankQuiz(PuzzleModel):
+    """Sentences with blanks paired with the missing term, then a passage with several blanks
+
+    passage is '' when no sentence uses the passage words; passage_answers
+    fill its blanks in reading order.
+    """
+    __slots__ = ('standard', 'grade_level', 'items', 'passage', 'passage_answers')
+    kind = 'fill-blank'
+    nested = {'standard': Standard}
+    standard: Standard
+    grade_level: str
+    items: List[Tuple[str, str]]
+    passage: str
+    passage_answers: List[str]
+
+    @property
+    def answers(self) -> List[str]:
+        """Every term in the word bank, once each"""
+        return list(dict.fromkeys([answer for _, answer in self.items] + self.passage_answers))
+
+
+@dataclass
+class ShortAnswerQuiz(PuzzleModel):
+    """Open questions with sample answers"""
+    __slots__ = ('standard', 'grade_level', 'questions', 'answers')
+    kind = 'short-answer'
+    nested = {'standard': Standard}
+    standard: Standard
+    grade_level: str
+    questions: List[str]
+    answers: List[str]
+
+
+PUZZLE_TYPES = {
+    model.kind: model
+    for model in (WordSearchPuzzle, CrosswordPuzzle, MatchingPuzzle,
+                  TrueFalseQuiz, FillInBlankQuiz, ShortAnswerQuiz)
+}
+
+
+def load_puzzle(text: str) -> PuzzleModel:
+    """Deserialize any puzzle produced by PuzzleModel.to_json()"""
+    data = json.loads(text)
+    return PUZZLE_TYPES[data['kind']].from_dict(data)
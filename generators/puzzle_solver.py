@@ -0,0 +1,104 @@
+"""
+Puzzle Solver
+Solves and verifies generated word searches and crosswords
+
+The word search solver reads the finished grid the way a student would,
+in all eight directions, without looking at the stored placements:
+find_words() makes one Aho-Corasick pass over every line and finds every
+occurrence of every word. verify_word_search() then checks each listed
+word is there exactly once, at its recorded placement, and that the
+filler spells no banned word. verify_crossword() checks every entry is
+spelled in the grid, numbered in reading order, and that every run of
+letters is an entry.
+
+The verifiers return lists of problems (empty when the puzzle is sound)
+so tests and benchmark_puzzles.py can run them over thousands of
+puzzles and report everything at once. word_search_solution() gives the
+answer key the start and end cell of each word.
+"""
+
+from generators.crossword_layout import STEPS, CrosswordGrid
+from generators.word_search_layout import BANNED_WORDS, DIRECTIONS, find_words
+
+
+def _placement_cells(word, row, col, direction):
+    d_row, d_col = DIRECTIONS[direction]
+    return (row, col), (row + d_row * (len(word) - 1), col + d_col * (len(word) - 1))
+
+
+def verify_word_search(puzzle, banned=BANNED_WORDS):
+    """Problems with a word search: missing, repeated or misplaced words, banned filler"""
+    grid = puzzle.grid
+    problems = []
+    if any(len(row) != len(grid) for row in grid):
+        return ["grid is not square"]
+
+    found = find_words(grid, puzzle.words)
+    placed = set()
+    for placement in puzzle.placements:
+        word = placement.word
+        start, end = _placement_cells(word, placement.row, placement.col, placement.direction)
+        occurrences = found[word]
+        if (start, end) not in occurrences:
+            problems.append(f"{word} is not at its placement {start} {placement.direction}")
+        if len(occurrences) != 1:
+            problems.append(f"{word} appears {len(occurrences)} times")
+        d_row, d_col = DIRECTIONS[placement.direction]
+        placed.update((start[0] + d_row * i, start[1] + d_col * i) for i in range(len(word)))
+
+    for word, occurrences in find_words(grid, banned).items():
+        for start, end in occurrences:
+            d_row = (end[0] > start[0]) - (end[0] < start[0])
+            d_col = (end[1] > start[1]) - (end[1] < start[1])
+            cells = {(start[0] + d_row * i, start[1] + d_col * i) for i in range(len(word))}
+            if not cells <= placed:
+                problems.append(f"filler spells {word} at {start}")
+    return problems
+
+
+def word_search_solution(puzzle):
+    """(word, start, end) for each listed word, located by solving the grid"""
+    found = find_words(puzzle.grid, puzzle.words)
+    solution = []
+    for placement in puzzle.placements:
+        occurrences = found[placement.word]
+        recorded = _placement_cells(placement.word, placement.row, placement.col, placement.direction)
+        # The recorded placement wins if a word somehow appears twice
+        if occurrences and recorded not in occurrences:
+            recorded = occurrences[0]
+        solution.append((placement.word,) + recorded)
+    return solution
+
+
+def verify_crossword(puzzle):
+    """Problems with a crossword: misspelled, misnumbered or unclued entries, stray letters"""
+    grid = puzzle.grid
+    problems = []
+    covered = set()
+    placements = []
+    for entry in puzzle.entries:
+        word = entry.word.upper()
+        d_row, d_col = STEPS[entry.direction]
+        cells = [(entry.row + d_row * i, entry.col + d_col * i) for i in range(len(word))]
+        spelled = ''.join(grid[row][col] if row < len(grid) and col < len(grid[row]) else '?'
+                          for row, col in cells)
+        if spelled != word:
+            problems.append(f"{entry.number} {entry.direction} reads {spelled}, not {word}")
+        if not entry.clue:
+            problems.append(f"{entry.number} {entry.direction} has no clue")
+        covered.update(cells)
+        placements.append((word, entry.row, entry.col, entry.direction))
+
+    crossword = CrosswordGrid(grid)
+    for run in crossword.unintended_words(placements):
+        problems.append(f"grid spells {run}, which is not an entry")
+    numbers = {(row, col, direction): number for number, _, row, col, direction in crossword.numbered(placements)}
+    for entry in puzzle.entries:
+        expected = numbers.get((entry.row, entry.col, entry.direction))
+        if expected is not None and expected != entry.number:
+            problems.append(f"{entry.word.upper()} is numbered {entry.number}, expected {expected}")
+
+    letters = {(row, col) for row, line in enumerate(grid) for col, letter in enumerate(line) if letter != ' '}
+    for row, col in sorted(letters - covered):
+        problems.append(f"letter at {(row, col)} belongs to no entry")
+    return problems
@@ -0,0 +1,317 @@
+"""
+Generator Registry
+Discovers worksheet generators and resolves them lazily
+
+Each generator module declares a GENERATOR_INFO dict literal describing the
+format it produces:
+
+    GENERATOR_INFO = {
+        'id': 'word-search',                    # worksheet format id
+        'entry_point': 'generate_word_search',  # callable to resolve
+        'grades': ['K-2', '3-5', '6-8'],        # grade bands it supports
+        'cost': 2.0,                            # estimated seconds per worksheet
+        'backends': ['png'],                    # outputs it can produce
+        'priority': 10,                         # preferred when ids clash
+    }
+
+The registry reads that literal with ast instead of importing the module,
+because generator modules pull in Pillow, the content engine and fonts.
+A module is imported the first time its format is requested and the
+resolved callable is cached. The GenerationScheduler uses the cost
+estimate to run expensive formats in a worker pool and cheap ones inline.
+"""
+
+import ast
+import importlib
+import importlib.util
+import os
+import queue
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import get_context
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+INFO_DEFAULTS = {
+    'grades': ['K-2', '3-5', '6-8'],
+    'cost': 1.0,
+    'backends': ['png'],
+    'priority': 0,
+}
+
+
+def read_generator_info(path: str) -> Optional[Dict]:
+    """Return the GENERATOR_INFO literal declared in a module file, if any"""
+    with open(path, encoding='utf-8') as source_file:
+        source = source_file.read()
+    if 'GENERATOR_INFO' not in source:
+        return None
+    for node in ast.parse(source, filename=path).body:
+        if isinstance(node, ast.Assign) and any(
+                isinstance(target, ast.Name) and target.id == 'GENERATOR_INFO'
+                for target in node.targets):
+            info = dict(INFO_DEFAULTS)
+            info.update(ast.literal_eval(node.value))
+            return info
+    return None
+
+
+class GeneratorRegistry(Mapping):
+    """Format id -> generator callable, imported on first use
+
+    Each format has candidates ordered by priority; the first one that
+    imports cleanly wins. Unavailable formats map to None, like the
+    hand-written FORMAT_GENERATORS dict this replaces.
+    """
+
+    def __init__(self):
+        self._candidates: Dict[str, List[Tuple[str, str, Dict]]] = {}
+        self._resolved: Dict[str, Optional[Tuple[Callable, Dict]]] = {}
+        self._lock = threading.RLock()
+        self._warmup_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def discover(cls, package: str = 'generators') -> 'GeneratorRegistry':
+        """Build a registry from every module in a package that declares GENERATOR_INFO"""
+        registry = cls()
+        spec = importlib.util.find_spec(package)
+        for directory in spec.submodule_search_locations:
+            for filename in sorted(os.listdir(directory)):
+                if not filename.endswith('.py'):
+                    continue
+                info = read_generator_info(os.path.join(directory, filename))
+                if info is not None:
+                    registry.register_module(f"{package}.{filename[:-3]}", info)
+        return registry
+
+    def register_module(self, module_name: str, info: Dict):
+        """Register a generator module from its metadata"""
+        with self._lock:
+            candidates = self._candidates.setdefault(info['id'], [])
+            candidates.append((module_name, info['entry_point'], info))
+            candidates.sort(key=lambda candidate: -candidate[2]['priority'])
+            self._resolved.pop(info['id'], None)
+
+    def register(self, format_id: str, candidates: Sequence[Tuple[str, str]], **info):
+        """Register generators by hand, preferred first"""
+        for priority, (module_name, attribute) in enumerate(reversed(candidates)):
+            metadata = dict(INFO_DEFAULTS, priority=priority)
+            metadata.update(info, id=format_id, entry_point=attribute)
+            self.register_module(module_name, metadata)
+
+    def __getitem__(self, format_id: str) -> Optional[Callable]:
+        resolved = self._resolve(format_id)
+        return resolved[0] if resolved else None
+
+    def __iter__(self):
+        return iter(self._candidates)
+
+    def __len__(self):
+        return len(self._candidates)
+
+    def _resolve(self, format_id: str) -> Optional[Tuple[Callable, Dict]]:
+        if format_id not in self._candidates:
+            raise KeyError(format_id)
+        try:
+            return self._resolved[format_id]
+        except KeyError:
+            pass
+        with self._lock:
+            if format_id not in self._resolved:
+                self._resolved[format_id] = self._import(format_id)
+            return self._resolved[format_id]
+
+    def _import(self, format_id: str) -> Optional[Tuple[Callable, Dict]]:
+        for module_name, attribute, info in self._candidates[format_id]:
+            try:
+                module = importlib.import_module(module_name)
+                generator = getattr(module, attribute)
+            except (ImportError, AttributeError) as e:
+                print(f"Generator {module_name}.{attribute} not available: {e}")
+                continue
+            print(f"Using {module_name} for {format_id}")
+            return generator, dict(info, module=module_name)
+        return None
+
+    def is_loaded(self, format_id: str) -> bool:
+        """True once a format's generator has been imported"""
+        return format_id in self._resolved
+
+    def _find(self, format_id: str) -> Optional[Dict]:
+        """Metadata of the preferred candidate, without importing anything"""
+        if self.is_loaded(format_id):
+            resolved = self._resolved[format_id]
+            return resolved[1] if resolved else None
+        for module_name, _, info in self._candidates.get(format_id, ()):
+            try:
+                found = importlib.util.find_spec(module_name) is not None
+            except (ImportError, ValueError):
+                found = False
+            if found:
+                return dict(info, module=module_name)
+        return None
+
+    def info(self, format_id: str) -> Optional[Dict]:
+        """Capability metadata for a format, or None if it is unavailable"""
+        return self._find(format_id)
+
+    def available_ids(self) -> set:
+        """Formats with at least one generator module on disk"""
+        return {format_id for format_id in self._candidates if self._find(format_id)}
+
+    def warmup(self, *tasks: Callable, background: bool = True,
+               formats: Optional[Sequence[str]] = None):
+        """Import generators (all of them by default), then run extra warmup tasks
+
+        With background=True this returns the daemon thread doing the work
+        so requests can be served while imports finish.
+        """
+        def run():
+            for format_id in list(self._candidates if formats is None else formats):
+                self.get(format_id)
+            for task in tasks:
+                try:
+                    task()
+                except Exception as e:
+                    print(f"Warmup task {getattr(task, '__name__', task)} failed: {e}")
+
+        if not background:
+            run()
+            return None
+
+        with self._lock:
+            if self._warmup_thread is None or not self._warmup_thread.is_alive():
+                self._warmup_thread = threading.Thread(
+                    target=run, name="generator-warmup", daemon=True
+                )
+                self._warmup_thread.start()
+            return self._warmup_thread
+
+    def join_warmup(self, timeout: Optional[float] = None):
+        """Wait for a background warmup; a fork must not copy its import locks mid-import"""
+        thread = self._warmup_thread
+        if thread is not None:
+            thread.join(timeout)
+
+
+def _run_in_worker(module_name: str, attribute: str, args: tuple, kwargs: dict,
+                   events=None, cancel_event=None, deadline: Optional[float] = None):
+    """Worker-pool entry point; the rendered page stays in the worker, only its stats return
+
+    Progress is forwarded to the parent through the events queue, if given;
+    cancel_event and deadline carry the parent's cancellation state.
+    """
+    from ai_engine.generation_context import generation_context
+
+    def forward(stage, message):
+        events.put((stage, message))
+
+    listener = forward if events is not None else None
+
+    with generation_context(listener, cancel_event, deadline) as context:
+        getattr(importlib.import_module(module_name), attribute)(*args, **kwargs)
+    return context.stats()
+
+
+class GenerationScheduler:
+    """Runs cheap formats inline and expensive ones in a process pool
+
+    A format whose estimated cost exceeds inline_cost seconds is sent to
+    the pool so it cannot hold a request thread's share of the GIL while
+    it searches and renders.
+    """
+
+    def __init__(self, registry: GeneratorRegistry, inline_cost: float = 1.0,
+                 max_workers: Optional[int] = None):
+        self.registry = registry
+        self.inline_cost = inline_cost
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._lock = threading.Lock()
+
+    def runs_inline(self, format_id: str) -> bool:
+        info = self.registry.info(format_id)
+        return info is None or info['cost'] <= self.inline_cost
+
+    def warmup(self, *tasks: Callable, background: bool = True):
+        """Warm up the formats this process will run itself"""
+        inline = [format_id for format_id in self.registry if self.runs_inline(format_id)]
+        return self.registry.warmup(*tasks, background=background, formats=inline)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: the app has live threads, which fork would copy mid-lock
+                self._pool = ProcessPoolExecutor(self.max_workers, mp_context=get_context('spawn'))
+            return self._pool
+
+    def _get_manager(self):
+        """Shares queues and events with workers; plain multiprocessing ones cannot be passed to a pool"""
+        with self._lock:
+            if self._manager is None:
+                self._manager = get_context('spawn').Manager()
+            return self._manager
+
+    def run(self, format_id: str, *args, progress: Optional[Callable[[str, str], None]] = None,
+            cancel_event: Optional[threading.Event] = None, deadline: Optional[float] = None,
+            **kwargs):
+        """Generate a worksheet, blocking until its files are written; returns its stats
+
+        progress, if given, is called with (stage, message) as the generator
+        reports progress, on the calling thread. Setting cancel_event or
+        passing the deadline (a time.time() value) makes the generator raise
+        GenerationCancelled at its next checkpoint.
+        """
+        info = self.registry.info(format_id)
+        if info is None:
+            raise KeyError(format_id)
+        if info['cost'] <= self.inline_cost:
+            from ai_engine.generation_context import generation_context
+            with generation_context(progress, cancel_event, deadline) as context:
+                self.registry[format_id](*args, **kwargs)
+            return context.stats()
+
+        # Only the worker imports the generator; the web process stays lean
+        events = remote_cancel = None
+        if progress is not None or cancel_event is not None:
+            manager = self._get_manager()
+            events = manager.Queue() if progress is not None else None
+            remote_cancel = manager.Event() if cancel_event is not None else None
+        future = self._get_pool().submit(
+            _run_in_worker, info['module'], info['entry_point'], args, kwargs,
+            events, remote_cancel, deadline
+        )
+
+        while not future.done():
+            if cancel_event is not None and cancel_event.is_set():
+                # Drop it if it is still queued, otherwise let the worker stop itself
+                if not future.cancel():
+                    remote_cancel.set()
+                break
+            if events is None:
+                wait([future], timeout=0.1)
+                continue
+            try:
+                progress(*events.get(timeout=0.1))
+            except queue.Empty:
+                pass
+
+        if events is not None:
+            # Everything the worker reported is already in the queue
+            while not events.empty():
+                progress(*events.get_nowait())
+        if future.cancelled():
+            from ai_engine.generation_context import GenerationCancelled
+            raise GenerationCancelled("Generation was cancelled before it started")
+        return future.result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
@@ -5,28 +5,25 @@ Uses intelligent content engine for TPT-quality worksheets
 
 import sys
 import os
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from ai_engine.smart_content import get_smart_content
+from ai_engine.generation_context import report_progress
+from ai_engine.smart_content import get_smart_content, make_rng
+from generators.page_renderer import get_font, new_page, save_pages
+from generators.puzzle_model import ShortAnswerQuiz, Standard
 
-
-def draw_decorative_border(draw, width, height):
-    """Add decorative border - TPT style"""
-    border_color = '#2c3e50'
-    margin = 50
-
-    draw.rectangle([margin, margin, width-margin, height-margin],
-                   outline=border_color, width=8)
-    draw.rectangle([margin+15, margin+15, width-margin-15, height-margin-15],
-                   outline=border_color, width=3)
-
-    corner_size = 25
-    for x, y in [(margin, margin), (width-margin-corner_size, margin),
-                 (margin, height-margin-corner_size), (width-margin-corner_size, height-margin-corner_size)]:
-        draw.rectangle([x, y, x+corner_size, y+corner_size], fill=border_color)
+# Registry metadata; read by generators/registry.py without importing this module
+GENERATOR_INFO = {
+    'id': 'short-answer',
+    'entry_point': 'generate_short_answer',
+    'grades': ['K-2', '3-5', '6-8'],
+    'cost': 0.8,
+    'backends': ['png'],
+    'priority': 10,
+}
 
 
 def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
@@ -65,21 +62,23 @@ def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
     return name_y + 80
 
 
-def generate_short_answer(standard_data, grade_level, output_filename="short_answer.png"):
-    """Generate smart TPT-style short answer worksheet"""
+def build_short_answer(standard_data, grade_level, seed=None):
+    """Generate the short answer questions without rendering them"""
 
     print(f"Generating short answer worksheet for {standard_data['code']}...")
 
-    # Get smart content engine
+    # Get smart content engine and this puzzle's private random generator
     content = get_smart_content()
+    rng = make_rng(seed)
 
     # Generate vocabulary
-    print("   Generating questions...")
+    report_progress('vocabulary', "   Generating questions...")
     vocabulary = content.generate_vocabulary_words(
         standard_data['title'],
         count=8,
         vocabulary_pool=standard_data.get('vocabulary'),
         topics=standard_data.get('topics'),
+        rng=rng,
     )
 
     # Create questions
@@ -104,23 +103,29 @@ def generate_short_answer(standard_data, grade_level, output_filename="short_ans
         questions.append(question)
         answers.append(answer)
 
-    print(f"   Generated {len(questions)} short answer questions")
+    report_progress('clues', f"   Generated {len(questions)} short answer questions")
+
+    return ShortAnswerQuiz(Standard.from_standard_data(standard_data), grade_level,
+                           questions, answers)
+
+
+def render_short_answer(puzzle, output_filename="short_answer.png"):
+    """Render a short answer worksheet and its answer key"""
+    report_progress('render', "   Rendering worksheet and answer key...")
+    standard_data = puzzle.standard.as_standard_data()
+    grade_level = puzzle.grade_level
+    questions = puzzle.questions
 
     # CREATE WORKSHEET
-    width, height = 2550, 3300
-    worksheet = Image.new('RGB', (width, height), 'white')
+    worksheet = new_page()
+    width, height = worksheet.size
     draw = ImageDraw.Draw(worksheet)
 
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 100)
-        header_font = ImageFont.truetype("arial.ttf", 65)
-        subtitle_font = ImageFont.truetype("arial.ttf", 50)
-        text_font = ImageFont.truetype("arial.ttf", 42)
-        small_font = ImageFont.truetype("arial.ttf", 38)
-    except:
-        title_font = header_font = subtitle_font = text_font = small_font = ImageFont.load_default()
+    title_font = get_font(100)
+    header_font = get_font(65)
+    subtitle_font = get_font(50)
+    text_font = get_font(42)
 
-    draw_decorative_border(draw, width, height)
     content_start_y = draw_tpt_header(draw, width, standard_data, grade_level,
                                       (title_font, header_font, subtitle_font))
 
@@ -174,42 +179,38 @@ def generate_short_answer(standard_data, grade_level, output_filename="short_ans
             line_y = answer_start_y + line_num * 60
             draw.line([(140, line_y), (width-140, line_y)], fill='#bdc3c7', width=2)
 
-    # FOOTER
-    footer_y = height - 100
-    draw.rectangle([120, footer_y - 10, width-120, footer_y + 60],
-                   fill='#ecf0f1', outline='#bdc3c7', width=2)
-    footer_text = "ScienceSheetForge - Smart Science Worksheets"
-    bbox = draw.textbbox((0, 0), footer_text, font=small_font)
-    footer_width = bbox[2] - bbox[0]
-    draw.text(((width - footer_width) // 2, footer_y + 5),
-             footer_text, fill='#7f8c8d', font=small_font)
-
-    worksheet.save(output_filename, quality=100, dpi=(300, 300))
+    # Answer key reuses the puzzle computed above; both pages are saved together
+    answer_key = render_answer_key(puzzle)
+    answer_key_filename = output_filename.replace('.png', '_ANSWER_KEY.png')
+    save_pages([(worksheet, output_filename), (answer_key, answer_key_filename)])
     print(f"Short answer worksheet saved: {output_filename}")
+    print(f"Answer key saved: {answer_key_filename}")
 
-    # Generate answer key
-    generate_answer_key(questions, answers, standard_data, grade_level,
-                       output_filename.replace('.png', '_ANSWER_KEY.png'))
+    return output_filename
 
-    return worksheet
 
+def generate_short_answer(standard_data, grade_level, output_filename="short_answer.png", seed=None):
+    """Generate smart TPT-style short answer worksheet"""
+    puzzle = build_short_answer(standard_data, grade_level, seed)
+    return render_short_answer(puzzle, output_filename)
 
-def generate_answer_key(questions, answers, standard_data, grade_level, output_filename):
-    """Generate answer key"""
-    width, height = 2550, 3300
-    answer_key = Image.new('RGB', (width, height), 'white')
-    draw = ImageDraw.Draw(answer_key)
 
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 100)
-        header_font = ImageFont.truetype("arial.ttf", 65)
-        subtitle_font = ImageFont.truetype("arial.ttf", 50)
-        text_font = ImageFont.truetype("arial.ttf", 40)
-        small_font = ImageFont.truetype("arial.ttf", 36)
-    except:
-        title_font = header_font = subtitle_font = text_font = small_font = ImageFont.load_default()
+def render_answer_key(puzzle):
+    """Render the answer key page"""
+    standard_data = puzzle.standard.as_standard_data()
+    grade_level = puzzle.grade_level
+    questions = puzzle.questions
+    answers = puzzle.answers
+
+    answer_key = new_page()
+    width, height = answer_key.size
+    draw = ImageDraw.Draw(answer_key)
 
-    draw_decorative_border(draw, width, height)
+    title_font = get_font(100)
+    header_font = get_font(65)
+    subtitle_font = get_font(50)
+    text_font = get_font(40)
+    small_font = get_font(36)
 
     # Header
     header_height = 280
@@ -298,18 +299,7 @@ def generate_answer_key(questions, answers, standard_data, grade_level, output_f
         for j, line in enumerate(lines[:5]):
             draw.text((160, answer_y + 20 + j * 50), line, fill='#2c3e50', font=small_font)
 
-    # FOOTER
-    footer_y = height - 100
-    draw.rectangle([120, footer_y - 10, width-120, footer_y + 60],
-                   fill='#ecf0f1', outline='#bdc3c7', width=2)
-    footer_text = "ScienceSheetForge - Smart Science Worksheets"
-    bbox = draw.textbbox((0, 0), footer_text, font=small_font)
-    footer_width = bbox[2] - bbox[0]
-    draw.text(((width - footer_width) // 2, footer_y + 5),
-             footer_text, fill='#7f8c8d', font=small_font)
-
-    answer_key.save(output_filename, quality=100, dpi=(300, 300))
-    print(f"Answer key saved: {output_filename}")
+    return answer_key
 
 
 if __name__ == "__main__":
@@ -6,6 +6,16 @@ Beautiful, sellable worksheets with decorative elements
 import random
 from PIL import Image, ImageDraw, ImageFont
 
+# Registry metadata; read by generators/registry.py without importing this module
+GENERATOR_INFO = {
+    'id': 'word-search',
+    'entry_point': 'generate_word_search',
+    'grades': ['K-2', '3-5', '6-8'],
+    'cost': 1.5,
+    'backends': ['png'],
+    'priority': 0,
+}
+
 
 def draw_decorative_border(draw, width, height):
     """Add decorative border - TPT style"""
@@ -71,18 +81,19 @@ def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
     return name_y + 80
 
 
-def generate_word_search(standard_data, grade_level, output_filename="word_search_tpt.png"):
+def generate_word_search(standard_data, grade_level, output_filename="word_search_tpt.png", seed=None):
     """Generate BEAUTIFUL TPT-style word search puzzle"""
+    rng = seed if isinstance(seed, random.Random) else random.Random(seed)
 
     # Select 10-15 words
     vocabulary = standard_data['vocabulary']
     num_words = min(15, max(10, len(vocabulary)))
-    selected_words = random.sample(vocabulary, num_words)
+    selected_words = rng.sample(vocabulary, num_words)
     selected_words = [w.upper() for w in selected_words if len(w) >= 3][:12]
 
     # Create grid
     grid_size = 15
-    grid = [[random.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(grid_size)]
+    grid = [[rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(grid_size)]
             for _ in range(grid_size)]
 
     # Place words
@@ -90,18 +101,18 @@ def generate_word_search(standard_data, grade_level, output_filename="word_searc
     for word in selected_words:
         attempts = 0
         while attempts < 50:
-            direction = random.choice(['H', 'V', 'D'])  # Horizontal, Vertical, Diagonal
+            direction = rng.choice(['H', 'V', 'D'])  # Horizontal, Vertical, Diagonal
             if direction == 'H':
-                row = random.randint(0, grid_size - 1)
-                col = random.randint(0, grid_size - len(word))
+                row = rng.randint(0, grid_size - 1)
+                col = rng.randint(0, grid_size - len(word))
                 # Place word
                 for i, letter in enumerate(word):
                     grid[row][col + i] = letter
                 placed_words.append(word)
                 break
             elif direction == 'V':
-                row = random.randint(0, grid_size - len(word))
-                col = random.randint(0, grid_size - 1)
+                row = rng.randint(0, grid_size - len(word))
+                col = rng.randint(0, grid_size - 1)
                 for i, letter in enumerate(word):
                     grid[row + i][col] = letter
                 placed_words.append(word)
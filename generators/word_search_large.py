@@ -0,0 +1,49 @@
+"""
+Large Word Search Generator
+Dense 50-word word searches on grids of up to 40x40 for advanced students
+
+Shares the builder and renderer with the standard word search; the grid is
+sized to the words and the word list continues on extra pages when it
+does not fit under the grid.
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from generators.word_search_smart import build_word_search, render_word_search
+
+# Registry metadata; read by generators/registry.py without importing this module
+GENERATOR_INFO = {
+    'id': 'word-search-large',
+    'entry_point': 'generate_large_word_search',
+    'grades': ['6-8'],
+    'cost': 3.0,
+    'backends': ['png'],
+    'priority': 10,
+}
+
+LARGE_WORD_COUNT = 50
+
+
+def build_large_word_search(standard_data, grade_level, seed=None, word_count=LARGE_WORD_COUNT):
+    """Generate a large word search puzzle without rendering it"""
+    return build_word_search(standard_data, grade_level, seed, word_count=word_count, grid_size=None)
+
+
+def generate_large_word_search(standard_data, grade_level, output_filename="word_search_large.png", seed=None):
+    """Generate a large word search with its answer key"""
+    puzzle = build_large_word_search(standard_data, grade_level, seed)
+    return render_word_search(puzzle, output_filename)
+
+
+if __name__ == "__main__":
+    sample_standard = {
+        'code': 'MS-LS1-2',
+        'title': 'Cell Function and Processes',
+        'vocabulary': ['cell', 'nucleus', 'mitochondria']
+    }
+
+    generate_large_word_search(sample_standard, "6-8", "output/test_large_word_search.png")
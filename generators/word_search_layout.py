@@ -0,0 +1,266 @@
+"""
+Word Search Layout
+Places words in a word search grid by exhaustive candidate enumeration
+
+Random probing (pick a spot, check it, try again) works while the grid is
+mostly empty but misses the few spots left once it fills up, so large
+grids with many words lose words. Here the longest, most constrained words
+go first, and every spot where a word fits is found at once: each line of
+the grid (row, column or diagonal) is a string with '.' for empty cells and
+a word becomes a regex of [letter.] classes, so one finditer per line lists
+every fitting start, overlaps included. A word is only skipped when it fits
+nowhere in the grid.
+
+fill_blanks() then draws every filler letter in one rng.choices() call, weighted
+by English letter frequency so the filler looks like the words hidden in
+it. Random filler can spell things by accident: a second copy of a hidden
+word, or a word that has no place on a classroom worksheet. An Aho-Corasick
+automaton finds all of them in one pass over every line in all eight
+directions, and only a filler cell of each match is redrawn.
+"""
+
+import math
+import re
+from collections import deque
+
+# Row and column step of each word direction
+DIRECTIONS = {'H': (0, 1), 'V': (1, 0), 'D': (1, 1)}
+EMPTY = '.'
+
+MIN_GRID_SIZE, MAX_GRID_SIZE = 10, 40
+# Share of cells that placed words should cover when the size is chosen for them
+TARGET_FILL = 0.5
+
+ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+# Relative frequency of each letter in English text, in percent
+LETTER_FREQUENCIES = (8.2, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.15, 0.77, 4.0, 2.4,
+                      6.7, 7.5, 1.9, 0.095, 6.0, 6.3, 9.1, 2.8, 0.98, 2.4, 0.15, 2.0, 0.074)
+# Words filler letters must not spell in any direction
+BANNED_WORDS = frozenset({
+    'ASS', 'BITCH', 'BOOB', 'BUTT', 'COCK', 'CRAP', 'CUNT', 'DAMN', 'DICK', 'DIE', 'FAG',
+    'FART', 'FUCK', 'GUN', 'HATE', 'HELL', 'KILL', 'KKK', 'NAZI', 'PENIS', 'PISS', 'POOP',
+    'PORN', 'RAPE', 'SEX', 'SEXY', 'SHIT', 'SLUT', 'TIT', 'TITS', 'TWAT', 'WHORE',
+})
+# Layouts tried before settling for one where crossing words repeat a word
+LAYOUT_ATTEMPTS = 10
+# Rescans allowed while repairing; each round fixes every match it finds
+MAX_REPAIR_ROUNDS = 50
+
+
+def grid_size_for(words, fill=TARGET_FILL, min_size=MIN_GRID_SIZE, max_size=MAX_GRID_SIZE):
+    """Smallest square grid that holds the longest word at about the given fill ratio"""
+    letters = sum(len(word) for word in words)
+    longest = max((len(word) for word in words), default=0)
+    side = max(min_size, longest, math.ceil(math.sqrt(letters / fill)))
+    return min(max_size, side)
+
+
+def grid_lines(size, step):
+    """Cells of every line of a size x size grid running in a (row, col) step"""
+    d_row, d_col = step
+    inside = range(size)
+    lines = []
+    for row in inside:
+        for col in inside:
+            # Lines start where the previous cell would be off the grid
+            if row - d_row in inside and col - d_col in inside:
+                continue
+            cells = []
+            r, c = row, col
+            while r in inside and c in inside:
+                cells.append((r, c))
+                r, c = r + d_row, c + d_col
+            lines.append(cells)
+    return lines
+
+
+def reading_lines(size):
+    """Every line of the grid in all eight reading directions"""
+    lines = []
+    for step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for cells in grid_lines(size, step):
+            if len(cells) > 1:
+                lines.append(cells)
+                lines.append(cells[::-1])
+    return lines
+
+
+class WordMatcher:
+    """Aho-Corasick automaton finding every occurrence of a set of words in one pass"""
+
+    def __init__(self, words):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for word in words:
+            state = 0
+            for letter in word:
+                if letter not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                    self._goto[state][letter] = len(self._goto) - 1
+                state = self._goto[state][letter]
+            self._output[state] += (word,)
+
+        # Breadth first, so a state's failure target is finished before it
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for letter, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and letter not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(letter, 0)
+                self._output[child] += self._output[self._fail[child]]
+
+    def find(self, text):
+        """Yield (start, word) for every occurrence, overlapping ones included"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, letter in enumerate(text):
+            while state and letter not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(letter, 0)
+            for word in output[state]:
+                yield index - len(word) + 1, word
+
+
+def find_words(grid, words):
+    """word -> [(start, end)] cells of every occurrence in any of the eight directions
+
+    A palindrome reads the same both ways, so it is reported once per place.
+    """
+    found = {word: [] for word in words}
+    seen = set()
+    matcher = WordMatcher(found)
+    for cells in reading_lines(len(grid)):
+        text = ''.join(grid[row][col] for row, col in cells)
+        for start, word in matcher.find(text):
+            ends = (cells[start], cells[start + len(word) - 1])
+            key = (word, frozenset(ends))
+            if key not in seen:
+                seen.add(key)
+                found[word].append(ends)
+    return found
+
+
+class WordSearchLayout:
+    """A square grid being filled with words; empty cells hold EMPTY"""
+
+    def __init__(self, size, directions=tuple(DIRECTIONS)):
+        self.size = size
+        self.grid = [[EMPTY] * size for _ in range(size)]
+        self.placements = []  # (word, row, col, direction)
+        self._placed = set()
+        self._lines = {direction: [line for line in grid_lines(size, DIRECTIONS[direction]) if len(line) > 1]
+                       for direction in directions}
+
+    def candidates(self, word):
+        """Every (row, col, direction) where word fits, in grid order"""
+        # A lookahead so overlapping starts are all found
+        pattern = re.compile('(?=' + ''.join(f'[{letter}{EMPTY}]' for letter in word) + ')')
+        grid = self.grid
+        found = []
+        for direction, lines in self._lines.items():
+            for cells in lines:
+                if len(cells) < len(word):
+                    continue
+                text = ''.join(grid[row][col] for row, col in cells)
+                for match in pattern.finditer(text):
+                    row, col = cells[match.start()]
+                    found.append((row, col, direction))
+        return found
+
+    def add(self, word, row, col, direction):
+        d_row, d_col = DIRECTIONS[direction]
+        for offset, letter in enumerate(word):
+            cell = (row + d_row * offset, col + d_col * offset)
+            self.grid[cell[0]][cell[1]] = letter
+            self._placed.add(cell)
+        self.placements.append((word, row, col, direction))
+
+    def place(self, word, rng):
+        """Put word at a random spot where it fits; False if it fits nowhere"""
+        found = self.candidates(word)
+        if not found:
+            return False
+        self.add(word, *rng.choice(found))
+        return True
+
+    def accidental_words(self, matcher):
+        """(word, filler cells) for each match in any direction that uses filler
+
+        A match made only of placed letters is a hidden word itself (or
+        part of one) and cannot be repaired, so it is left out.
+        """
+        grid = self.grid
+        found = []
+        for cells in reading_lines(self.size):
+            text = ''.join(grid[row][col] for row, col in cells)
+            for start, word in matcher.find(text):
+                filler = [cell for cell in cells[start:start + len(word)] if cell not in self._placed]
+                if filler:
+                    found.append((word, filler))
+        return found
+
+    def fill_blanks(self, rng, banned=BANNED_WORDS, weights=LETTER_FREQUENCIES):
+        """Fill empty cells, then redraw filler that spells banned or hidden words
+
+        Returns the number of cells redrawn.
+        """
+        empty = [(row, col) for row in range(self.size) for col in range(self.size)
+                 if self.grid[row][col] == EMPTY]
+        for (row, col), letter in zip(empty, rng.choices(ALPHABET, weights, k=len(empty))):
+            self.grid[row][col] = letter
+
+        matcher = WordMatcher(set(banned) | {word for word, *_ in self.placements})
+        repaired = 0
+        for _ in range(MAX_REPAIR_ROUNDS):
+            matches = self.accidental_words(matcher)
+            if not matches:
+                break
+            redraw = set()
+            for word, filler in matches:
+                # One changed letter breaks the match; skip it if another repair already does
+                if not redraw.intersection(filler):
+                    redraw.add(rng.choice(filler))
+            for row, col in sorted(redraw):
+                current = self.grid[row][col]
+                letters = [letter for letter in ALPHABET if letter != current]
+                self.grid[row][col] = rng.choices(letters, [weights[ALPHABET.index(letter)] for letter in letters])[0]
+            repaired += len(redraw)
+        return repaired
+
+    @property
+    def fill(self):
+        empty = sum(row.count(EMPTY) for row in self.grid)
+        return 1 - empty / (self.size * self.size)
+
+
+def lay_out_words(words, size, rng, directions=tuple(DIRECTIONS), attempts=LAYOUT_ATTEMPTS):
+    """Place words longest first; returns (layout, words that fit nowhere)
+
+    Where words cross they can spell a second copy of a short word (DNA,
+    ATP) that the filler cannot break up, so such layouts are laid out
+    again, up to `attempts` times; the best layout found is kept.
+    Placements keep the order of words, which is the order they are listed in.
+    """
+    order = {word: index for index, word in enumerate(words)}
+    best = None
+    for _ in range(attempts):
+        layout = WordSearchLayout(size, directions)
+        skipped = []
+        for word in sorted(words, key=len, reverse=True):
+            if not layout.place(word, rng):
+                skipped.append(word)
+        layout.placements.sort(key=lambda placement: order[placement[0]])
+        found = find_words(layout.grid, [placement[0] for placement in layout.placements])
+        repeats = sum(len(occurrences) - 1 for occurrences in found.values())
+        key = (len(skipped), repeats)
+        if best is None or key < best[0]:
+            best = (key, layout, skipped)
+        if not repeats:
+            break
+    return best[1], best[2]
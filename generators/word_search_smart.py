@@ -3,31 +3,45 @@ Smart Word Search Generator
 Uses intelligent content engine for TPT-quality worksheets
 """
 
-import random
 import sys
 import os
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from ai_engine.smart_content import get_smart_content
-
-
-def draw_decorative_border(draw, width, height):
-    """Add decorative border - TPT style"""
-    border_color = '#2c3e50'
-    margin = 50
-
-    draw.rectangle([margin, margin, width-margin, height-margin],
-                   outline=border_color, width=8)
-    draw.rectangle([margin+15, margin+15, width-margin-15, height-margin-15],
-                   outline=border_color, width=3)
-
-    corner_size = 25
-    for x, y in [(margin, margin), (width-margin-corner_size, margin),
-                 (margin, height-margin-corner_size), (width-margin-corner_size, height-margin-corner_size)]:
-        draw.rectangle([x, y, x+corner_size, y+corner_size], fill=border_color)
+from ai_engine.generation_context import report_progress
+from ai_engine.smart_content import get_smart_content, make_rng
+from generators.page_naming import page_filename
+from generators.page_renderer import (copy_layer, draw_continued_header, get_font, new_page, paste_layer,
+                                      release_page, save_pages, wrap_text)
+from generators.puzzle_model import Standard, WordPlacement, WordSearchPuzzle
+from generators.puzzle_solver import word_search_solution
+from generators.grid_renderer import blit_letters, draw_capsules, draw_grid_lines
+from generators.word_search_layout import MAX_GRID_SIZE, grid_size_for, lay_out_words
+
+# Registry metadata; read by generators/registry.py without importing this module
+GENERATOR_INFO = {
+    'id': 'word-search',
+    'entry_point': 'generate_word_search',
+    'grades': ['K-2', '3-5', '6-8'],
+    'cost': 2.0,
+    'backends': ['png'],
+    'priority': 10,
+}
+
+GRID_SIZE = 15
+WORD_COUNT = 12
+# Largest cell, and the page space kept clear for the footer
+MAX_CELL_SIZE = 60
+GRID_LINE_WIDTH = 2
+FOOTER_SPACE = 160
+WORD_ROW_HEIGHT = 70
+# Header bar shades; the first two also fill and outline the section bars
+WORKSHEET_COLORS = ('#9b59b6', '#8e44ad', '#7d3c98')
+ANSWER_KEY_COLORS = ('#27ae60', '#229954', '#1e8449')
+# Answer key highlight capsules, one colour per word in turn
+HIGHLIGHT_COLORS = ('#f1c40f', '#3498db', '#e74c3c', '#2ecc71', '#9b59b6', '#e67e22')
 
 
 def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
@@ -35,9 +49,7 @@ def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
     title_font, header_font, subtitle_font = fonts
 
     header_height = 280
-    colors = ['#9b59b6', '#8e44ad', '#7d3c98']  # Purple gradient
-
-    for i, color in enumerate(colors):
+    for i, color in enumerate(WORKSHEET_COLORS):
         y_start = 80 + i * 30
         draw.rectangle([80, y_start, width-80, y_start + 30], fill=color)
 
@@ -66,245 +78,273 @@ def draw_tpt_header(draw, width, standard_data, grade_level, fonts):
     return name_y + 80
 
 
-def generate_word_search(standard_data, grade_level, output_filename="word_search.png"):
-    """Generate smart TPT-style word search"""
+def select_words(content, standard_data, count, max_length, rng):
+    """Vocabulary for the standard, topped up from the whole database when short"""
+    vocabulary = content.generate_vocabulary_words(
+        standard_data['title'],
+        count=max(15, count),
+        vocabulary_pool=standard_data.get('vocabulary'),
+        topics=standard_data.get('topics'),
+        rng=rng,
+    )
+    candidates = [w.upper() for w in vocabulary if 3 <= len(w) <= max_length]
+    extra = sorted(w.upper() for w in content.vocab_database
+                   if w.isalpha() and 3 <= len(w) <= max_length and w.upper() not in candidates)
+    rng.shuffle(extra)
+    words = []
+    for word in candidates + extra:
+        if len(words) == count:
+            break
+        # A word inside another (ORGAN in ORGANISM) would be hidden twice
+        if not any(word in other or word[::-1] in other or other in word or other[::-1] in word
+                   for other in words):
+            words.append(word)
+    return words
+
+
+def build_word_search(standard_data, grade_level, seed=None, word_count=WORD_COUNT, grid_size=GRID_SIZE):
+    """Generate the word search puzzle without rendering it
+
+    grid_size=None sizes the grid to the words, up to MAX_GRID_SIZE.
+    """
 
     print(f"Generating smart word search for {standard_data['code']}...")
 
-    # Get smart content engine
+    # Get smart content engine and this puzzle's private random generator
     content = get_smart_content()
+    rng = make_rng(seed)
 
-    # Generate vocabulary
-    print("   Generating vocabulary...")
-    vocabulary = content.generate_vocabulary_words(
-        standard_data['title'],
-        count=15,
-        vocabulary_pool=standard_data.get('vocabulary'),
-        topics=standard_data.get('topics'),
+    report_progress('vocabulary', "   Generating vocabulary...")
+    selected_words = select_words(content, standard_data, word_count, grid_size or MAX_GRID_SIZE, rng)
+
+    report_progress('clues', f"   Generated {len(selected_words)} words for word search")
+
+    # Create grid: longest words first, each at a random spot among all that fit
+    if grid_size is None:
+        grid_size = grid_size_for(selected_words)
+    layout, skipped = lay_out_words(selected_words, grid_size, rng)
+    for word in skipped:
+        print(f"   Warning: could not place '{word}' in word search grid")
+    placements = [WordPlacement(*placement) for placement in layout.placements]
+
+    # Frequency-weighted filler, with accidental words redrawn
+    repaired = layout.fill_blanks(rng)
+    grid = layout.grid
+
+    report_progress('placement', f"   Placed {len(placements)} words in grid "
+                                 f"({repaired} filler letters redrawn)")
+
+    fun_facts = []
+    for placement in placements:
+        fact = content.get_fun_fact(placement.word)
+        if fact:
+            fun_facts.append((placement.word.title(), fact))
+    fun_facts = fun_facts[:3]
+
+    return WordSearchPuzzle(
+        Standard.from_standard_data(standard_data),
+        grade_level,
+        [''.join(row) for row in grid],
+        placements,
+        fun_facts,
     )
 
-    # Select 10-12 words for word search
-    selected_words = [w for w in vocabulary if len(w) >= 3][:12]
-    selected_words = [w.upper() for w in selected_words]
-
-    print(f"   Generated {len(selected_words)} words for word search")
-
-    # Create grid
-    grid_size = 15
-    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-    grid = [[' ' for _ in range(grid_size)] for _ in range(grid_size)]
-
-    def can_place(word_to_place, row_idx, col_idx, direction):
-        for offset, letter in enumerate(word_to_place):
-            r, c = row_idx, col_idx
-            if direction == 'H':
-                c += offset
-            elif direction == 'V':
-                r += offset
-            else:  # Diagonal
-                r += offset
-                c += offset
-
-            if r >= grid_size or c >= grid_size:
-                return False
-
-            existing = grid[r][c]
-            if existing not in (' ', letter):
-                return False
-        return True
-
-    def place_word(word_to_place, row_idx, col_idx, direction):
-        for offset, letter in enumerate(word_to_place):
-            r, c = row_idx, col_idx
-            if direction == 'H':
-                c += offset
-            elif direction == 'V':
-                r += offset
-            else:
-                r += offset
-                c += offset
-            grid[r][c] = letter
-
-    directions = ['H', 'V', 'D']
-    placed_words = []
-    for word in selected_words:
-        placed = False
-        for _ in range(100):
-            direction = random.choice(directions)
-            if direction == 'H':
-                row = random.randint(0, grid_size - 1)
-                col = random.randint(0, grid_size - len(word))
-            elif direction == 'V':
-                row = random.randint(0, grid_size - len(word))
-                col = random.randint(0, grid_size - 1)
-            else:
-                row = random.randint(0, grid_size - len(word))
-                col = random.randint(0, grid_size - len(word))
-
-            if can_place(word, row, col, direction):
-                place_word(word, row, col, direction)
-                placed_words.append(word)
-                placed = True
-                break
-
-        if not placed:
-            print(f"   Warning: could not place '{word}' in word search grid")
-
-    for row in range(grid_size):
-        for col in range(grid_size):
-            if grid[row][col] == ' ':
-                grid[row][col] = random.choice(alphabet)
-
-    print(f"   Placed {len(placed_words)} words in grid")
 
-    # CREATE WORKSHEET
-    width, height = 2550, 3300
-    worksheet = Image.new('RGB', (width, height), 'white')
-    draw = ImageDraw.Draw(worksheet)
+class PageFlow:
+    """Pages of one document; content continues on a new page when it reaches the footer"""
+
+    def __init__(self, page, y, title, colors):
+        self.pages = [page]
+        self.draw = ImageDraw.Draw(page)
+        self.width, height = page.size
+        self.bottom = height - FOOTER_SPACE
+        self.y = y
+        self.title = title
+        self.colors = colors
+
+    def ensure(self, height):
+        """Start a new page unless `height` more pixels fit on this one"""
+        if self.y + height <= self.bottom:
+            return
+        page = new_page()
+        self.pages.append(page)
+        self.draw = ImageDraw.Draw(page)
+        self.y = draw_continued_header(self.draw, self.width, f"{self.title} (continued)", self.colors) + 30
 
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 100)
-        header_font = ImageFont.truetype("arial.ttf", 65)
-        subtitle_font = ImageFont.truetype("arial.ttf", 50)
-        text_font = ImageFont.truetype("arial.ttf", 42)
-        grid_font = ImageFont.truetype("arial.ttf", 38)
-        small_font = ImageFont.truetype("arial.ttf", 38)
-    except:
-        title_font = header_font = subtitle_font = text_font = grid_font = small_font = ImageFont.load_default()
-
-    draw_decorative_border(draw, width, height)
-    grid_start_y = draw_tpt_header(draw, width, standard_data, grade_level,
-                                   (title_font, header_font, subtitle_font))
 
-    # GRID
-    cell_size = 60
-    grid_width = grid_size * cell_size
-    grid_start_x = (width - grid_width) // 2
+def grid_cell_size(grid_size, width):
+    """Cell size for a grid, shrunk so large grids fit across the page"""
+    return min(MAX_CELL_SIZE, (width - 300) // grid_size)
+
+
+def draw_word_grid(page, grid, origin, cell_size):
+    """Draw the letter grid with its shadow; returns the box of the grid itself"""
+    draw = ImageDraw.Draw(page)
+    grid_start_x, grid_start_y = origin
+    grid_extent = len(grid) * cell_size
+    grid_font = get_font(cell_size * 38 // MAX_CELL_SIZE)
 
     shadow_offset = 6
     draw.rectangle([grid_start_x + shadow_offset, grid_start_y + shadow_offset,
-                   grid_start_x + grid_width + shadow_offset, grid_start_y + (grid_size * cell_size) + shadow_offset],
+                   grid_start_x + grid_extent + shadow_offset, grid_start_y + grid_extent + shadow_offset],
                   fill='#bdc3c7')
 
-    for row in range(grid_size):
-        for col in range(grid_size):
-            x = grid_start_x + col * cell_size
-            y = grid_start_y + row * cell_size
+    draw.rectangle([grid_start_x, grid_start_y, grid_start_x + grid_extent, grid_start_y + grid_extent],
+                   fill='white')
+    draw_grid_lines(draw, origin, len(grid), len(grid), cell_size, '#2c3e50', width=GRID_LINE_WIDTH)
+    blit_letters(page, grid, origin, cell_size, grid_font, '#2c3e50')
+
+    # Grid lines are centred on the cell edges, so they reach half a width outside
+    half = GRID_LINE_WIDTH // 2
+    return (grid_start_x - half, grid_start_y - half,
+            grid_start_x + grid_extent + half + 1, grid_start_y + grid_extent + half + 1)
+
 
-            draw.rectangle([x, y, x + cell_size, y + cell_size],
-                         fill='white', outline='#2c3e50', width=2)
+def draw_word_list(flow, words, title, draw_word, fonts):
+    """Draw words in 3 columns under a title bar, continuing on new pages as needed"""
+    header_font, _ = fonts
+    width = flow.width
+    bar_color, outline_color = flow.colors[:2]
+    col_width = (width - 400) // 3
+    word_rows = [words[i:i + 3] for i in range(0, len(words), 3)]
+    heading = title
+    while word_rows:
+        flow.ensure(110 + WORD_ROW_HEIGHT)
+        draw = flow.draw
+        draw.rectangle([120, flow.y - 30, width-120, flow.y - 25], fill='#e67e22')
+        draw.rectangle([150, flow.y, width-150, flow.y + 70],
+                       fill=bar_color, outline=outline_color, width=3)
+        bbox = draw.textbbox((0, 0), heading, font=header_font)
+        text_width = bbox[2] - bbox[0]
+        draw.text(((width - text_width) // 2, flow.y + 10), heading, fill='white', font=header_font)
+        flow.y += 110
+
+        while word_rows and flow.y + WORD_ROW_HEIGHT <= flow.bottom:
+            for col_num, word in enumerate(word_rows.pop(0)):
+                draw_word(draw, 200 + col_num * col_width, flow.y, word)
+            flow.y += WORD_ROW_HEIGHT
+        heading = f"{title} (continued)"
+
+
+def wrap_fun_facts(draw, width, fun_facts, font):
+    """Lines of each fun fact, and the height the fun facts box needs"""
+    wrapped = [wrap_text(draw, f"{word_title}: {fact}", font, width - 360)
+               for word_title, fact in fun_facts]
+    return wrapped, 120 + sum(55 * (len(lines) - 1) + 80 for lines in wrapped)
+
+
+def draw_fun_facts(flow, fun_facts, title, fonts):
+    """Draw the fun facts box after the content so far, on a new page if it does not fit"""
+    header_font, small_font = fonts
+    width = flow.width
+    rule_color, outline_color = flow.colors[:2]
+    wrapped, facts_height = wrap_fun_facts(flow.draw, width, fun_facts, small_font)
+    flow.y += 120
+    flow.ensure(facts_height)
+    draw, y = flow.draw, flow.y
+
+    draw.rectangle([150, y - 30, width-150, y - 25], fill=rule_color)
+    draw.rectangle([150, y, width-150, y + 90],
+                   fill='#ecf0f1', outline=outline_color, width=3)
+    bbox = draw.textbbox((0, 0), title, font=header_font)
+    title_width = bbox[2] - bbox[0]
+    draw.text(((width - title_width) // 2, y + 15), title, fill='#2c3e50', font=header_font)
 
-            letter = grid[row][col]
-            bbox = draw.textbbox((0, 0), letter, font=grid_font)
-            letter_width = bbox[2] - bbox[0]
-            letter_height = bbox[3] - bbox[1]
-            draw.text((x + (cell_size - letter_width) // 2, y + (cell_size - letter_height) // 2 - 5),
-                     letter, fill='#2c3e50', font=grid_font)
+    fact_text_y = y + 120
+    for lines in wrapped:
+        for line in lines:
+            draw.text((180, fact_text_y), line, fill='#2c3e50', font=small_font)
+            fact_text_y += 55
+        fact_text_y += 80 - 55
+    flow.y = fact_text_y
 
-    # WORD LIST
-    list_y = grid_start_y + (grid_size * cell_size) + 100
-    draw.rectangle([120, list_y - 30, width-120, list_y - 25], fill='#e67e22')
 
-    draw.rectangle([150, list_y, width-150, list_y + 70],
-                   fill='#9b59b6', outline='#8e44ad', width=3)
-    bbox = draw.textbbox((0, 0), "FIND THESE WORDS", font=header_font)
-    text_width = bbox[2] - bbox[0]
-    draw.text(((width - text_width) // 2, list_y + 10), "FIND THESE WORDS", fill='white', font=header_font)
+def render_word_search(puzzle, output_filename="word_search.png"):
+    """Render a word search puzzle and its answer key
 
-    list_y += 110
+    Content too long for one page continues on extra pages, saved as
+    <name>_page2.png, <name>_ANSWER_KEY_page2.png and so on.
+    """
+    report_progress('render', "   Rendering worksheet and answer key...")
+    standard_data = puzzle.standard.as_standard_data()
+    grade_level = puzzle.grade_level
+    grid = puzzle.grid
+    grid_size = len(grid)
 
-    # Display words in 3 columns with checkboxes
-    col_width = (width - 400) // 3
-    for i, word in enumerate(placed_words):
-        col_num = i % 3
-        row_num = i // 3
-        x_pos = 200 + col_num * col_width
-        y_pos = list_y + row_num * 70
+    # CREATE WORKSHEET
+    worksheet = new_page()
+    width, height = worksheet.size
+    draw = ImageDraw.Draw(worksheet)
+
+    title_font = get_font(100)
+    header_font = get_font(65)
+    subtitle_font = get_font(50)
+    text_font = get_font(42)
+    small_font = get_font(38)
+
+    grid_start_y = draw_tpt_header(draw, width, standard_data, grade_level,
+                                   (title_font, header_font, subtitle_font))
 
+    # GRID; the answer key highlights a copy of it instead of drawing it again
+    cell_size = grid_cell_size(grid_size, width)
+    grid_start_x = (width - grid_size * cell_size) // 2
+    grid_box = draw_word_grid(worksheet, grid, (grid_start_x, grid_start_y), cell_size)
+    grid_layer = copy_layer(worksheet, grid_box)
+
+    # WORD LIST with checkboxes, overflowing onto further pages
+    def draw_checkbox_word(draw, x_pos, y_pos, word):
         checkbox_size = 30
         draw.rectangle([x_pos, y_pos + 5, x_pos + checkbox_size, y_pos + checkbox_size + 5],
-                      fill='white', outline='#9b59b6', width=3)
-
+                       fill='white', outline='#9b59b6', width=3)
         draw.text((x_pos + checkbox_size + 15, y_pos), word.title(), fill='#2c3e50', font=text_font)
 
-    rows_used = (len(placed_words) + 2) // 3
-    fun_fact_y = list_y + rows_used * 70 + 120
+    flow = PageFlow(worksheet, grid_start_y + grid_size * cell_size + 100, "WORD SEARCH", WORKSHEET_COLORS)
+    draw_word_list(flow, puzzle.words, "FIND THESE WORDS", draw_checkbox_word, (header_font, small_font))
+    if puzzle.fun_facts:
+        draw_fun_facts(flow, puzzle.fun_facts, "Did You Know?", (header_font, small_font))
 
-    fun_facts = []
-    for word in placed_words:
-        fact = content.get_fun_fact(word)
-        if fact:
-            fun_facts.append((word.title(), fact))
-    fun_facts = fun_facts[:3]
+    # Answer key reuses the puzzle and grid computed above; all pages are saved together
+    answer_key_pages = render_answer_key(puzzle, grid_layer)
+    answer_key_filename = output_filename.replace('.png', '_ANSWER_KEY.png')
+    save_pages([(page, page_filename(output_filename, number)) for number, page in enumerate(flow.pages, 1)]
+               + [(page, page_filename(answer_key_filename, number))
+                  for number, page in enumerate(answer_key_pages, 1)])
+    print(f"Smart word search saved: {output_filename}"
+          + (f" (+{len(flow.pages) - 1} continuation pages)" if len(flow.pages) > 1 else ""))
+    print(f"Answer key saved: {answer_key_filename}")
+
+    return output_filename
 
-    if fun_facts:
-        draw.rectangle([150, fun_fact_y - 30, width-150, fun_fact_y - 25], fill='#9b59b6')
-        draw.rectangle([150, fun_fact_y, width-150, fun_fact_y + 90],
-                       fill='#ecf0f1', outline='#8e44ad', width=3)
-        bbox = draw.textbbox((0, 0), "Did You Know?", font=header_font)
-        title_width = bbox[2] - bbox[0]
-        draw.text(((width - title_width) // 2, fun_fact_y + 15), "Did You Know?", fill='#2c3e50', font=header_font)
-
-        fact_text_y = fun_fact_y + 120
-        for word_title, fact in fun_facts:
-            full_text = f"{word_title}: {fact}"
-            words = full_text.split()
-            current_line = []
-            for token in words:
-                test_line = ' '.join(current_line + [token])
-                bbox = draw.textbbox((0, 0), test_line, font=small_font)
-                if bbox[2] - bbox[0] <= (width - 360):
-                    current_line.append(token)
-                else:
-                    draw.text((180, fact_text_y), ' '.join(current_line), fill='#2c3e50', font=small_font)
-                    fact_text_y += 55
-                    current_line = [token]
-            if current_line:
-                draw.text((180, fact_text_y), ' '.join(current_line), fill='#2c3e50', font=small_font)
-                fact_text_y += 80
-
-    # FOOTER
-    footer_y = height - 100
-    draw.rectangle([120, footer_y - 10, width-120, footer_y + 60],
-                   fill='#ecf0f1', outline='#bdc3c7', width=2)
-    footer_text = "ScienceSheetForge - Smart Science Worksheets"
-    bbox = draw.textbbox((0, 0), footer_text, font=small_font)
-    footer_width = bbox[2] - bbox[0]
-    draw.text(((width - footer_width) // 2, footer_y + 5),
-             footer_text, fill='#7f8c8d', font=small_font)
-
-    worksheet.save(output_filename, quality=100, dpi=(300, 300))
-    print(f"Smart word search saved: {output_filename}")
-
-    # Generate answer key
-    generate_answer_key(placed_words, standard_data, grade_level,
-                       output_filename.replace('.png', '_ANSWER_KEY.png'))
-
-    return worksheet
-
-
-def generate_answer_key(words, standard_data, grade_level, output_filename):
-    """Generate answer key with word list"""
-    width, height = 2550, 3300
-    answer_key = Image.new('RGB', (width, height), 'white')
-    draw = ImageDraw.Draw(answer_key)
-    content = get_smart_content()
 
-    try:
-        title_font = ImageFont.truetype("arial.ttf", 100)
-        header_font = ImageFont.truetype("arial.ttf", 65)
-        subtitle_font = ImageFont.truetype("arial.ttf", 50)
-        text_font = ImageFont.truetype("arial.ttf", 42)
-        small_font = ImageFont.truetype("arial.ttf", 38)
-    except:
-        title_font = header_font = subtitle_font = text_font = small_font = ImageFont.load_default()
+def generate_word_search(standard_data, grade_level, output_filename="word_search.png", seed=None):
+    """Generate smart TPT-style word search"""
+    puzzle = build_word_search(standard_data, grade_level, seed)
+    return render_word_search(puzzle, output_filename)
 
-    draw_decorative_border(draw, width, height)
 
-    header_height = 280
-    colors = ['#27ae60', '#229954', '#1e8449']
+def render_answer_key(puzzle, grid_layer=None):
+    """Render answer key pages: the grid with every word highlighted, the word list and fun facts
+
+    grid_layer is the worksheet's grid copied with copy_layer(); the key
+    draws its own when it is not given. Returns the list of pages.
+    """
+    standard_data = puzzle.standard.as_standard_data()
+    grade_level = puzzle.grade_level
+    grid = puzzle.grid
+    grid_size = len(grid)
+
+    answer_key = new_page()
+    width, height = answer_key.size
+    draw = ImageDraw.Draw(answer_key)
 
-    for i, color in enumerate(colors):
+    title_font = get_font(100)
+    header_font = get_font(65)
+    subtitle_font = get_font(50)
+    text_font = get_font(42)
+    small_font = get_font(38)
+
+    header_height = 280
+    for i, color in enumerate(ANSWER_KEY_COLORS):
         y_start = 80 + i * 30
         draw.rectangle([80, y_start, width-80, y_start + 30], fill=color)
 
@@ -319,79 +359,37 @@ def generate_answer_key(words, standard_data, grade_level, output_filename):
     draw.text((120, info_y), f"Grade: {grade_level}", fill='#2c3e50', font=subtitle_font)
     draw.text((width - 700, info_y), f"Standard: {standard_data['code']}", fill='#2c3e50', font=subtitle_font)
 
-    list_y = info_y + 100
-    draw.rectangle([120, list_y - 20, width-120, list_y - 15], fill='#e67e22')
-
-    draw.rectangle([150, list_y, width-150, list_y + 70],
-                   fill='#27ae60', outline='#229954', width=3)
-    bbox = draw.textbbox((0, 0), "WORDS IN PUZZLE", font=header_font)
-    text_width = bbox[2] - bbox[0]
-    draw.text(((width - text_width) // 2, list_y + 10), "WORDS IN PUZZLE", fill='white', font=header_font)
-
-    list_y += 110
-
-    # Display words in 3 columns with checkmarks
-    col_width = (width - 400) // 3
-    for i, word in enumerate(words):
-        col_num = i % 3
-        row_num = i // 3
-        x_pos = 200 + col_num * col_width
-        y_pos = list_y + row_num * 70
-
+    # GRID with a translucent capsule over each word, located by the solver
+    cell_size = grid_cell_size(grid_size, width)
+    grid_start_x = (width - grid_size * cell_size) // 2
+    grid_start_y = info_y + 100
+    if grid_layer is None:
+        grid_box = draw_word_grid(answer_key, grid, (grid_start_x, grid_start_y), cell_size)
+        grid_layer = copy_layer(answer_key, grid_box)
+    else:
+        # Only the shadow; the layer covers the rest
+        draw.rectangle([grid_start_x + 6, grid_start_y + 6,
+                        grid_start_x + grid_size * cell_size + 6, grid_start_y + grid_size * cell_size + 6],
+                       fill='#bdc3c7')
+    half = GRID_LINE_WIDTH // 2
+    segments = [(start, end) for _, start, end in word_search_solution(puzzle)]
+    draw_capsules(grid_layer, segments, (half, half), cell_size, HIGHLIGHT_COLORS)
+    paste_layer(answer_key, grid_layer, (grid_start_x - half, grid_start_y - half))
+    release_page(grid_layer)
+
+    # WORD LIST with checkmarks
+    def draw_checked_word(draw, x_pos, y_pos, word):
         draw.ellipse([x_pos, y_pos, x_pos + 40, y_pos + 40],
-                    fill='#27ae60', outline='#229954', width=2)
+                     fill='#27ae60', outline='#229954', width=2)
         draw.text((x_pos + 10, y_pos + 5), "V", fill='white', font=text_font)
-
         draw.text((x_pos + 55, y_pos + 3), word.upper(), fill='#2c3e50', font=text_font)
 
-    rows_used = (len(words) + 2) // 3
-    fun_fact_y = list_y + rows_used * 70 + 120
-
-    fun_facts = []
-    for word in words:
-        fact = content.get_fun_fact(word)
-        if fact:
-            fun_facts.append((word.title(), fact))
-    fun_facts = fun_facts[:3]
+    flow = PageFlow(answer_key, grid_start_y + grid_size * cell_size + 100, "ANSWER KEY", ANSWER_KEY_COLORS)
+    draw_word_list(flow, puzzle.words, "WORDS IN PUZZLE", draw_checked_word, (header_font, small_font))
+    if puzzle.fun_facts:
+        draw_fun_facts(flow, puzzle.fun_facts, "Fun Science Facts", (header_font, small_font))
 
-    if fun_facts:
-        draw.rectangle([150, fun_fact_y - 30, width-150, fun_fact_y - 25], fill='#27ae60')
-        draw.rectangle([150, fun_fact_y, width-150, fun_fact_y + 90],
-                       fill='#ecf0f1', outline='#229954', width=3)
-        bbox = draw.textbbox((0, 0), "Fun Science Facts", font=header_font)
-        title_width = bbox[2] - bbox[0]
-        draw.text(((width - title_width) // 2, fun_fact_y + 15), "Fun Science Facts", fill='#2c3e50', font=header_font)
-
-        fact_text_y = fun_fact_y + 120
-        for word_title, fact in fun_facts:
-            full_text = f"{word_title}: {fact}"
-            words = full_text.split()
-            current_line = []
-            for token in words:
-                test_line = ' '.join(current_line + [token])
-                bbox = draw.textbbox((0, 0), test_line, font=small_font)
-                if bbox[2] - bbox[0] <= (width - 360):
-                    current_line.append(token)
-                else:
-                    draw.text((180, fact_text_y), ' '.join(current_line), fill='#2c3e50', font=small_font)
-                    fact_text_y += 55
-                    current_line = [token]
-            if current_line:
-                draw.text((180, fact_text_y), ' '.join(current_line), fill='#2c3e50', font=small_font)
-                fact_text_y += 80
-
-    # FOOTER
-    footer_y = height - 100
-    draw.rectangle([120, footer_y - 10, width-120, footer_y + 60],
-                   fill='#ecf0f1', outline='#bdc3c7', width=2)
-    footer_text = "ScienceSheetForge - Smart Science Worksheets"
-    bbox = draw.textbbox((0, 0), footer_text, font=small_font)
-    footer_width = bbox[2] - bbox[0]
-    draw.text(((width - footer_width) // 2, footer_y + 5),
-             footer_text, fill='#7f8c8d', font=small_font)
-
-    answer_key.save(output_filename, quality=100, dpi=(300, 300))
-    print(f"Answer key saved: {output_filename}")
+    return flow.pages
 
 
 if __name__ == "__main__":
@@ -0,0 +1,345 @@
+"""
+Load Test Harness
+Drives /generate, /view and /download the way a classroom of teachers would
+
+By default the app is started in this process on a local port, with the
+AI engine stubbed out (template content only) and generated worksheets
+kept in a temporary store, so a run needs no network and leaves nothing
+behind. Point --url at a running server to test it instead.
+
+Each virtual user repeatedly picks a grade band and format from the
+configured mix and a real standard from NGSS_STANDARDS, then:
+
+    POST /generate -> GET /view (worksheet) -> GET /view (answer key)
+    -> GET /download (worksheet) -> GET /view with If-None-Match (304)
+
+Usage:
+    python load_test.py --users 50 --duration 60
+    python load_test.py --users 10 --requests 40 --formats matching=3,word-search=1
+    python load_test.py --url http://127.0.0.1:8000 --users 500 --duration 120 --json report.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, redirect_stdout
+from typing import Dict, List, Optional
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ngss_standards import NGSS_STANDARDS
+from stats import percentile
+
+
+DEFAULT_FORMATS = 'word-search=3,crossword=2,matching=2,fill-blank=1,true-false=1,short-answer=1'
+DEFAULT_GRADES = 'K-2=1,3-5=1,6-8=1'
+PERCENTILES = (50, 90, 95, 99)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse 'name=weight,name=weight' into a weight map"""
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.strip().partition('=')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Recorder:
+    """Thread-safe collection of request samples"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)  # endpoint -> [(latency, status, bytes)]
+        self.errors = defaultdict(int)  # error text -> count
+
+    def record(self, endpoint: str, latency: float, status: int, size: int):
+        with self._lock:
+            self.samples[endpoint].append((latency, status, size))
+
+    def record_error(self, endpoint: str, error: str):
+        with self._lock:
+            self.samples[endpoint].append((0.0, 0, 0))
+            self.errors[f"{endpoint}: {error}"] += 1
+
+
+class ResourceSampler:
+    """Samples CPU and memory of the server process (and its workers) while the test runs
+
+    Uses psutil when installed, which also covers worker-pool children;
+    otherwise falls back to /proc and process CPU time, which only see
+    the current process.
+    """
+
+    def __init__(self, pid: Optional[int] = None, interval: float = 0.5):
+        self.pid = pid or os.getpid()
+        self.interval = interval
+        self.rss_samples: List[int] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='resource-sampler', daemon=True)
+        try:
+            import psutil
+            self._process = psutil.Process(self.pid)
+        except ImportError:
+            if self.pid != os.getpid():
+                raise RuntimeError("Sampling another process requires psutil (pip install psutil)")
+            self._process = None
+
+    def _processes(self):
+        processes = [self._process]
+        try:
+            processes += self._process.children(recursive=True)
+        except Exception:
+            pass
+        return processes
+
+    def _rss(self) -> int:
+        if self._process is None:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        total = 0
+        for process in self._processes():
+            try:
+                total += process.memory_info().rss
+            except Exception:
+                pass
+        return total
+
+    def _cpu_seconds(self) -> float:
+        if self._process is None:
+            return time.process_time()
+        total = 0.0
+        for process in self._processes():
+            try:
+                times = process.cpu_times()
+                total += times.user + times.system
+            except Exception:
+                pass
+        return total
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.rss_samples.append(self._rss())
+            except OSError:
+                return
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        self._cpu_start = self._cpu_seconds()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.wall = time.perf_counter() - self._started
+        self.cpu = self._cpu_seconds() - self._cpu_start
+
+    def summary(self) -> Dict:
+        samples = self.rss_samples or [0]
+        return {
+            'cpu_seconds': round(self.cpu, 2),
+            'cpu_utilization': round(self.cpu / self.wall, 2) if self.wall else 0.0,
+            'cores': os.cpu_count(),
+            'rss_peak_mb': round(max(samples) / 1024 ** 2, 1),
+            'rss_mean_mb': round(sum(samples) / len(samples) / 1024 ** 2, 1),
+        }
+
+
+@contextmanager
+def local_server(store_dir: str):
+    """Run the app in this process on a free port with AI stubbed and a scratch store"""
+    import logging
+    from unittest import mock
+    from werkzeug.serving import make_server
+
+    import app as app_module
+    from storage import LocalStore
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    # Template content only: no request may leave this machine
+    ai_stub = mock.patch('ai_engine.content_generator.AIContentGenerator.generate_text', return_value='')
+    store = mock.patch.object(app_module, 'STORE', LocalStore(store_dir))
+    with ai_stub, store:
+        server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, name='load-test-server', daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_port}"
+        finally:
+            server.shutdown()
+            app_module.SCHEDULER.shutdown()
+
+
+def virtual_user(base_url: str, formats: Dict[str, float], grades: Dict[str, float],
+                 recorder: Recorder, budget, stop_at: float, rng: random.Random):
+    """One teacher generating, viewing and downloading worksheets until time or budget runs out"""
+    session = requests.Session()
+    format_ids, format_weights = list(formats), list(formats.values())
+    grade_ids, grade_weights = list(grades), list(grades.values())
+
+    def call(endpoint, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=300, **kwargs)
+        except requests.RequestException as e:
+            recorder.record_error(endpoint, type(e).__name__)
+            return None
+        recorder.record(endpoint, time.perf_counter() - started, response.status_code, len(response.content))
+        return response
+
+    while time.time() < stop_at and budget():
+        grade = rng.choices(grade_ids, grade_weights)[0]
+        standard = rng.choice(NGSS_STANDARDS[grade])
+        response = call('POST /generate', 'POST', f"{base_url}/generate", json={
+            'grade_level': grade,
+            'standard_code': standard['code'],
+            'worksheet_format': rng.choices(format_ids, format_weights)[0],
+            'seed': rng.randrange(2 ** 32),
+        })
+        if response is None or response.status_code != 200:
+            if response is not None and response.status_code == 429:
+                time.sleep(float(response.headers.get('Retry-After', 1)))
+            continue
+
+        result = response.json()
+        view = call('GET /view', 'GET', base_url + result['worksheet'])
+        call('GET /view', 'GET', base_url + result['answer_key'])
+        call('GET /download', 'GET', base_url + result['worksheet'].replace('/view/', '/download/'))
+        if view is not None and view.headers.get('ETag'):
+            call('GET /view (If-None-Match)', 'GET', base_url + result['worksheet'],
+                 headers={'If-None-Match': view.headers['ETag']})
+
+
+def run_load_test(base_url: str, users: int, duration: float, total_requests: Optional[int],
+                  formats: Dict[str, float], grades: Dict[str, float], seed: int = 0,
+                  server_pid: Optional[int] = None) -> Dict:
+    """Run the virtual users and summarise what they measured"""
+    recorder = Recorder()
+    lock = threading.Lock()
+    started_generations = [0]
+
+    def budget():
+        # Each loop iteration starts one generation; stop once the budget is spent
+        with lock:
+            if total_requests is not None and started_generations[0] >= total_requests:
+                return False
+            started_generations[0] += 1
+            return True
+
+    stop_at = time.time() + duration
+    threads = [
+        threading.Thread(target=virtual_user, name=f'teacher-{index}', daemon=True, args=(
+            base_url, formats, grades, recorder, budget, stop_at, random.Random(seed + index)))
+        for index in range(users)
+    ]
+    with ResourceSampler(server_pid) as sampler:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return build_report(recorder, sampler.wall, users, sampler.summary())
+
+
+def build_report(recorder: Recorder, wall: float, users: int, resources: Dict) -> Dict:
+    endpoints = {}
+    for endpoint, samples in sorted(recorder.samples.items()):
+        latencies = sorted(latency for latency, status, _ in samples if status)
+        failures = sum(1 for _, status, _ in samples if status == 0 or status >= 400 and status != 429)
+        statuses = defaultdict(int)
+        for _, status, _ in samples:
+            statuses[str(status or 'connection error')] += 1
+        endpoints[endpoint] = {
+            'requests': len(samples),
+            'throughput_rps': round(len(samples) / wall, 2) if wall else 0.0,
+            'error_rate': round(failures / len(samples), 4),
+            'rejected_429': statuses.get('429', 0),
+            'statuses': dict(statuses),
+            'mb_transferred': round(sum(size for _, _, size in samples) / 1024 ** 2, 2),
+            'latency_ms': dict(
+                {f'p{pct}': round(percentile(latencies, pct) * 1000, 1) for pct in PERCENTILES},
+                mean=round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+                max=round(latencies[-1] * 1000, 1) if latencies else 0.0,
+            ),
+        }
+    return {
+        'users': users,
+        'wall_seconds': round(wall, 2),
+        'endpoints': endpoints,
+        'errors': dict(recorder.errors),
+        'server': resources,
+    }
+
+
+def print_report(report: Dict):
+    print("=" * 100)
+    print(f"LOAD TEST: {report['users']} users for {report['wall_seconds']}s")
+    print("=" * 100)
+    header = f"{'endpoint':<28}{'reqs':>7}{'req/s':>8}{'err%':>7}{'429':>6}" + \
+        ''.join(f"{'p' + str(pct):>9}" for pct in PERCENTILES) + f"{'max':>9}{'MB':>9}"
+    print(header)
+    print("-" * len(header))
+    for endpoint, stats in report['endpoints'].items():
+        latency = stats['latency_ms']
+        print(f"{endpoint:<28}{stats['requests']:>7}{stats['throughput_rps']:>8}"
+              f"{stats['error_rate'] * 100:>6.1f}%{stats['rejected_429']:>6}"
+              + ''.join(f"{latency['p' + str(pct)]:>9}" for pct in PERCENTILES)
+              + f"{latency['max']:>9}{stats['mb_transferred']:>9}")
+    print("\nLatencies in milliseconds.")
+    server = report['server']
+    print(f"Server: {server['cpu_seconds']}s CPU ({server['cpu_utilization']} of {server['cores']} cores), "
+          f"RSS peak {server['rss_peak_mb']} MB, mean {server['rss_mean_mb']} MB")
+    for error, count in report['errors'].items():
+        print(f"  {count} x {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='Test a running server instead of an in-process one')
+    parser.add_argument('--server-pid', type=int, help='PID of --url server to sample (needs psutil)')
+    parser.add_argument('--users', type=int, default=10, help='Concurrent virtual teachers')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+    parser.add_argument('--requests', type=int, help='Stop after this many generations instead')
+    parser.add_argument('--formats', default=DEFAULT_FORMATS, help='Format mix, e.g. crossword=2,matching=1')
+    parser.add_argument('--grades', default=DEFAULT_GRADES, help='Grade band mix, e.g. K-2=1,6-8=3')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the request mix')
+    parser.add_argument('--json', metavar='PATH', help='Also write the report as JSON')
+    parser.add_argument('--verbose', action='store_true', help='Show generator output')
+    args = parser.parse_args(argv)
+
+    formats, grades = parse_mix(args.formats), parse_mix(args.grades)
+    duration = args.duration if args.requests is None else float('inf')
+
+    def run(base_url, server_pid):
+        return run_load_test(base_url, args.users, duration, args.requests,
+                             formats, grades, args.seed, server_pid)
+
+    if args.url:
+        report = run(args.url.rstrip('/'), args.server_pid)
+    else:
+        with tempfile.TemporaryDirectory(prefix='sciencesheetforge-load-') as store_dir, \
+                open(os.devnull, 'w') as devnull:
+            # Generators print progress; keep it out of the report unless asked
+            with redirect_stdout(sys.stdout if args.verbose else devnull), \
+                    local_server(store_dir) as base_url:
+                report = run(base_url, None)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Production Server
+Runs ScienceSheetForge under gunicorn with everything preloaded before fork
+
+`python app.py` starts Flask's single-process debug server, which is meant
+for development. This module is the production entry point:
+
+    python server.py                                # gunicorn, tuned from the machine
+    gunicorn --preload -k gthread 'server:create_app()'   # or drive gunicorn yourself
+
+create_app() imports the generators and loads fonts, the page chrome and the
+smart content database in the master process. Workers forked from it share
+those pages copy-on-write instead of each loading its own copy. Worker
+and thread counts come from the core count, capped by memory. WEB_CONCURRENCY,
+WEB_THREADS, HOST and PORT override them.
+
+Without gunicorn (e.g. on Windows) it falls back to a threaded Werkzeug
+server with the debugger and reloader off.
+"""
+
+import gc
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from admission import memory_limited_concurrency
+
+
+# Peak RSS of a worker rendering a worksheet and answer key, with headroom
+MEMORY_PER_WORKER_MB = int(os.environ.get('MEMORY_PER_WORKER_MB', 400))
+
+
+def total_memory_bytes():
+    """Physical memory of this machine, or None where it cannot be read"""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def server_settings(environ=None):
+    """Gunicorn settings derived from the machine, overridable from the environment"""
+    environ = os.environ if environ is None else environ
+    cores = os.cpu_count() or 1
+
+    # Rendering is CPU-bound and holds the GIL, so one worker per core;
+    # a few threads per worker keep /view and /download responsive
+    workers = int(environ.get('WEB_CONCURRENCY', 0))
+    if not workers:
+        workers = cores
+        memory = total_memory_bytes()
+        if memory:
+            workers = max(1, min(workers, memory // (MEMORY_PER_WORKER_MB * 1024 ** 2)))
+
+    timeout = float(environ.get('GENERATION_TIMEOUT_SECONDS', 60))
+    return {
+        'bind': f"{environ.get('HOST', '0.0.0.0')}:{environ.get('PORT', '8000')}",
+        'workers': workers,
+        'threads': int(environ.get('WEB_THREADS', 4)),
+        'worker_class': 'gthread',
+        'preload_app': True,
+        # Past the generation deadline plus time to store the result
+        'timeout': int(timeout) + 30,
+        'graceful_timeout': 30,
+        # Recycle workers now and then so fragmentation cannot accumulate
+        'max_requests': 1000,
+        'max_requests_jitter': 100,
+        'accesslog': '-',
+    }
+
+
+def preload():
+    """Load everything workers would otherwise load on their first request"""
+    import app as app_module
+    from ai_engine.smart_content import get_smart_content
+    from generators import page_renderer
+
+    registry = app_module.FORMAT_GENERATORS
+    # The background warmup must not be mid-import when the master forks
+    registry.join_warmup()
+    registry.warmup(background=False)
+    page_renderer.preload()
+    get_smart_content()
+
+
+def create_app():
+    """Configure the app for production and preload it; gunicorn calls this in the master"""
+    import app as app_module
+    from generators import crossword_layout
+
+    workers = server_settings()['workers']
+    # Forked workers already run generations in parallel; a process pool
+    # inside every worker would oversubscribe the cores
+    app_module.SCHEDULER.inline_cost = float('inf')
+    crossword_layout.share_cores(workers)
+    if not os.environ.get('MAX_CONCURRENT_GENERATIONS'):
+        # Every worker sees the same free memory; split it between them
+        app_module.ADMISSION.max_active = memory_limited_concurrency(processes=workers)
+    preload()
+
+    # Keep the garbage collector from touching (and so un-sharing) the
+    # preloaded objects in every worker
+    gc.collect()
+    gc.freeze()
+    return app_module.app
+
+
+def serve(environ=None):
+    settings = server_settings(environ)
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        from werkzeug.serving import run_simple
+
+        host, _, port = settings['bind'].rpartition(':')
+        print("gunicorn is not installed (pip install gunicorn); using a threaded Werkzeug server")
+        run_simple(host, int(port), create_app(), threaded=True,
+                   use_reloader=False, use_debugger=False)
+        return
+
+    class ScienceSheetForgeServer(BaseApplication):
+        def load_config(self):
+            for key, value in settings.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return create_app()
+
+    print(f"Starting {settings['workers']} workers x {settings['threads']} threads on {settings['bind']}")
+    ScienceSheetForgeServer().run()
+
+
+if __name__ == '__main__':
+    serve()
@@ -0,0 +1,284 @@
+"""
+Artifact Storage
+Content-addressed storage for generated worksheets with TTL garbage collection
+
+Artifacts are named after the SHA-256 of their bytes, so names never
+collide and regenerating an identical worksheet reuses the stored copy.
+Backends:
+
+- LocalStore: a directory on disk (the default, app.config['OUTPUT_FOLDER'])
+- TmpfsStore: a directory in RAM-backed /dev/shm for ephemeral nodes
+- S3Store: any client exposing the boto3 S3 calls it uses (put_object,
+  get_object, head_object, delete_object, list_objects_v2), so it works
+  with AWS, MinIO or a local stand-in
+
+An ArtifactSweeper thread deletes artifacts older than a TTL and then the
+oldest ones until the store fits its size budget.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional
+
+
+HASH_LENGTH = 64
+
+
+class ArtifactInfo(NamedTuple):
+    """A stored artifact's name, size in bytes and last-modified time"""
+    name: str
+    size: int
+    modified: float
+
+
+def content_name(data: bytes, suffix: str = '.png') -> str:
+    """Collision-free artifact name derived from its bytes"""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH] + suffix
+
+
+def is_artifact_name(name: str) -> bool:
+    """True for names produced by content_name(); rejects paths and other files"""
+    digest, _, suffix = name.partition('.')
+    return (len(digest) == HASH_LENGTH and suffix.isalnum()
+            and all(char in '0123456789abcdef' for char in digest))
+
+
+class ArtifactStore:
+    """Interface shared by the storage backends"""
+
+    def put(self, data: bytes, suffix: str = '.png') -> str:
+        """Store bytes and return their content name"""
+        raise NotImplementedError
+
+    def put_file(self, path: str, suffix: Optional[str] = None) -> str:
+        """Store a file's contents and return their content name"""
+        if suffix is None:
+            suffix = os.path.splitext(path)[1]
+        with open(path, 'rb') as artifact:
+            return self.put(artifact.read(), suffix)
+
+    def open(self, name: str) -> BinaryIO:
+        """Open an artifact for reading; raises FileNotFoundError if missing"""
+        raise NotImplementedError
+
+    def stat(self, name: str) -> Optional[ArtifactInfo]:
+        """Size and age of an artifact, or None if it does not exist"""
+        raise NotImplementedError
+
+    def local_path(self, name: str) -> Optional[str]:
+        """Filesystem path of an artifact when the backend has one"""
+        return None
+
+    def delete(self, name: str):
+        raise NotImplementedError
+
+    def list(self) -> Iterator[ArtifactInfo]:
+        raise NotImplementedError
+
+    def sweep(self, max_age: Optional[float] = None, max_bytes: Optional[int] = None,
+              now: Optional[float] = None) -> List[str]:
+        """Delete expired artifacts, then the oldest ones until under max_bytes"""
+        now = time.time() if now is None else now
+        removed = []
+        kept = []
+        for info in self.list():
+            if max_age is not None and now - info.modified > max_age:
+                self.delete(info.name)
+                removed.append(info.name)
+            else:
+                kept.append(info)
+
+        if max_bytes is not None:
+            total = sum(info.size for info in kept)
+            for info in sorted(kept, key=lambda item: item.modified):
+                if total <= max_bytes:
+                    break
+                self.delete(info.name)
+                removed.append(info.name)
+                total -= info.size
+        return removed
+
+
+class LocalStore(ArtifactStore):
+    """Artifacts as files in a directory"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        if not is_artifact_name(name):
+            raise FileNotFoundError(name)
+        return os.path.join(self.directory, name)
+
+    def put(self, data: bytes, suffix: str = '.png') -> str:
+        name = content_name(data, suffix)
+        path = self._path(name)
+        if os.path.exists(path):
+            # Same content already stored: refresh it so the sweeper keeps it
+            os.utime(path)
+            return name
+        # Write then rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return name
+
+    def open(self, name: str) -> BinaryIO:
+        return open(self._path(name), 'rb')
+
+    def stat(self, name: str) -> Optional[ArtifactInfo]:
+        try:
+            result = os.stat(self._path(name))
+        except FileNotFoundError:
+            return None
+        return ArtifactInfo(name, result.st_size, result.st_mtime)
+
+    def local_path(self, name: str) -> Optional[str]:
+        path = self._path(name)
+        return path if os.path.exists(path) else None
+
+    def delete(self, name: str):
+        try:
+            os.unlink(self._path(name))
+        except FileNotFoundError:
+            pass
+
+    def list(self) -> Iterator[ArtifactInfo]:
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file() and is_artifact_name(entry.name):
+                    result = entry.stat()
+                    yield ArtifactInfo(entry.name, result.st_size, result.st_mtime)
+
+
+class TmpfsStore(LocalStore):
+    """LocalStore in RAM-backed shared memory, for nodes without durable disk"""
+
+    def __init__(self, directory: Optional[str] = None):
+        if directory is None:
+            root = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+            directory = os.path.join(root, 'sciencesheetforge')
+        super().__init__(directory)
+
+
+class S3Store(ArtifactStore):
+    """Artifacts as objects in an S3-compatible bucket"""
+
+    def __init__(self, client, bucket: str, prefix: str = ''):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _key(self, name: str) -> str:
+        if not is_artifact_name(name):
+            raise FileNotFoundError(name)
+        return self.prefix + name
+
+    @staticmethod
+    def _missing(error: Exception) -> bool:
+        response = getattr(error, 'response', None) or {}
+        return response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound')
+
+    def put(self, data: bytes, suffix: str = '.png') -> str:
+        name = content_name(data, suffix)
+        content_type = 'image/png' if suffix == '.png' else 'application/octet-stream'
+        # Re-uploading identical content also refreshes LastModified for the sweeper
+        self.client.put_object(Bucket=self.bucket, Key=self._key(name), Body=data,
+                               ContentType=content_type)
+        return name
+
+    def open(self, name: str) -> BinaryIO:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(name))
+        except Exception as e:
+            if self._missing(e):
+                raise FileNotFoundError(name) from e
+            raise
+        return io.BytesIO(response['Body'].read())
+
+    def stat(self, name: str) -> Optional[ArtifactInfo]:
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=self._key(name))
+        except Exception as e:
+            if self._missing(e):
+                return None
+            raise
+        return ArtifactInfo(name, response['ContentLength'], response['LastModified'].timestamp())
+
+    def delete(self, name: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(name))
+
+    def list(self) -> Iterator[ArtifactInfo]:
+        kwargs = {'Bucket': self.bucket, 'Prefix': self.prefix}
+        while True:
+            response = self.client.list_objects_v2(**kwargs)
+            for item in response.get('Contents', []):
+                name = item['Key'][len(self.prefix):]
+                if is_artifact_name(name):
+                    yield ArtifactInfo(name, item['Size'], item['LastModified'].timestamp())
+            if not response.get('IsTruncated'):
+                return
+            kwargs['ContinuationToken'] = response['NextContinuationToken']
+
+
+class ArtifactSweeper:
+    """Daemon thread that periodically sweeps a store"""
+
+    def __init__(self, store: ArtifactStore, max_age: Optional[float],
+                 max_bytes: Optional[int], interval: float = 300.0):
+        self.store = store
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sweep(self) -> List[str]:
+        removed = self.store.sweep(self.max_age, self.max_bytes)
+        if removed:
+            print(f"Storage sweeper removed {len(removed)} artifact(s)")
+        return removed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Storage sweep failed: {e}")
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="artifact-sweeper", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+def create_store(config: Dict[str, str], default_directory: str) -> ArtifactStore:
+    """Build the backend selected by STORAGE_BACKEND (local, tmpfs or s3)"""
+    backend = config.get('STORAGE_BACKEND', 'local').lower()
+    if backend == 'local':
+        return LocalStore(config.get('STORAGE_DIRECTORY') or default_directory)
+    if backend == 'tmpfs':
+        return TmpfsStore(config.get('STORAGE_DIRECTORY') or None)
+    if backend == 's3':
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)") from e
+        client = boto3.client('s3', endpoint_url=config.get('STORAGE_S3_ENDPOINT') or None)
+        return S3Store(client, config['STORAGE_S3_BUCKET'], config.get('STORAGE_S3_PREFIX', ''))
+    raise ValueError(f"Unknown storage backend: {backend}")
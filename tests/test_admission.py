@@ -0,0 +1,83 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import app as app_module
+from admission import AdmissionController, AdmissionRejected
+
+
+class AdmissionControllerTests(unittest.TestCase):
+    """Generations are capped, briefly queued, and rejected with a retry hint."""
+
+    def wait_until(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_rejects_when_queue_full(self):
+        controller = AdmissionController(max_active=1, max_queued=0)
+        controller.acquire('a')
+        with self.assertRaises(AdmissionRejected) as caught:
+            controller.acquire('b')
+        self.assertGreaterEqual(caught.exception.retry_after, 1)
+        controller.release()
+        controller.acquire('b')
+
+    def test_waiter_times_out(self):
+        controller = AdmissionController(max_active=1, max_queued=1, max_wait=0.05)
+        controller.acquire('a')
+        with self.assertRaises(AdmissionRejected):
+            controller.acquire('b')
+        self.assertEqual(controller.queued, 0)
+
+    def test_per_client_queue_limit(self):
+        controller = AdmissionController(max_active=1, max_queued=10, max_queued_per_client=1)
+        controller.acquire('busy')
+        threading.Thread(target=lambda: controller.acquire('busy'), daemon=True).start()
+        self.wait_until(lambda: controller.queued == 1)
+        with self.assertRaises(AdmissionRejected):
+            controller.acquire('busy')
+        controller.release()
+
+    def test_round_robin_between_clients(self):
+        controller = AdmissionController(max_active=1, max_queued=10, max_queued_per_client=5)
+        controller.acquire('holder')
+        order = []
+
+        def request(client):
+            controller.acquire(client)
+            order.append(client)
+            controller.release()
+
+        threads = []
+        for client in ('a', 'a', 'a', 'b'):
+            thread = threading.Thread(target=request, args=(client,), daemon=True)
+            thread.start()
+            threads.append(thread)
+            self.wait_until(lambda: controller.queued == len(threads))
+
+        controller.release()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(order, ['a', 'b', 'a', 'a'])
+
+
+class GenerateAdmissionTests(unittest.TestCase):
+    """/generate answers 429 with Retry-After when there is no capacity."""
+
+    def test_busy_server_returns_429(self):
+        controller = AdmissionController(max_active=1, max_queued=0)
+        controller.acquire('someone-else')
+        with mock.patch.object(app_module, 'ADMISSION', controller):
+            client = app_module.app.test_client()
+            response = client.post('/generate', json={})
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response.headers['Retry-After'], str(response.get_json()['retry_after']))
+            response = client.get('/generate/stream')
+            self.assertEqual(response.status_code, 429)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import app as app_module
+from storage import LocalStore
+
+
+class ArtifactServingTests(unittest.TestCase):
+    """Stored worksheets are served with cache validators and byte ranges."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="sciencesheetforge-tests-")
+        self.store = LocalStore(self.tmp_dir)
+        patcher = mock.patch.object(app_module, 'STORE', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = app_module.app.test_client()
+        self.data = bytes(range(256)) * 40
+        self.name = self.store.put(self.data)
+        self.etag = self.name.split('.')[0]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_strong_etag_and_immutable_caching(self):
+        response = self.client.get(f'/view/{self.name}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, self.data)
+        self.assertEqual(response.headers['ETag'], f'"{self.etag}"')
+        self.assertTrue(response.cache_control.immutable)
+        self.assertTrue(response.cache_control.public)
+        self.assertEqual(response.headers['Accept-Ranges'], 'bytes')
+
+    def test_if_none_match_returns_not_modified(self):
+        for path in (f'/view/{self.name}', f'/download/{self.name}'):
+            response = self.client.get(path, headers={'If-None-Match': f'"{self.etag}"'})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.data, b'')
+            self.assertEqual(response.headers['ETag'], f'"{self.etag}"')
+
+    def test_byte_range(self):
+        response = self.client.get(f'/download/{self.name}?name=crossword.png',
+                                   headers={'Range': 'bytes=100-199'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.data, self.data[100:200])
+        self.assertEqual(response.headers['Content-Range'], f'bytes 100-199/{len(self.data)}')
+        self.assertIn('filename=crossword.png', response.headers['Content-Disposition'])
+
+    def test_missing_artifact(self):
+        self.assertEqual(self.client.get('/view/' + 'f' * 64 + '.png').status_code, 404)
+        self.assertEqual(self.client.get('/view/app.py').status_code, 404)
+
+
+class GenerationStreamTests(unittest.TestCase):
+    """/generate/stream reports each stage before the final result."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="sciencesheetforge-tests-")
+        patcher = mock.patch.object(app_module, 'STORE', LocalStore(self.tmp_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def read_events(self, query):
+        response = self.client.get('/generate/stream', query_string=query)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        events = []
+        for block in response.get_data(as_text=True).split('\n\n'):
+            lines = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+            if lines:
+                events.append((lines['event'], json.loads(lines['data'])))
+        return events
+
+    def test_progress_then_complete(self):
+        events = self.read_events({
+            'grade_level': '3-5',
+            'standard_code': app_module.NGSS_STANDARDS['3-5'][0]['code'],
+            'worksheet_format': 'matching',
+            'seed': '5',
+        })
+        stages = [payload['stage'] for event, payload in events if event == 'progress']
+        self.assertEqual(list(dict.fromkeys(stages)), ['vocabulary', 'clues', 'render', 'encode'])
+        event, payload = events[-1]
+        self.assertEqual(event, 'complete')
+        self.assertEqual(payload['seed'], 5)
+        self.assertEqual(self.client.get(payload['worksheet']).status_code, 200)
+
+    def test_failure_event(self):
+        events = self.read_events({'grade_level': '3-5', 'standard_code': 'NOPE', 'worksheet_format': 'matching'})
+        self.assertEqual(events, [('failed', {'success': False, 'error': 'Standard not found', 'status': 404})])
+
+
+class GenerateValidationTests(unittest.TestCase):
+    """Bad requests are refused before anything is generated."""
+
+    def setUp(self):
+        self.client = app_module.app.test_client()
+        self.request = {
+            'grade_level': '3-5',
+            'standard_code': app_module.NGSS_STANDARDS['3-5'][0]['code'],
+            'worksheet_format': 'matching',
+        }
+
+    def test_seed_must_be_an_integer(self):
+        for seed in ([1], "abc", "5", True, 1.5):
+            with self.subTest(seed=seed):
+                response = self.client.post('/generate', json=dict(self.request, seed=seed))
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.get_json()['error'], 'Seed must be an integer')
+        response = self.client.get('/bundle', query_string=dict(self.request, formats='matching', seed='abc'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_format_must_support_the_grade(self):
+        request = dict(self.request, worksheet_format='word-search-large')
+        response = self.client.post('/generate', json=request)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('not available for grade 3-5', response.get_json()['error'])
+        response = self.client.get('/bundle', query_string=dict(self.request, formats='matching,word-search-large'))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('word-search-large', response.get_json()['error'])
+
+
+class StartupTests(unittest.TestCase):
+    """Importing the app leaves Pillow and the generators unloaded."""
+
+    def test_import_does_not_load_pillow(self):
+        loaded = subprocess.run(
+            [sys.executable, '-c', "import sys, app; print('PIL' in sys.modules)"],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()[-1]
+        self.assertEqual(loaded, 'False')
+
+
+if __name__ == "__main__":
+    unittest.main()
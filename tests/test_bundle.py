@@ -0,0 +1,79 @@
+import io
+import shutil
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+import app as app_module
+from bundle import stream_zip
+from storage import LocalStore
+
+
+class StreamZipTests(unittest.TestCase):
+    """Archives are produced incrementally and read back intact."""
+
+    def test_chunks_form_a_valid_archive(self):
+        members = {'a.png': bytes(range(256)) * 1000, 'b.png': b'', 'c.txt': b'hello'}
+        chunks = list(stream_zip(((name, io.BytesIO(data)) for name, data in members.items()),
+                                 chunk_size=4096))
+        self.assertTrue(all(len(chunk) < 64 * 1024 for chunk in chunks))
+
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+        self.assertIsNone(archive.testzip())
+        self.assertEqual({name: archive.read(name) for name in archive.namelist()}, members)
+
+
+class BundleEndpointTests(unittest.TestCase):
+    """/bundle zips stored artifacts or worksheets it generates on the way."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="sciencesheetforge-tests-")
+        self.store = LocalStore(self.tmp_dir)
+        patcher = mock.patch.object(app_module, 'STORE', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        ai_stub = mock.patch('ai_engine.content_generator.AIContentGenerator.generate_text', return_value='')
+        ai_stub.start()
+        self.addCleanup(ai_stub.stop)
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def read_archive(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/zip')
+        return zipfile.ZipFile(io.BytesIO(response.get_data()))
+
+    def test_stored_artifacts(self):
+        first = self.store.put(b'first')
+        second = self.store.put(b'second')
+        response = self.client.get(f'/bundle?file={first}&name=worksheet.png&file={second}')
+        archive = self.read_archive(response)
+        self.assertEqual(archive.read('worksheet.png'), b'first')
+        self.assertEqual(archive.read(second), b'second')
+
+        missing = 'f' * 64 + '.png'
+        self.assertEqual(self.client.get(f'/bundle?file={missing}').status_code, 404)
+        self.assertEqual(self.client.get('/bundle?file=../app.py').status_code, 404)
+
+    def test_generated_formats(self):
+        response = self.client.get('/bundle?standard_code=MS-LS1-1&grade_level=6-8'
+                                   '&formats=matching,true-false&seed=5')
+        archive = self.read_archive(response)
+        self.assertEqual(archive.namelist(), [
+            'matching_MS-LS1-1.png', 'matching_MS-LS1-1_ANSWER_KEY.png',
+            'true-false_MS-LS1-1.png', 'true-false_MS-LS1-1_ANSWER_KEY.png',
+        ])
+        self.assertTrue(archive.read('matching_MS-LS1-1.png').startswith(b'\x89PNG'))
+
+    def test_rejects_bad_requests(self):
+        response = self.client.get('/bundle?standard_code=MS-LS1-1&grade_level=6-8&formats=matching,nope')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/bundle?standard_code=NOPE&grade_level=6-8')
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
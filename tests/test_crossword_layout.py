@@ -0,0 +1,128 @@
+import os
+import random
+import unittest
+from unittest import mock
+
+from generators import crossword_layout
+from generators.crossword_layout import (MAX_GRID_SIZE, SEARCH_ATTEMPTS, STEPS, CrosswordGrid,
+                                        Layout, _search_candidate, fit_cell_size, lay_out,
+                                        search_candidates, search_layout)
+from generators.crossword_smart import build_crossword
+from ngss_standards import NGSS_STANDARDS
+
+
+WORDS = ['PHOTOSYNTHESIS', 'MITOCHONDRIA', 'RESPIRATION', 'RIBOSOME',
+         'VACUOLE', 'TISSUE', 'ORGAN', 'CELL', 'NUCLEUS', 'ENERGY']
+
+
+class CrosswordLayoutTests(unittest.TestCase):
+    """Layouts are consistent, cropped to their words and reproducible."""
+
+    def assert_consistent(self, grid, placements):
+        for word, row, col, direction in placements:
+            d_row, d_col = STEPS[direction]
+            spelled = ''.join(grid[row + d_row * i][col + d_col * i] for i in range(len(word)))
+            self.assertEqual(spelled, word)
+
+    def test_search_places_words_in_a_tight_box(self):
+        layout = search_layout(WORDS, random.Random(3))
+        grid, placements = layout.to_grid()
+        self.assertEqual(len(placements), len(WORDS))
+        self.assert_consistent(grid, placements)
+
+        # Cropped: every edge row and column holds a letter
+        self.assertTrue(grid[0].strip() and grid[-1].strip())
+        self.assertTrue(any(row[0] != ' ' for row in grid))
+        self.assertTrue(any(row[-1] != ' ' for row in grid))
+
+        # Every word after the first crosses another
+        self.assertGreaterEqual(layout.intersections, len(WORDS) - 1)
+        self.assertGreaterEqual(layout.score(), lay_out(sorted(WORDS, key=len, reverse=True)).score())
+
+    def test_same_seed_same_layout(self):
+        first = search_layout(WORDS, random.Random(11)).to_grid()
+        second = search_layout(WORDS, random.Random(11)).to_grid()
+        self.assertEqual(first, second)
+
+    def test_parallel_candidates(self):
+        grid, placements = search_candidates(WORDS, random.Random(11), candidates=4, budget_seconds=30)
+        self.assert_consistent(grid, placements)
+        self.assertEqual(search_candidates(WORDS, random.Random(11), candidates=4, budget_seconds=30),
+                         (grid, placements))
+
+        # The winner is the best-scoring candidate, the earliest on ties
+        rng = random.Random(11)
+        results = [_search_candidate(WORDS, rng.getrandbits(32), SEARCH_ATTEMPTS, MAX_GRID_SIZE)
+                   for _ in range(4)]
+        expected = max(enumerate(results), key=lambda item: (item[1][0], -item[0]))[1]
+        self.assertEqual((grid, placements), expected[1:])
+
+    def test_candidates_without_spare_cores_search_in_process(self):
+        pooled = search_candidates(WORDS, random.Random(11), candidates=4, budget_seconds=30)
+        with mock.patch.object(crossword_layout, '_core_sharers', os.cpu_count() or 1), \
+                mock.patch.object(crossword_layout, '_get_pool') as get_pool:
+            self.assertEqual(crossword_layout.pool_size(4), 0)
+            inline = search_candidates(WORDS, random.Random(11), candidates=4, budget_seconds=30)
+        get_pool.assert_not_called()
+        self.assertEqual(inline, pooled)
+
+        # A pool worker never nests a pool of its own
+        with mock.patch.object(crossword_layout, 'parent_process', return_value=object()):
+            self.assertEqual(crossword_layout.pool_size(4), 0)
+        size = min(4, os.cpu_count() or 1)
+        self.assertEqual(crossword_layout.pool_size(4), size if size > 1 else 0)
+
+    def test_candidates_without_budget_still_answer(self):
+        grid, placements = search_candidates(WORDS, random.Random(2), candidates=4, budget_seconds=0)
+        self.assertEqual(len(placements), len(WORDS))
+        self.assert_consistent(grid, placements)
+
+    def test_size_limit(self):
+        layout = lay_out(['A' * 30, 'SHORT'], max_size=21)
+        self.assertEqual(layout.placements, [('SHORT', 0, 0, 'across')])
+
+    def test_no_word_touches_another_except_where_it_crosses(self):
+        layout = Layout()
+        layout.add('CELL', 0, 0, 'across')
+        # Running alongside CELL, or straight on from its end, would spell new words
+        self.assertIsNone(layout.crossings('ORGAN', 1, 0, 'across'))
+        self.assertIsNone(layout.crossings('ORGAN', 0, 4, 'across'))
+        self.assertEqual(layout.crossings('CORE', 0, 0, 'down'), 1)
+
+        for seed in range(5):
+            grid, placements = search_layout(WORDS, random.Random(seed)).to_grid()
+            self.assertEqual(CrosswordGrid(grid).unintended_words(placements), [])
+
+    def test_numbering_in_reading_order(self):
+        #  C E L L
+        #  O . . .
+        #  R A T E
+        #  E . . .
+        grid = ['CELL', 'O   ', 'RATE', 'E   ']
+        placements = [('RATE', 2, 0, 'across'), ('CELL', 0, 0, 'across'), ('CORE', 0, 0, 'down')]
+        crossword = CrosswordGrid(grid)
+        self.assertEqual(crossword.numbered(placements), [
+            (1, 'CELL', 0, 0, 'across'),
+            (1, 'CORE', 0, 0, 'down'),
+            (2, 'RATE', 2, 0, 'across'),
+        ])
+        self.assertEqual(crossword.unintended_words(placements), [])
+        # Letter runs nobody placed are reported, in both directions
+        self.assertEqual(CrosswordGrid(['CELL', 'OX  ', 'RATE', 'E   ']).unintended_words(placements), ['EXA', 'OX'])
+
+    def test_every_word_gets_a_clue(self):
+        puzzle = build_crossword(NGSS_STANDARDS['6-8'][0], '6-8', seed=4)
+        numbers = [entry.number for entry in puzzle.entries]
+        self.assertEqual(numbers, sorted(numbers))
+        self.assertTrue(all(entry.clue for entry in puzzle.entries))
+        placed = [(entry.word.upper(), entry.row, entry.col, entry.direction) for entry in puzzle.entries]
+        self.assertEqual(CrosswordGrid(puzzle.grid).unintended_words(placed), [])
+
+    def test_fit_cell_size(self):
+        self.assertEqual(fit_cell_size(5, 5, 2250, 2000), 120)
+        self.assertEqual(fit_cell_size(20, 10, 2250, 1600), 80)
+        self.assertEqual(fit_cell_size(100, 100, 2250, 1600), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
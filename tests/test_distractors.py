@@ -0,0 +1,71 @@
+import contextlib
+import io
+import unittest
+
+from ai_engine.distractors import DIFFICULTIES, DistractorIndex, difficulty_for_grade, tokenize
+from ai_engine.smart_content import get_smart_content
+from generators.matching_smart import DECOY_COUNT, build_matching
+from ngss_standards import NGSS_STANDARDS
+
+
+VOCAB = {
+    'predator': {'definition': "An animal that hunts other animals"},
+    'prey': {'definition': "An animal that other animals hunt for food"},
+    'consumer': {'definition': "An animal that eats other living things"},
+    'comet': {'definition': "A ball of ice and dust in orbit around the sun"},
+    'copy': {'definition': "A ball of ice and dust in orbit around the sun"},
+}
+
+
+class DistractorTests(unittest.TestCase):
+    """Distractors are ranked by how close their definitions are."""
+
+    def test_tokenize_drops_stop_words_and_plurals(self):
+        self.assertEqual(tokenize("The cells of plants"), ['cell', 'plant'])
+        self.assertEqual(tokenize("Glass mass"), ['glass', 'mass'])
+
+    def test_closest_definitions_are_hardest(self):
+        index = DistractorIndex(VOCAB)
+        self.assertEqual(index.distractors('predator', 'hard'), ('prey',))
+        self.assertEqual(index.distractors('predator', 'medium'), ('consumer',))
+        self.assertEqual(set(index.distractors('predator', 'easy')), {'comet', 'copy'})
+        self.assertGreater(index.similarity('prey', 'predator'), index.similarity('prey', 'consumer'))
+
+    def test_near_duplicates_are_never_distractors(self):
+        index = DistractorIndex(VOCAB)
+        self.assertGreater(index.similarity('comet', 'copy'), 0.9)
+        for difficulty in DIFFICULTIES:
+            self.assertNotIn('copy', index.distractors('comet', difficulty))
+
+    def test_empty_tier_falls_back(self):
+        index = DistractorIndex(VOCAB)
+        # comet shares no words with anything but its duplicate
+        self.assertEqual(set(index.distractors('Comet', 'hard')), {'predator', 'prey', 'consumer'})
+        self.assertEqual(index.distractors('unknown'), ())
+        with self.assertRaises(ValueError):
+            index.distractors('prey', 'impossible')
+
+    def test_grades_get_harder_distractors(self):
+        self.assertEqual([difficulty_for_grade(grade) for grade in ('K-2', '3-5', '6-8', '9-12')],
+                         ['easy', 'medium', 'hard', 'medium'])
+        content = get_smart_content()
+        index = content.distractor_index
+        for word in ('photosynthesis', 'erosion', 'gravity'):
+            with self.subTest(word=word):
+                hard = content.get_distractors(word, '6-8')
+                easy = content.get_distractors(word, 'K-2')
+                self.assertTrue(hard and easy)
+                self.assertGreater(min(index.similarity(word, other) for other in hard),
+                                   max(index.similarity(word, other) for other in easy))
+
+    def test_matching_decoys_match_no_term(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            puzzle = build_matching(NGSS_STANDARDS['6-8'][0], '6-8', seed=3)
+        terms = {term for term, _ in puzzle.pairs}
+        self.assertEqual(len(puzzle.decoys), DECOY_COUNT)
+        self.assertFalse(terms & {word for word, _ in puzzle.decoys})
+        self.assertEqual(sorted(puzzle.order), list(range(len(puzzle.pairs) + DECOY_COUNT)))
+
+
+if __name__ == "__main__":
+    unittest.main()
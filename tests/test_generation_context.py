@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from ai_engine.content_generator import AIContentGenerator
+from ai_engine.generation_context import (
+    DeadlineExceeded, GenerationCancelled, GenerationContext, current_context, generation_context,
+)
+from generators.registry import GenerationScheduler, GeneratorRegistry
+from ngss_standards import NGSS_STANDARDS
+
+
+class CancellationTests(unittest.TestCase):
+    """Generations stop at their next checkpoint once cancelled or late."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="sciencesheetforge-tests-")
+        self.output_path = os.path.join(self.tmp_dir, "worksheet.png")
+        self.standard = NGSS_STANDARDS['6-8'][0]
+        self.scheduler = GenerationScheduler(GeneratorRegistry.discover('generators'), max_workers=1)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def run_and_cancel_at(self, format_id, stage):
+        cancel_event = threading.Event()
+        seen = []
+
+        def progress(reported_stage, message):
+            seen.append(reported_stage)
+            if reported_stage == stage:
+                cancel_event.set()
+
+        with self.assertRaises(GenerationCancelled):
+            self.scheduler.run(format_id, self.standard, '6-8', self.output_path,
+                               progress=progress, cancel_event=cancel_event)
+        self.assertFalse(os.path.exists(self.output_path))
+        self.assertNotIn('encode', seen)
+
+    def test_cancel_inline_generation(self):
+        self.run_and_cancel_at('matching', 'render')
+
+    def test_cancel_pooled_generation(self):
+        self.run_and_cancel_at('word-search', 'vocabulary')
+
+    def test_past_deadline(self):
+        with self.assertRaises(DeadlineExceeded):
+            self.scheduler.run('true-false', self.standard, '6-8', self.output_path,
+                               deadline=time.time() - 1)
+
+
+class CanvasAccountingTests(unittest.TestCase):
+    """Canvas memory is counted per generation, safely across threads."""
+
+    def test_no_shared_default_context(self):
+        first = current_context()
+        first.track_canvas(100)
+        self.assertIsNot(current_context(), first)
+        self.assertEqual(current_context().peak_canvas_bytes, 0)
+        with generation_context() as context:
+            self.assertIs(current_context(), context)
+
+    def test_concurrent_tracking_balances(self):
+        context = GenerationContext()
+
+        def churn():
+            for _ in range(20000):
+                context.track_canvas(3)
+                context.release_canvas(3)
+
+        threads = [threading.Thread(target=churn) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(context.canvas_bytes, 0)
+        self.assertLessEqual(context.peak_canvas_bytes, 3 * len(threads))
+
+
+class AIDeadlineTests(unittest.TestCase):
+    """The AI engine skips requests it cannot finish and uses template content."""
+
+    def setUp(self):
+        self.ai = AIContentGenerator(api_key='test')
+
+    def test_near_deadline_falls_back_without_requests(self):
+        with mock.patch('ai_engine.content_generator.requests.post') as post:
+            with generation_context(deadline=time.time() + 1):
+                self.assertEqual(self.ai.generate_text("prompt"), "")
+                self.assertEqual(self.ai.generate_definition("cell", "3-5"), "The smallest unit of life")
+            post.assert_not_called()
+
+    def test_request_timeout_is_capped_by_deadline(self):
+        response = mock.Mock(status_code=200)
+        response.json.return_value = [{'generated_text': 'A clue'}]
+        with mock.patch('ai_engine.content_generator.requests.post', return_value=response) as post:
+            with generation_context(deadline=time.time() + 10):
+                self.assertEqual(self.ai.generate_text("prompt"), "A clue")
+        self.assertLessEqual(post.call_args.kwargs['timeout'], 10)
+
+    def test_cancelled_generation_raises(self):
+        cancel_event = threading.Event()
+        with mock.patch('ai_engine.content_generator.requests.post') as post:
+            with generation_context(cancel_event=cancel_event):
+                cancel_event.set()
+                with self.assertRaises(GenerationCancelled):
+                    self.ai.generate_clue("cell", "3-5")
+            post.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
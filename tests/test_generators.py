@@ -42,6 +42,20 @@ class GeneratorSmokeTests(unittest.TestCase):
                     self.assertTrue(os.path.exists(answer_key_path), "Answer key file not created")
                     self.assertGreater(os.path.getsize(answer_key_path), 0, "Answer key file is empty")
 
+    def test_same_seed_is_byte_identical(self):
+        grade_level, standard = self.test_cases[0]
+        for fmt in sorted(AVAILABLE_FORMAT_IDS):
+            with self.subTest(fmt=fmt):
+                generator = FORMAT_GENERATORS.get(fmt)
+                outputs = []
+                for run in range(2):
+                    output_path = os.path.join(self.tmp_dir, f"{fmt}_seeded_{run}.png")
+                    generator(standard, grade_level, output_path, seed=1234)
+                    answer_key_path = output_path.replace(".png", "_ANSWER_KEY.png")
+                    with open(output_path, "rb") as worksheet, open(answer_key_path, "rb") as answer_key:
+                        outputs.append((worksheet.read(), answer_key.read()))
+                self.assertEqual(outputs[0], outputs[1])
+
 
 if __name__ == "__main__":
     unittest.main()
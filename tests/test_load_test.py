@@ -0,0 +1,38 @@
+import contextlib
+import io
+import tempfile
+import unittest
+
+from load_test import local_server, parse_mix, run_load_test
+from stats import percentile
+
+
+class LoadTestHarnessTests(unittest.TestCase):
+    """The harness drives every endpoint locally and summarises the results."""
+
+    def test_helpers(self):
+        self.assertEqual(parse_mix('matching=3,crossword'), {'matching': 3.0, 'crossword': 1.0})
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_small_local_run(self):
+        with tempfile.TemporaryDirectory() as store_dir, contextlib.redirect_stdout(io.StringIO()):
+            with local_server(store_dir) as base_url:
+                report = run_load_test(base_url, users=2, duration=60, total_requests=3,
+                                       formats={'matching': 1, 'true-false': 1},
+                                       grades={'K-2': 1, '6-8': 1})
+
+        endpoints = report['endpoints']
+        self.assertEqual(endpoints['POST /generate']['requests'], 3)
+        self.assertEqual(endpoints['GET /view']['requests'], 6)
+        self.assertEqual(endpoints['GET /view (If-None-Match)']['statuses'], {'304': 3})
+        for stats in endpoints.values():
+            self.assertEqual(stats['error_rate'], 0)
+            self.assertGreater(stats['latency_ms']['p95'], 0)
+        self.assertGreater(report['server']['rss_peak_mb'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
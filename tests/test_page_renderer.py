@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from PIL import Image, ImageDraw
+
+from ai_engine.generation_context import generation_context
+from generators import page_renderer
+from generators.crossword_smart import build_crossword, render_crossword
+from generators.grid_renderer import draw_capsules
+from generators.page_naming import page_filename
+from generators.word_search_smart import build_word_search, render_word_search
+from ngss_standards import NGSS_STANDARDS
+
+
+PAGE_PIXELS = page_renderer.PAGE_WIDTH * page_renderer.PAGE_HEIGHT
+
+
+class CanvasModeTests(unittest.TestCase):
+    """Pages render on lean canvases, are freed after encoding and are accounted for."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="sciencesheetforge-tests-")
+        self.standard = NGSS_STANDARDS['6-8'][0]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_one_byte_canvas_modes(self):
+        for mode in ('P', 'L'):
+            for fmt, build, render in (('crossword', build_crossword, render_crossword),
+                                       ('word-search', build_word_search, render_word_search)):
+                with self.subTest(mode=mode, fmt=fmt), mock.patch.object(page_renderer, 'CANVAS_MODE', mode):
+                    output_path = os.path.join(self.tmp_dir, f"{fmt}_{mode}.png")
+                    with generation_context() as context:
+                        render(build(self.standard, '6-8', seed=7), output_path)
+
+                    # Worksheet and answer key were alive together, then both freed;
+                    # the word search also holds a copy of its 15 x 60px grid and its lines
+                    layer_pixels = (15 * 60 + 3) ** 2 if fmt == 'word-search' else 0
+                    self.assertEqual(context.peak_canvas_bytes, 2 * PAGE_PIXELS + layer_pixels)
+                    self.assertEqual(context.canvas_bytes, 0)
+                    with Image.open(output_path) as worksheet:
+                        self.assertEqual(worksheet.mode, mode)
+
+    def test_rgb_canvas_accounting(self):
+        with generation_context() as context:
+            page = page_renderer.new_page()
+            self.assertEqual(context.canvas_bytes, 4 * PAGE_PIXELS)
+            page_renderer.release_page(page)
+        self.assertEqual(context.canvas_bytes, 0)
+        self.assertEqual(context.stats(), {'peak_canvas_bytes': 4 * PAGE_PIXELS})
+
+    def test_busy_encoder_pool_encodes_on_the_calling_thread(self):
+        paths = [os.path.join(self.tmp_dir, f"page{number}.png") for number in range(3)]
+        for slots in (0, page_renderer.SAVE_THREADS):
+            with self.subTest(free_threads=slots), \
+                    mock.patch.object(page_renderer, '_save_slots', threading.BoundedSemaphore(max(slots, 1))) as sem:
+                if not slots:
+                    sem.acquire()
+                with generation_context() as context:
+                    page_renderer.save_pages([(page_renderer.new_page(mode='L'), path) for path in paths])
+                self.assertEqual(context.canvas_bytes, 0)
+                self.assertTrue(all(os.path.exists(path) for path in paths))
+                if not slots:
+                    sem.release()
+                self.assertTrue(sem.acquire(blocking=False))
+                for path in paths:
+                    os.remove(path)
+
+    def test_crossword_clues_that_do_not_fit_continue_on_a_second_page(self):
+        puzzle = build_crossword(self.standard, '6-8', seed=7)
+        output_path = os.path.join(self.tmp_dir, "crossword.png")
+        render_crossword(puzzle, output_path)
+        self.assertFalse(os.path.exists(page_filename(output_path, 2)))
+
+        for entry in puzzle.entries:
+            entry.clue = "A long clue that wraps across several lines of its column " * 10
+        with generation_context() as context:
+            render_crossword(puzzle, output_path)
+        self.assertEqual(context.canvas_bytes, 0)
+        for path in (output_path, page_filename(output_path, 2), output_path.replace('.png', '_ANSWER_KEY.png')):
+            with Image.open(path) as page:
+                self.assertEqual(page.size, (page_renderer.PAGE_WIDTH, page_renderer.PAGE_HEIGHT))
+
+    def test_layers_keep_their_colours_across_palette_pages(self):
+        source = page_renderer.new_page(mode='P')
+        ImageDraw.Draw(source).rectangle([0, 0, 99, 99], fill='#e74c3c')
+        layer = page_renderer.copy_layer(source, (0, 0, 100, 100))
+
+        target = page_renderer.new_page(mode='P')
+        # Allocate other colours first so the palette indices differ
+        ImageDraw.Draw(target).rectangle([200, 200, 299, 299], fill='#3498db')
+        page_renderer.paste_layer(target, layer, (500, 500))
+        self.assertEqual(target.convert('RGB').getpixel((550, 550)), (0xe7, 0x4c, 0x3c))
+        for image in (source, layer, target):
+            page_renderer.release_page(image)
+
+    def test_capsules_are_translucent(self):
+        for mode in ('RGB', 'P'):
+            with self.subTest(mode=mode):
+                image = Image.new(mode, (300, 100), 'white')
+                ImageDraw.Draw(image).rectangle([45, 45, 55, 55], fill='black')
+                draw_capsules(image, [((0, 0), (0, 2))], (0, 0), 100, ['#3498db'])
+                pixels = image.convert('RGB')
+                tinted = pixels.getpixel((150, 30))
+                self.assertNotIn(tinted, ((255, 255, 255), (0x34, 0x98, 0xdb)))
+                # Letters under the capsule stay dark
+                self.assertLess(sum(pixels.getpixel((50, 50))), sum(tinted) / 2)
+                # Outside the capsule nothing changes
+                self.assertEqual(pixels.getpixel((150, 2)), (255, 255, 255))
+
+    def test_capsules_land_on_their_cells(self):
+        for mode in ('RGB', 'P'):
+            with self.subTest(mode=mode):
+                image = Image.new(mode, (400, 400), 'white')
+                segments = [((1, 1), (1, 1)), ((3, 0), (3, 2)), ((2, 2), (2, 2))]
+                draw_capsules(image, segments, (10, 10), 50, ['#3498db', '#e74c3c'])
+                pixels = image.convert('RGB')
+                for x, y in ((85, 85), (60, 185), (135, 185), (135, 135)):
+                    self.assertNotEqual(pixels.getpixel((x, y)), (255, 255, 255))
+                # Third segment takes the first colour again
+                self.assertEqual(pixels.getpixel((135, 135)), pixels.getpixel((85, 85)))
+                self.assertNotEqual(pixels.getpixel((60, 185)), pixels.getpixel((85, 85)))
+                for x, y in ((35, 35), (185, 85), (300, 300)):
+                    self.assertEqual(pixels.getpixel((x, y)), (255, 255, 255))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            page_renderer.new_page(mode='CMYK')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from generators.crossword_smart import build_crossword, render_crossword
+from generators.fill_in_blank import build_fill_in_blank, render_fill_in_blank
+from generators.matching_smart import build_matching, render_matching
+from generators.puzzle_model import load_puzzle
+from generators.short_answer import build_short_answer, render_short_answer
+from generators.true_false import build_true_false, render_true_false
+from generators.word_search_smart import build_word_search, render_word_search
+from ngss_standards import NGSS_STANDARDS
+
+
+BUILDERS = {
+    'crossword': (build_crossword, render_crossword),
+    'word-search': (build_word_search, render_word_search),
+    'matching': (build_matching, render_matching),
+    'fill-blank': (build_fill_in_blank, render_fill_in_blank),
+    'short-answer': (build_short_answer, render_short_answer),
+    'true-false': (build_true_false, render_true_false),
+}
+
+
+class PuzzleModelTests(unittest.TestCase):
+    """Puzzles survive a JSON round trip and can be rendered from the copy."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="sciencesheetforge-tests-")
+        self.standard = NGSS_STANDARDS['6-8'][0]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_json_round_trip(self):
+        for fmt, (build, _) in BUILDERS.items():
+            with self.subTest(fmt=fmt):
+                puzzle = build(self.standard, '6-8')
+                restored = load_puzzle(puzzle.to_json())
+                self.assertEqual(restored, puzzle)
+                self.assertEqual(restored.kind, fmt)
+                self.assertFalse(hasattr(puzzle, '__dict__'))
+
+    def test_render_from_restored_puzzle(self):
+        for fmt, (build, render) in BUILDERS.items():
+            with self.subTest(fmt=fmt):
+                puzzle = load_puzzle(build(self.standard, '6-8').to_json())
+                output_path = os.path.join(self.tmp_dir, f"{fmt}.png")
+                render(puzzle, output_path)
+                self.assertTrue(os.path.exists(output_path))
+                self.assertTrue(os.path.exists(output_path.replace(".png", "_ANSWER_KEY.png")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import contextlib
+import io
+import unittest
+
+from benchmark_puzzles import main as run_benchmark
+from generators.crossword_smart import build_crossword
+from generators.puzzle_model import CrosswordEntry, WordPlacement
+from generators.puzzle_solver import verify_crossword, verify_word_search, word_search_solution
+from generators.word_search_layout import find_words
+from generators.word_search_smart import build_word_search
+from ngss_standards import NGSS_STANDARDS
+
+
+class PuzzleSolverTests(unittest.TestCase):
+    """Generated puzzles verify clean and broken ones are caught."""
+
+    def setUp(self):
+        self.standard = NGSS_STANDARDS['6-8'][0]
+
+    def test_find_words_in_all_directions(self):
+        grid = ['CELLL',
+                'XAXXE',
+                'XXTXV',
+                'XXXOE',
+                'LLECL']
+        found = find_words(grid, ['CELL', 'CAT', 'LEVEL', 'TOE'])
+        self.assertEqual(found['CELL'], [((0, 0), (0, 3)), ((4, 3), (4, 0))])
+        self.assertEqual(found['CAT'], [((0, 0), (2, 2))])
+        # A palindrome is found once, not once per reading direction
+        self.assertEqual(len(found['LEVEL']), 1)
+        self.assertEqual(found['TOE'], [])
+
+    def test_word_search_verifies_and_solves(self):
+        for seed in range(5):
+            puzzle = build_word_search(self.standard, '6-8', seed=seed)
+            self.assertEqual(verify_word_search(puzzle), [])
+        solution = word_search_solution(puzzle)
+        self.assertEqual([word for word, _, _ in solution], puzzle.words)
+        for (word, start, end), placement in zip(solution, puzzle.placements):
+            self.assertEqual(start, (placement.row, placement.col))
+
+    def test_word_search_problems_are_reported(self):
+        puzzle = build_word_search(self.standard, '6-8', seed=1)
+        first = puzzle.placements[0]
+        puzzle.placements[0] = WordPlacement(first.word, first.row, first.col,
+                                             'V' if first.direction != 'V' else 'H')
+        problems = verify_word_search(puzzle)
+        self.assertIn(f"{first.word} is not at its placement", problems[0])
+
+        # A listed word that is missing from the grid
+        puzzle = build_word_search(self.standard, '6-8', seed=1)
+        puzzle.placements.append(WordPlacement('QQQQ', 0, 0, 'H'))
+        self.assertIn('QQQQ appears 0 times', verify_word_search(puzzle))
+
+    def test_crossword_verifies(self):
+        puzzle = build_crossword(self.standard, '6-8', seed=3)
+        self.assertEqual(verify_crossword(puzzle), [])
+
+        entry = puzzle.entries[0]
+        puzzle.entries[0] = CrosswordEntry(entry.word, entry.row, entry.col, entry.direction,
+                                           entry.number + 1, '')
+        problems = verify_crossword(puzzle)
+        self.assertIn(f"{entry.number + 1} {entry.direction} has no clue", problems)
+        self.assertIn(f"{entry.word.upper()} is numbered {entry.number + 1}, expected {entry.number}", problems)
+
+    def test_benchmark_run(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            report = run_benchmark(['--count', '3', '--formats', 'word-search,crossword'])
+        self.assertEqual(set(report['formats']), {'word-search', 'crossword'})
+        self.assertEqual(report['formats']['crossword']['failed'], 0)
+        self.assertIn('PUZZLE BENCHMARK', output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import contextlib
+import io
+import unittest
+
+from ai_engine.readability import (
+    FONT_SIZES, choose_variant, count_syllables, grade_ceiling, profile_entries, reading_grade,
+)
+from ai_engine.smart_content import get_smart_content
+from generators.matching_smart import DEFINITION_FONT_SIZE, DEFINITION_WIDTH, build_matching
+from ngss_standards import NGSS_STANDARDS
+
+
+def make_vocab():
+    return {
+        'cell': {
+            'definition': "The basic structural and functional unit of all living organisms, "
+                          "containing cytoplasm enclosed within a selectively permeable membrane",
+            'kid_friendly': "The tiny building block of living things",
+            'fun_fact': "Your body has over 37 trillion cells!",
+        },
+        'rock': {'definition': "A hard solid made of minerals", 'kid_friendly': "A hard thing"},
+    }
+
+
+class ReadabilityTests(unittest.TestCase):
+    """Texts are scored once and variants picked from the cached scores."""
+
+    def test_reading_grade(self):
+        self.assertEqual([count_syllables(word) for word in ('cell', 'organism', 'rate', 'table')],
+                         [1, 3, 1, 2])
+        self.assertEqual(reading_grade(""), 0.0)
+        self.assertLess(reading_grade("The cat sat on a mat."),
+                        reading_grade("Photosynthesis converts electromagnetic radiation into chemical energy."))
+        self.assertEqual([grade_ceiling(grade) for grade in ('K-2', '6-8', '4', 'unknown')], [2, 8, 4, 5])
+
+    def test_profiles_are_cached_on_entries(self):
+        vocab = make_vocab()
+        profile_entries(vocab)
+        profiles = vocab['cell']['profiles']
+        self.assertEqual(set(profiles), {'definition', 'kid_friendly', 'fun_fact'})
+        self.assertEqual(set(profiles['definition'].widths), set(FONT_SIZES))
+        self.assertGreater(profiles['definition'].widths[50], profiles['definition'].widths[38])
+        self.assertEqual(set(vocab['rock']['profiles']), {'definition', 'kid_friendly'})
+
+    def test_hard_definition_steps_down_for_grade(self):
+        vocab = make_vocab()
+        profile_entries(vocab)
+        levels = ('kid_friendly', 'definition')
+        profiles = vocab['cell']['profiles']
+        self.assertEqual(choose_variant(profiles, levels, 'definition', '3-5').text,
+                         vocab['cell']['kid_friendly'])
+        self.assertEqual(choose_variant(vocab['rock']['profiles'], levels, 'definition', '6-8').text,
+                         vocab['rock']['definition'])
+        # Kid-friendly readers never get the standard version on a score alone
+        self.assertEqual(choose_variant(profiles, levels, 'kid_friendly', '12').text,
+                         vocab['cell']['kid_friendly'])
+
+    def test_width_limit_picks_a_fitting_version(self):
+        vocab = make_vocab()
+        profile_entries(vocab)
+        levels = ('kid_friendly', 'definition')
+        profiles = vocab['cell']['profiles']
+        short = profiles['kid_friendly'].widths[38]
+        self.assertEqual(choose_variant(profiles, levels, 'definition', '12', short, 38).text,
+                         vocab['cell']['kid_friendly'])
+        # Nothing fits: the narrowest version is returned
+        self.assertEqual(choose_variant(profiles, levels, 'definition', '12', 1, 38).text,
+                         vocab['cell']['kid_friendly'])
+        self.assertIsNone(choose_variant({}, levels, 'definition', '3-5'))
+
+    def test_other_font_sizes_are_measured_on_demand(self):
+        vocab = make_vocab()
+        profile_entries(vocab)
+        profile = vocab['cell']['profiles']['kid_friendly']
+        self.assertNotIn(60, profile.widths)
+        self.assertGreater(profile.width(60), profile.width(50))
+        self.assertTrue(profile.fits(profile.width(60), 60))
+        content = get_smart_content()
+        self.assertTrue(content.get_definition('cell', '6-8', max_width=2000, font_size=60))
+
+    def test_content_engine_uses_profiles(self):
+        content = get_smart_content()
+        self.assertTrue(all('profiles' in entry for entry in content.vocab_database.values()))
+        self.assertEqual(content.get_definition('cell', 'K-2'),
+                         content.vocab_database['cell']['kid_friendly'])
+
+    def test_matching_definitions_fit_their_boxes(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            puzzle = build_matching(NGSS_STANDARDS['6-8'][0], '6-8', seed=5)
+        content = get_smart_content()
+        for word, definition in puzzle.pairs + puzzle.decoys:
+            entry = content.vocab_database.get(word.lower())
+            if entry is None:
+                continue
+            with self.subTest(word=word):
+                profile = next(p for p in entry['profiles'].values() if p.text == definition)
+                if any(p.fits(DEFINITION_WIDTH, DEFINITION_FONT_SIZE) for p in entry['profiles'].values()):
+                    self.assertTrue(profile.fits(DEFINITION_WIDTH, DEFINITION_FONT_SIZE))
+
+
+if __name__ == "__main__":
+    unittest.main()
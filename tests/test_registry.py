@@ -0,0 +1,75 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from generators.registry import GenerationScheduler, GeneratorRegistry
+from ngss_standards import NGSS_STANDARDS
+
+
+class GeneratorRegistryTests(unittest.TestCase):
+    """Generators are resolved lazily, with fallbacks, and cached."""
+
+    def setUp(self):
+        self.registry = GeneratorRegistry()
+        self.registry.register('fallback', [('no_such_generator_module', 'generate'), ('json', 'dumps')])
+        self.registry.register('missing', [('no_such_generator_module', 'generate')])
+        self.registry.register('lazy', [('colorsys', 'rgb_to_hsv')])
+
+    def test_availability_does_not_import(self):
+        sys.modules.pop('colorsys', None)
+        self.assertEqual(self.registry.available_ids(), {'fallback', 'lazy'})
+        self.assertNotIn('colorsys', sys.modules)
+        self.assertFalse(self.registry.is_loaded('lazy'))
+
+    def test_resolves_fallback_and_caches(self):
+        import json
+        self.assertIs(self.registry['fallback'], json.dumps)
+        self.assertTrue(self.registry.is_loaded('fallback'))
+        self.assertIsNone(self.registry.get('missing'))
+        self.assertIsNone(self.registry.get('unknown-format'))
+
+    def test_warmup_resolves_everything(self):
+        self.registry.warmup(background=False)
+        self.assertTrue(all(self.registry.is_loaded(fmt) for fmt in self.registry))
+
+
+class DiscoveryTests(unittest.TestCase):
+    """Generator modules are found through their GENERATOR_INFO metadata."""
+
+    def test_smart_generators_are_preferred(self):
+        registry = GeneratorRegistry.discover('generators')
+        self.assertEqual(
+            set(registry),
+            {'crossword', 'word-search', 'word-search-large', 'matching', 'fill-blank', 'short-answer',
+             'true-false'},
+        )
+        info = registry.info('crossword')
+        self.assertEqual(info['module'], 'generators.crossword_smart')
+        self.assertIn('png', info['backends'])
+        self.assertIsNone(registry.info('coloring'))
+
+    def test_expensive_formats_run_in_worker_pool(self):
+        registry = GeneratorRegistry.discover('generators')
+        scheduler = GenerationScheduler(registry, inline_cost=1.0, max_workers=1)
+        self.assertTrue(scheduler.runs_inline('matching'))
+        self.assertFalse(scheduler.runs_inline('word-search'))
+
+        tmp_dir = tempfile.mkdtemp(prefix="sciencesheetforge-tests-")
+        try:
+            output_path = os.path.join(tmp_dir, "word_search.png")
+            stages = []
+            scheduler.run('word-search', NGSS_STANDARDS['3-5'][0], '3-5', output_path, seed=7,
+                          progress=lambda stage, message: stages.append(stage))
+            self.assertTrue(os.path.exists(output_path))
+            self.assertIn('placement', stages)
+            self.assertEqual(stages[-1], 'encode')
+            self.assertFalse(registry.is_loaded('word-search'))
+        finally:
+            scheduler.shutdown()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
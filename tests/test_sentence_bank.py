@@ -0,0 +1,86 @@
+import contextlib
+import io
+import unittest
+
+from ai_engine.sentence_bank import BLANK, SentenceBank, inflections
+from ai_engine.smart_content import get_smart_content
+from generators.fill_in_blank import build_fill_in_blank
+from ngss_standards import NGSS_STANDARDS
+
+
+VOCAB = {
+    'cell': {
+        'example': "A cell is like a tiny factory.",
+        'fun_fact': "Your body has over 37 trillion cells!",
+    },
+    'nucleus': {'example': "The nuclei of two cells were stained."},
+    'orbit': {'fun_fact': "Satellites orbiting Earth send GPS signals. The Moon orbits Earth."},
+    'tectonic plates': {'fun_fact': "A tectonic plate moves slowly."},
+    'density': {'example': "Ice is less dense than water."},
+}
+
+
+class SentenceBankTests(unittest.TestCase):
+    """Sentences are indexed by every form of the words they use."""
+
+    def test_inflections(self):
+        self.assertEqual(inflections('cell'), ('cell', 'celled', 'celling', 'cells'))
+        self.assertIn('volcanoes', inflections('volcano'))
+        self.assertIn('energies', inflections('energy'))
+        self.assertIn('nuclei', inflections('nucleus'))
+        self.assertEqual(inflections('tectonic plates'), ('tectonic plate', 'tectonic plates'))
+
+    def test_own_exact_sentence_is_best(self):
+        bank = SentenceBank(VOCAB)
+        self.assertEqual(bank.blank('Cell'), f"A {BLANK} is like a tiny factory.")
+        # 'cells' in the nucleus example is indexed under cell too
+        self.assertEqual(len(bank.sentences('cell')), 3)
+
+    def test_inflected_forms_keep_regular_endings(self):
+        bank = SentenceBank(VOCAB)
+        self.assertEqual(bank.blank('orbit'), f"The Moon {BLANK}s Earth.")
+        self.assertEqual(bank.blank('nucleus'), f"The {BLANK} of two cells were stained.")
+        self.assertEqual(bank.blank('tectonic plates'), f"A {BLANK} moves slowly.")
+
+    def test_words_without_sentences(self):
+        bank = SentenceBank(VOCAB)
+        self.assertNotIn('density', bank)
+        self.assertIsNone(bank.blank('density'))
+        self.assertIsNone(bank.blank('unknown'))
+
+    def test_paragraph_blanks_every_listed_word(self):
+        bank = SentenceBank(VOCAB)
+        paragraph = bank.paragraph(['orbit', 'nucleus', 'cell', 'density'])
+        # cell is blanked in the nucleus sentence, so it gets none of its own
+        self.assertEqual(paragraph.text, f"The Moon {BLANK}s Earth. The {BLANK} of two {BLANK}s were stained.")
+        self.assertEqual(paragraph.answers, ['orbit', 'nucleus', 'cell'])
+
+        # Words to blank but not to write about
+        paragraph = bank.paragraph(['nucleus'], also_blank=['cell'])
+        self.assertEqual(paragraph.text, f"The {BLANK} of two {BLANK}s were stained.")
+        self.assertEqual(paragraph.answers, ['nucleus', 'cell'])
+
+    def test_fill_in_blank_uses_sentences(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            puzzle = build_fill_in_blank(NGSS_STANDARDS['6-8'][0], '6-8', seed=2)
+        bank = get_smart_content().sentence_bank
+        used = [(sentence, answer) for sentence, answer in puzzle.items if answer in bank]
+        self.assertTrue(used)
+        for sentence, answer in used:
+            with self.subTest(answer=answer):
+                self.assertEqual(sentence, bank.blank(answer, '6-8'))
+                self.assertNotIn(answer.lower(), sentence.lower())
+
+    def test_fill_in_blank_passage(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            puzzle = build_fill_in_blank(NGSS_STANDARDS['6-8'][1], '6-8', seed=3)
+        self.assertGreaterEqual(len(puzzle.passage_answers), 2)
+        self.assertEqual(puzzle.passage.count(BLANK), len(puzzle.passage_answers))
+        # Passage words are not asked for again as items; all are in the word bank
+        items = {answer for _, answer in puzzle.items}
+        self.assertFalse(items & set(puzzle.passage_answers))
+        self.assertEqual(set(puzzle.answers), items | set(puzzle.passage_answers))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from unittest import mock
+
+import server
+
+
+class ServerProfileTests(unittest.TestCase):
+    """Worker settings follow the machine and the environment."""
+
+    def test_workers_follow_cores_and_memory(self):
+        with mock.patch('server.os.cpu_count', return_value=8), \
+                mock.patch('server.total_memory_bytes', return_value=16 * 1024 ** 3):
+            self.assertEqual(server.server_settings({})['workers'], 8)
+        with mock.patch('server.os.cpu_count', return_value=8), \
+                mock.patch('server.total_memory_bytes', return_value=1024 ** 3):
+            self.assertEqual(server.server_settings({})['workers'], 1024 // server.MEMORY_PER_WORKER_MB)
+
+    def test_environment_overrides(self):
+        settings = server.server_settings({
+            'WEB_CONCURRENCY': '3', 'WEB_THREADS': '2', 'PORT': '9000',
+            'GENERATION_TIMEOUT_SECONDS': '10',
+        })
+        self.assertEqual(settings['workers'], 3)
+        self.assertEqual(settings['threads'], 2)
+        self.assertEqual(settings['bind'], '0.0.0.0:9000')
+        self.assertEqual(settings['timeout'], 40)
+        self.assertTrue(settings['preload_app'])
+
+    def test_preload_loads_generators_and_chrome(self):
+        import app as app_module
+        from generators import page_renderer
+
+        server.preload()
+        self.assertTrue(all(app_module.FORMAT_GENERATORS.is_loaded(fmt)
+                            for fmt in app_module.AVAILABLE_FORMAT_IDS))
+        self.assertGreater(page_renderer.get_font.cache_info().currsize, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import io
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from storage import LocalStore, S3Store, content_name
+
+
+class LocalS3Client:
+    """In-memory stand-in for the subset of the boto3 S3 client S3Store uses."""
+
+    class NoSuchKey(Exception):
+        response = {'Error': {'Code': 'NoSuchKey'}}
+
+    def __init__(self):
+        self.objects = {}
+        self.clock = 1_000_000.0
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):
+        self.clock += 1
+        self.objects[(Bucket, Key)] = (bytes(Body), self.clock)
+
+    def _get(self, Bucket, Key):
+        try:
+            return self.objects[(Bucket, Key)]
+        except KeyError:
+            raise self.NoSuchKey(Key)
+
+    def get_object(self, Bucket, Key):
+        return {'Body': io.BytesIO(self._get(Bucket, Key)[0])}
+
+    def head_object(self, Bucket, Key):
+        data, modified = self._get(Bucket, Key)
+        return {'ContentLength': len(data),
+                'LastModified': datetime.fromtimestamp(modified, timezone.utc)}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+    def list_objects_v2(self, Bucket, Prefix='', ContinuationToken=None):
+        contents = [
+            {'Key': key, 'Size': len(data),
+             'LastModified': datetime.fromtimestamp(modified, timezone.utc)}
+            for (bucket, key), (data, modified) in sorted(self.objects.items())
+            if bucket == Bucket and key.startswith(Prefix)
+        ]
+        return {'Contents': contents, 'IsTruncated': False}
+
+
+class StoreContractMixin:
+    """Behaviour every storage backend must share."""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.store = self.make_store()
+
+    def test_content_addressed_put(self):
+        name = self.store.put(b'worksheet bytes')
+        self.assertEqual(name, content_name(b'worksheet bytes'))
+        self.assertEqual(self.store.put(b'worksheet bytes'), name)
+        with self.store.open(name) as artifact:
+            self.assertEqual(artifact.read(), b'worksheet bytes')
+        self.assertEqual(self.store.stat(name).size, len(b'worksheet bytes'))
+
+    def test_missing_and_invalid_names(self):
+        self.assertIsNone(self.store.stat(content_name(b'never stored')))
+        with self.assertRaises(FileNotFoundError):
+            self.store.open(content_name(b'never stored'))
+        with self.assertRaises(FileNotFoundError):
+            self.store.open('../app.py')
+
+    def test_sweep_expires_then_trims_oldest(self):
+        names = [self.store.put(bytes([index]) * 100) for index in range(4)]
+        modified = {info.name: info.modified for info in self.store.list()}
+        newest = max(modified.values())
+
+        removed = self.store.sweep(max_age=3600, max_bytes=250, now=newest + 10)
+        self.assertEqual(sorted(removed), sorted(names[:2]))
+        self.assertEqual({info.name for info in self.store.list()}, set(names[2:]))
+
+        removed = self.store.sweep(max_age=5, now=newest + 10)
+        self.assertEqual(list(self.store.list()), [])
+
+
+class LocalStoreTests(StoreContractMixin, unittest.TestCase):
+
+    def make_store(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="sciencesheetforge-tests-")
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        store = LocalStore(self.tmp_dir)
+        # Space out modification times so sweep ordering is deterministic
+        original_put = store.put
+        clock = iter(range(1_000_000, 2_000_000))
+
+        def put(data, suffix='.png'):
+            import os
+            name = original_put(data, suffix)
+            stamp = next(clock)
+            os.utime(store.local_path(name), (stamp, stamp))
+            return name
+
+        store.put = put
+        return store
+
+
+class S3StoreTests(StoreContractMixin, unittest.TestCase):
+
+    def make_store(self):
+        return S3Store(LocalS3Client(), 'worksheets', prefix='artifacts/')
+
+
+if __name__ == "__main__":
+    unittest.main()
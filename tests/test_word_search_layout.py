@@ -0,0 +1,111 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from generators.word_search_large import build_large_word_search
+from generators.word_search_layout import (BANNED_WORDS, DIRECTIONS, EMPTY, WordMatcher, WordSearchLayout,
+                                          grid_size_for, lay_out_words, reading_lines)
+from generators.word_search_smart import render_word_search
+from ngss_standards import NGSS_STANDARDS
+
+
+def random_words(rng, count, min_length=4, max_length=12):
+    return [''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(rng.randint(min_length, max_length)))
+            for _ in range(count)]
+
+
+def spelled(grid, word, row, col, direction):
+    d_row, d_col = DIRECTIONS[direction]
+    return ''.join(grid[row + d_row * i][col + d_col * i] for i in range(len(word)))
+
+
+class WordSearchLayoutTests(unittest.TestCase):
+    """Every word that fits somewhere is placed, even in crowded grids."""
+
+    def assert_spelled(self, grid, placements):
+        for placement in placements:
+            self.assertEqual(spelled(grid, *placement), placement[0])
+
+    def test_dense_large_grid(self):
+        rng = random.Random(5)
+        words = random_words(rng, 60)
+        layout, skipped = lay_out_words(words, 40, random.Random(1))
+        self.assertEqual(skipped, [])
+        self.assertEqual([placement[0] for placement in layout.placements], words)
+        self.assert_spelled(layout.grid, layout.placements)
+
+        # A crowded grid still takes every word that has room somewhere
+        layout, skipped = lay_out_words(random_words(rng, 40), 15, random.Random(1))
+        self.assert_spelled(layout.grid, layout.placements)
+        self.assertGreater(layout.fill, 0.6)
+        for word in skipped:
+            self.assertEqual(layout.candidates(word), [])
+
+    def test_same_seed_same_layout(self):
+        words = random_words(random.Random(2), 30)
+        first, _ = lay_out_words(words, 25, random.Random(9))
+        second, _ = lay_out_words(words, 25, random.Random(9))
+        self.assertEqual(first.grid, second.grid)
+        self.assertTrue(any(EMPTY in row for row in first.grid))
+
+    def test_word_matcher_finds_overlapping_words(self):
+        matcher = WordMatcher(['HE', 'SHE', 'HERS', 'CELL', 'ELL'])
+        self.assertEqual(sorted(matcher.find('USHERS CELLS')),
+                         [(1, 'SHE'), (2, 'HE'), (2, 'HERS'), (7, 'CELL'), (8, 'ELL')])
+        self.assertEqual(list(matcher.find('NOTHING')), [])
+
+    def test_filler_spells_no_banned_or_hidden_words(self):
+        words = random_words(random.Random(3), 30)
+        layout, _ = lay_out_words(words, 30, random.Random(4))
+        layout.fill_blanks(random.Random(5))
+        self.assertFalse(any(EMPTY in row for row in layout.grid))
+        self.assert_spelled(layout.grid, layout.placements)
+
+        # Every occurrence left in any direction lies within placed letters
+        matcher = WordMatcher(BANNED_WORDS | set(words))
+        self.assertEqual(layout.accidental_words(matcher), [])
+        # Rows, columns and both diagonals (less the two corner cells), each read both ways
+        self.assertEqual(len(reading_lines(30)), 2 * (2 * 30 + 2 * (2 * 30 - 3)))
+
+    def test_accidental_words_are_repaired(self):
+        layout = WordSearchLayout(5)
+        layout.add('CELL', 0, 0, 'H')
+        # Filler that spells CELL again and a banned word, upwards and backwards
+        layout.grid[4] = list('LLECX')
+        layout.grid[3][4], layout.grid[2][4], layout.grid[1][4] = 'N', 'U', 'G'
+        layout.fill_blanks(random.Random(1), banned={'GUN'}, weights=[1] * 26)
+        matcher = WordMatcher({'CELL', 'GUN'})
+        self.assertEqual(layout.accidental_words(matcher), [])
+        self.assertEqual(''.join(layout.grid[0][:4]), 'CELL')
+
+    def test_grid_size_for(self):
+        self.assertEqual(grid_size_for(['CELL'] * 3), 10)
+        self.assertEqual(grid_size_for(['PHOTOSYNTHESIS']), 14)
+        self.assertEqual(grid_size_for(['A' * 10] * 500), 40)
+
+
+class LargeWordSearchTests(unittest.TestCase):
+    """The large format places 50 words and continues its word list on a second page."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="sciencesheetforge-tests-")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_build_and_render(self):
+        puzzle = build_large_word_search(NGSS_STANDARDS['6-8'][0], '6-8', seed=4)
+        self.assertEqual(len(puzzle.placements), 50)
+        for p in puzzle.placements:
+            self.assertEqual(spelled(puzzle.grid, p.word, p.row, p.col, p.direction), p.word)
+
+        output_path = os.path.join(self.tmp_dir, 'large.png')
+        render_word_search(puzzle, output_path)
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)),
+                         ['large.png', 'large_ANSWER_KEY.png', 'large_ANSWER_KEY_page2.png', 'large_page2.png'])
+
+
+if __name__ == "__main__":
+    unittest.main()
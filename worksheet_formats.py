@@ -22,6 +22,15 @@ WORKSHEET_FORMATS = [
         "suitable_grades": ["K-2", "3-5", "6-8"],
         "features": ["Pattern recognition", "Vocabulary review", "Fun and engaging"]
     },
+    {
+        "id": "word-search-large",
+        "name": "Challenge Word Search",
+        "category": "Word Activities",
+        "icon": "🧩",
+        "description": "50 science terms hidden in a grid of up to 40x40",
+        "suitable_grades": ["6-8"],
+        "features": ["Advanced students", "Extended vocabulary review", "Multi-page word list"]
+    },
     {
         "id": "fill-blank",
         "name": "Fill in the Blank",